@@ -3,30 +3,50 @@ Script de automação de cliques com interface gráfica
 Permite configurar múltiplos cliques, repetições e delays
 """
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, filedialog
 import threading
 import time
-from pynput import mouse, keyboard
-from pynput.mouse import Button
+from pathlib import Path
+from pynput import keyboard
+
+try:
+    from . import click_drivers, click_engine, click_program, coordinate_list, log_pipeline
+except ImportError:
+    import click_drivers
+    import click_engine
+    import click_program
+    import coordinate_list
+    import log_pipeline
+
+LOG_DIR = Path(__file__).parent.parent.parent / "output"
 
 
 class ClickAutomation:
     def __init__(self, root):
         self.root = root
         self.root.title("Automação de Cliques")
-        self.root.geometry("520x580")
+        self.root.geometry("520x640")
         self.root.resizable(False, False)
         
         # Variáveis
-        self.coordinates = []
+        self.coordinates = coordinate_list.CoordinateList()
+        # Programa aberto que a interface não consegue representar (teclas, loops aninhados...)
+        self.program = None
+        # Abrir um programa troca a lista sem que isso conte como edição
+        self._loading_program = False
         self.is_capturing = False
         self.is_running = False
         self.keyboard_listener = None
+        self.driver = click_drivers.PynputDriver()
+        self.engine = None
+        self.log_pipeline = log_pipeline.LogPipeline()
         
         # Configurações
         self.click_delay = tk.DoubleVar(value=1.0)
+        self.settle_delay = tk.DoubleVar(value=click_program.DEFAULT_SETTLE)
         self.loop_repetitions = tk.IntVar(value=1)
         self.total_repetitions = tk.IntVar(value=1)
+        self.log_to_file = tk.BooleanVar(value=False)
         
         self.setup_ui()
         self.setup_listeners()
@@ -88,9 +108,11 @@ class ClickAutomation:
         self.coords_tree.column("Y", width=70, anchor=tk.CENTER)
         self.coords_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.coords_tree.yview)
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical")
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.coords_tree.configure(yscrollcommand=scrollbar.set)
+        
+        # A Treeview só tem as linhas visíveis; a view acompanha as alterações do modelo
+        self.coords_view = coordinate_list.VirtualTreeview(self.coords_tree, scrollbar, self.coordinates)
         
         # Botões coordenadas
         coord_btn_frame = ttk.Frame(coords_frame)
@@ -99,6 +121,17 @@ class ClickAutomation:
         ttk.Button(coord_btn_frame, text="Limpar", command=self.clear_coordinates, width=10).pack(side=tk.LEFT, padx=(0, 4))
         ttk.Button(coord_btn_frame, text="Remover", command=self.remove_selected, width=10).pack(side=tk.LEFT)
         
+        # Programas salvos
+        program_btn_frame = ttk.Frame(coords_frame)
+        program_btn_frame.pack(fill=tk.X, pady=(4, 0))
+        
+        ttk.Button(program_btn_frame, text="Abrir...", command=self.open_program, width=10).pack(side=tk.LEFT, padx=(0, 4))
+        ttk.Button(program_btn_frame, text="Salvar...", command=self.save_program, width=10).pack(side=tk.LEFT)
+        
+        self.program_label = ttk.Label(coords_frame, text="", font=("Arial", 8))
+        self.program_label.pack(anchor=tk.W, pady=(4, 0))
+        self.coordinates.subscribe(self.on_coordinates_changed)
+        
         # Configurações
         config_frame = ttk.LabelFrame(left_col, text="Configurações", padding="6")
         config_frame.pack(fill=tk.X)
@@ -107,9 +140,16 @@ class ClickAutomation:
         delay_frame = ttk.Frame(config_frame)
         delay_frame.pack(fill=tk.X, pady=2)
         ttk.Label(delay_frame, text="Delay (s):", width=12, anchor=tk.W).pack(side=tk.LEFT)
-        delay_spinbox = ttk.Spinbox(delay_frame, from_=0.1, to=60.0, increment=0.1, textvariable=self.click_delay, width=8)
+        delay_spinbox = ttk.Spinbox(delay_frame, from_=0.0, to=60.0, increment=0.01, textvariable=self.click_delay, width=8)
         delay_spinbox.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(4, 0))
         
+        # Pausa entre mover e clicar
+        settle_frame = ttk.Frame(config_frame)
+        settle_frame.pack(fill=tk.X, pady=2)
+        ttk.Label(settle_frame, text="Mover→Clicar:", width=12, anchor=tk.W).pack(side=tk.LEFT)
+        settle_spinbox = ttk.Spinbox(settle_frame, from_=0.0, to=5.0, increment=0.01, textvariable=self.settle_delay, width=8)
+        settle_spinbox.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(4, 0))
+        
         # Loop reps
         loop_frame = ttk.Frame(config_frame)
         loop_frame.pack(fill=tk.X, pady=2)
@@ -149,6 +189,12 @@ class ClickAutomation:
         self.log_text = scrolledtext.ScrolledText(log_frame, height=15, width=30, font=("Consolas", 8))
         self.log_text.pack(fill=tk.BOTH, expand=True)
         
+        ttk.Checkbutton(log_frame, text="Salvar log completo em arquivo", variable=self.log_to_file).pack(anchor=tk.W, pady=(4, 0))
+        
+        # O widget mostra só as últimas linhas; a fila é esvaziada em lotes pela thread da interface
+        self.log_view = log_pipeline.TkLogView(self.log_text, self.log_pipeline)
+        self.log_view.start()
+        
     def setup_listeners(self):
         """Configura os listeners de mouse e teclado"""
         self.keyboard_listener = keyboard.Listener(on_press=self.on_key_press)
@@ -158,7 +204,8 @@ class ClickAutomation:
         """Callback quando uma tecla é pressionada"""
         try:
             if hasattr(key, 'char') and key.char == '0' and self.is_capturing:
-                self.save_current_position()
+                # O listener roda em outra thread; a lista é alterada na thread da interface
+                self.root.after(0, self.save_current_position)
         except AttributeError:
             pass
     
@@ -176,116 +223,151 @@ class ClickAutomation:
     def save_current_position(self):
         """Salva a posição atual do mouse"""
         try:
-            mouse_controller = mouse.Controller()
-            x, y = mouse_controller.position
-            self.coordinates.append((x, y))
-            self.update_coordinates_display()
+            x, y = self.driver.position()
+            self.coordinates.append(x, y)
             self.log(f"#{len(self.coordinates)}: ({x}, {y})")
         except Exception as e:
             self.log(f"Erro: {e}")
     
-    def update_coordinates_display(self):
-        """Atualiza a exibição das coordenadas"""
-        for item in self.coords_tree.get_children():
-            self.coords_tree.delete(item)
-        
-        for idx, (x, y) in enumerate(self.coordinates, 1):
-            self.coords_tree.insert("", "end", values=(idx, x, y))
-    
     def clear_coordinates(self):
         """Limpa todas as coordenadas"""
         if messagebox.askyesno("Confirmar", "Limpar todas as coordenadas?"):
             self.coordinates.clear()
-            self.update_coordinates_display()
             self.log("Coordenadas limpas.")
     
     def remove_selected(self):
         """Remove a coordenada selecionada"""
-        selected = self.coords_tree.selection()
-        if not selected:
+        idx = self.coords_view.selected_index()
+        if idx is None:
             messagebox.showwarning("Aviso", "Selecione uma coordenada.")
             return
         
-        item = selected[0]
-        values = self.coords_tree.item(item, "values")
-        idx = int(values[0]) - 1
+        removed = self.coordinates.pop(idx)
+        self.log(f"Removido: ({removed[0]}, {removed[1]})")
+    
+    def on_coordinates_changed(self, kind, start, count):
+        """Editar a lista substitui o programa aberto pela lista"""
+        if self.program is not None and not self._loading_program:
+            self.program = None
+            self.program_label.config(text="")
+            self.log("Lista editada: o programa aberto foi descartado.")
+    
+    def current_program(self, name=""):
+        """Programa a executar ou salvar: o aberto ou o montado com a lista e as configurações"""
+        if self.program is not None:
+            return self.program
+        return click_program.program_from_settings(
+            list(self.coordinates), self.click_delay.get(), self.settle_delay.get(),
+            self.loop_repetitions.get(), self.total_repetitions.get(), name,
+        )
+    
+    def open_program(self):
+        """Abre um programa salvo"""
+        path = filedialog.askopenfilename(
+            title="Abrir programa", initialdir=click_program.PROGRAMS_DIR,
+            filetypes=[("Programas de cliques", "*.json"), ("Todos os arquivos", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            program = click_program.load_program(path)
+            plan = click_program.compile_program(program)
+        except (OSError, click_program.ProgramError) as e:
+            messagebox.showerror("Erro", f"Não foi possível abrir o programa:\n{e}")
+            return
         
-        if 0 <= idx < len(self.coordinates):
-            removed = self.coordinates.pop(idx)
-            self.update_coordinates_display()
-            self.log(f"Removido: ({removed[0]}, {removed[1]})")
+        settings = click_program.settings_from_program(program)
+        self._loading_program = True
+        try:
+            self.coordinates.clear()
+            if settings is not None:
+                # Programa salvo pela interface: volta a ser lista + configurações editáveis
+                self.coordinates.extend(settings["coordinates"])
+                self.click_delay.set(settings["delay"])
+                self.settle_delay.set(settings["settle"])
+                self.loop_repetitions.set(settings["loop_reps"])
+                self.total_repetitions.set(settings["total_reps"])
+                self.program = None
+                self.program_label.config(text="")
+            else:
+                self.coordinates.extend(click_program.click_points(program))
+                self.program = program
+                self.program_label.config(text=f"Programa: {plan.name or Path(path).stem} (configurações do arquivo)")
+        finally:
+            self._loading_program = False
+        self.log(f"Programa aberto: {Path(path).name} ({len(plan)} ações, {plan.clicks} cliques)")
+    
+    def save_program(self):
+        """Salva a lista e as configurações (ou o programa aberto) em um arquivo"""
+        path = filedialog.asksaveasfilename(
+            title="Salvar programa", initialdir=click_program.PROGRAMS_DIR, defaultextension=".json",
+            filetypes=[("Programas de cliques", "*.json"), ("Todos os arquivos", "*.*")],
+        )
+        if not path:
+            return
+        try:
+            click_program.save_program(self.current_program(Path(path).stem), path)
+        except (OSError, tk.TclError) as e:
+            messagebox.showerror("Erro", f"Não foi possível salvar o programa:\n{e}")
+            return
+        self.log(f"Programa salvo: {path}")
     
     def log(self, message):
-        """Adiciona mensagem ao log"""
-        timestamp = time.strftime("%H:%M:%S")
-        self.log_text.insert(tk.END, f"[{timestamp}] {message}\n")
-        self.log_text.see(tk.END)
+        """Adiciona mensagem ao log (só enfileira; seguro fora da thread da interface)"""
+        self.log_pipeline.put(message)
+    
+    def close_log_file(self):
+        """Grava o que falta no arquivo de log da execução e o fecha"""
+        self.log_view.flush()
+        self.log_pipeline.close_file()
     
     def start_automation(self):
         """Inicia a automação em thread separada"""
-        if not self.coordinates:
+        if not self.coordinates and self.program is None:
             messagebox.showwarning("Aviso", "Adicione pelo menos uma coordenada.")
             return
         
         if self.is_running:
             return
         
+        # Compilado na thread da interface: erros aparecem antes de começar
+        try:
+            plan = click_program.compile_program(self.current_program())
+            for combo in plan.keys:
+                for name in combo:
+                    self.driver.resolve_key(name)
+        except (tk.TclError, click_program.ProgramError) as e:
+            messagebox.showerror("Erro", f"Programa inválido:\n{e}")
+            return
+        
+        if self.log_to_file.get():
+            try:
+                LOG_DIR.mkdir(parents=True, exist_ok=True)
+                log_path = LOG_DIR / f"click_automation_{time.strftime('%Y%m%d_%H%M%S')}.log"
+                self.log_pipeline.open_file(log_path)
+                self.log(f"Log completo em: {log_path}")
+            except OSError as e:
+                self.log(f"Erro ao abrir arquivo de log: {e}")
+        
         self.is_running = True
         self.btn_start.config(state="disabled")
         self.btn_stop.config(state="normal")
         self.status_label.config(text="Status: Executando...", foreground="green")
         
-        thread = threading.Thread(target=self.run_automation, daemon=True)
+        self.engine = click_engine.ClickEngine(plan, self.driver, log=self.log)
+        thread = threading.Thread(target=self.run_automation, args=(self.engine,), daemon=True)
         thread.start()
     
-    def run_automation(self):
-        """Executa a automação de cliques"""
+    def run_automation(self, engine):
+        """Executa o motor fora da thread da interface e avisa a interface no fim"""
         try:
-            mouse_controller = mouse.Controller()
-            click_delay = self.click_delay.get()
-            loop_reps = self.loop_repetitions.get()
-            total_reps = self.total_repetitions.get()
-            
-            self.log(f"Iniciando: {len(self.coordinates)} coords")
-            self.log(f"Loop: {loop_reps}x | Total: {total_reps}x")
-            
-            for total_rep in range(1, total_reps + 1):
-                if not self.is_running:
-                    break
-                
-                self.log(f"--- Loop {total_rep}/{total_reps} ---")
-                
-                for loop_rep in range(1, loop_reps + 1):
-                    if not self.is_running:
-                        break
-                    
-                    self.log(f"Rep {loop_rep}/{loop_reps}")
-                    
-                    for idx, (x, y) in enumerate(self.coordinates, 1):
-                        if not self.is_running:
-                            break
-                        
-                        mouse_controller.position = (x, y)
-                        time.sleep(0.1)
-                        mouse_controller.click(Button.left, 1)
-                        self.log(f"  Clique #{idx} ({x}, {y})")
-                        
-                        if idx < len(self.coordinates) or loop_rep < loop_reps:
-                            time.sleep(click_delay)
-                    
-                    if loop_rep < loop_reps:
-                        time.sleep(click_delay)
-                
-                if total_rep < total_reps:
-                    time.sleep(click_delay)
-            
-            if self.is_running:
-                self.log("Concluído!")
-                self.root.after(0, self.automation_finished)
-            else:
+            result = engine.run()
+            if result["stopped"]:
                 self.log("Interrompido.")
                 self.root.after(0, self.automation_stopped)
-                
+            else:
+                self.log("Concluído!")
+                self.root.after(0, self.automation_finished)
         except Exception as e:
             self.log(f"Erro: {e}")
             self.root.after(0, self.automation_error)
@@ -296,6 +378,7 @@ class ClickAutomation:
         self.btn_start.config(state="normal")
         self.btn_stop.config(state="disabled")
         self.status_label.config(text="Status: Concluído", foreground="blue")
+        self.close_log_file()
     
     def automation_stopped(self):
         """Callback quando automação é parada"""
@@ -303,6 +386,7 @@ class ClickAutomation:
         self.btn_start.config(state="normal")
         self.btn_stop.config(state="disabled")
         self.status_label.config(text="Status: Parado", foreground="red")
+        self.close_log_file()
     
     def automation_error(self):
         """Callback quando ocorre erro"""
@@ -310,18 +394,24 @@ class ClickAutomation:
         self.btn_start.config(state="normal")
         self.btn_stop.config(state="disabled")
         self.status_label.config(text="Status: Erro", foreground="red")
+        self.close_log_file()
     
     def stop_automation(self):
         """Para a automação"""
-        self.is_running = False
+        if self.engine is not None:
+            self.engine.stop()
         self.log("Parando...")
     
     def on_closing(self):
         """Callback ao fechar a janela"""
         self.is_running = False
         self.is_capturing = False
+        if self.engine is not None:
+            self.engine.stop()
         if self.keyboard_listener:
             self.keyboard_listener.stop()
+        self.log_view.stop()
+        self.log_pipeline.close_file()
         self.root.destroy()
 
 
@@ -0,0 +1,258 @@
+"""
+Drivers de entrada do motor de cliques.
+
+O motor só conhece esta interface: mover o cursor, clicar, pressionar e
+soltar teclas. Botões são índices em click_program.BUTTONS (0 esquerdo,
+1 direito, 2 do meio); teclas são resolvidas uma vez antes da execução
+(`resolve_key`), então a execução não faz buscas por nome.
+
+- pynput: mouse e teclado reais (Windows, macOS, X11); requer pynput
+- x11: eventos sintéticos via XTEST com ctypes (libX11 + libXtst), sem
+  dependências Python; funciona em um display virtual (Xvfb)
+- record: grava as ações em memória com o instante de cada uma, para
+  testes e benchmarks de tempo sem display
+"""
+import ctypes
+import ctypes.util
+import os
+import time
+
+try:
+    from . import click_program
+except ImportError:
+    import click_program
+
+# pynput é opcional e só é importado quando o driver é usado
+pynput = None
+
+
+class Driver:
+    """Interface dos drivers"""
+
+    name = "base"
+
+    def resolve_key(self, name):
+        """Representação do driver para uma tecla ("ctrl", "enter", "a")"""
+        raise NotImplementedError
+
+    def move(self, x, y):
+        raise NotImplementedError
+
+    def click(self, button, count):
+        raise NotImplementedError
+
+    def press(self, key):
+        raise NotImplementedError
+
+    def release(self, key):
+        raise NotImplementedError
+
+    def position(self):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PynputDriver(Driver):
+    name = "pynput"
+
+    def __init__(self):
+        global pynput
+        if pynput is None:
+            try:
+                import pynput as module
+                import pynput.keyboard  # noqa: F401 (carrega os submódulos)
+                import pynput.mouse  # noqa: F401
+            except ImportError:
+                raise RuntimeError("pynput não está instalado. Execute: pip install pynput")
+            pynput = module
+        self._mouse = pynput.mouse.Controller()
+        self._keyboard = pynput.keyboard.Controller()
+        Button = pynput.mouse.Button
+        self._buttons = (Button.left, Button.right, Button.middle)
+
+    def resolve_key(self, name):
+        special = pynput.keyboard.Key.__members__.get(name)
+        if special is not None:
+            return special
+        if len(name) == 1:
+            return name
+        raise click_program.ProgramError(f"tecla desconhecida: {name}")
+
+    def move(self, x, y):
+        self._mouse.position = (x, y)
+
+    def click(self, button, count):
+        self._mouse.click(self._buttons[button], count)
+
+    def press(self, key):
+        self._keyboard.press(key)
+
+    def release(self, key):
+        self._keyboard.release(key)
+
+    def position(self):
+        x, y = self._mouse.position
+        return int(x), int(y)
+
+
+# Nomes dos programas (sempre em minúsculas, ver parse_key) -> keysyms do X.
+# Os keysyms diferenciam maiúsculas: fora da tabela, resolve_key tenta "f5" ->
+# "F5" e "scroll_lock" -> "Scroll_Lock" antes de desistir
+X11_KEYSYMS = {
+    "ctrl": "Control_L", "ctrl_l": "Control_L", "ctrl_r": "Control_R",
+    "shift": "Shift_L", "shift_l": "Shift_L", "shift_r": "Shift_R",
+    "alt": "Alt_L", "alt_l": "Alt_L", "alt_r": "Alt_R", "alt_gr": "ISO_Level3_Shift",
+    "cmd": "Super_L", "cmd_l": "Super_L", "cmd_r": "Super_R", "super": "Super_L",
+    "enter": "Return", "esc": "Escape", "space": "space", "tab": "Tab",
+    "backspace": "BackSpace", "delete": "Delete", "insert": "Insert",
+    "home": "Home", "end": "End", "page_up": "Prior", "page_down": "Next",
+    "up": "Up", "down": "Down", "left": "Left", "right": "Right",
+    "caps_lock": "Caps_Lock", "num_lock": "Num_Lock", "scroll_lock": "Scroll_Lock",
+    "print_screen": "Print", "pause": "Pause", "menu": "Menu",
+    "media_play_pause": "XF86AudioPlay", "media_next": "XF86AudioNext",
+    "media_previous": "XF86AudioPrev", "media_volume_mute": "XF86AudioMute",
+    "media_volume_down": "XF86AudioLowerVolume", "media_volume_up": "XF86AudioRaiseVolume",
+}
+# Botões do X na ordem de click_program.BUTTONS
+X11_BUTTONS = (1, 3, 2)
+
+
+class X11Driver(Driver):
+    """Eventos sintéticos no display `display` (padrão: $DISPLAY) pela extensão XTEST"""
+
+    name = "x11"
+
+    def __init__(self, display=None):
+        x11_path = ctypes.util.find_library("X11")
+        xtst_path = ctypes.util.find_library("Xtst")
+        if not x11_path or not xtst_path:
+            raise RuntimeError("libX11/libXtst não encontradas (pacotes libx11-6 e libxtst6)")
+        x11 = ctypes.CDLL(x11_path)
+        xtst = ctypes.CDLL(xtst_path)
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        x11.XFlush.argtypes = [ctypes.c_void_p]
+        x11.XStringToKeysym.argtypes = [ctypes.c_char_p]
+        x11.XStringToKeysym.restype = ctypes.c_ulong
+        x11.XKeysymToKeycode.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+        x11.XKeysymToKeycode.restype = ctypes.c_ubyte
+        x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        x11.XDefaultRootWindow.restype = ctypes.c_ulong
+        x11.XQueryPointer.argtypes = [ctypes.c_void_p, ctypes.c_ulong] + [ctypes.c_void_p] * 7
+        xtst.XTestQueryExtension.argtypes = [ctypes.c_void_p] + [ctypes.c_void_p] * 4
+        xtst.XTestFakeMotionEvent.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_ulong]
+        xtst.XTestFakeButtonEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong]
+        xtst.XTestFakeKeyEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong]
+        self._x11 = x11
+        self._xtst = xtst
+
+        self.display_name = display or os.environ.get("DISPLAY")
+        if not self.display_name:
+            raise RuntimeError("Nenhum display X informado (use --display ou defina DISPLAY)")
+        self._display = x11.XOpenDisplay(self.display_name.encode())
+        if not self._display:
+            raise RuntimeError(f"Não foi possível abrir o display X {self.display_name}")
+        values = [ctypes.c_int() for _ in range(4)]
+        if not xtst.XTestQueryExtension(self._display, *(ctypes.byref(v) for v in values)):
+            self.close()
+            raise RuntimeError(f"O display {self.display_name} não tem a extensão XTEST")
+
+    def resolve_key(self, name):
+        candidates = (X11_KEYSYMS.get(name, name), "_".join(part.capitalize() for part in name.split("_")))
+        keysym = 0
+        for candidate in candidates:
+            keysym = self._x11.XStringToKeysym(candidate.encode())
+            if keysym:
+                break
+        if not keysym and len(name) == 1:
+            # Latin-1: o keysym é o próprio código do caractere (",", "ç"...)
+            keysym = ord(name) if ord(name) < 0x100 else 0x1000000 + ord(name)
+        keycode = self._x11.XKeysymToKeycode(self._display, keysym) if keysym else 0
+        if not keycode:
+            raise click_program.ProgramError(f"tecla desconhecida no display {self.display_name}: {name}")
+        return keycode
+
+    def move(self, x, y):
+        self._xtst.XTestFakeMotionEvent(self._display, -1, x, y, 0)
+        self._x11.XFlush(self._display)
+
+    def click(self, button, count):
+        button = X11_BUTTONS[button]
+        for _ in range(count):
+            self._xtst.XTestFakeButtonEvent(self._display, button, True, 0)
+            self._xtst.XTestFakeButtonEvent(self._display, button, False, 0)
+        self._x11.XFlush(self._display)
+
+    def press(self, key):
+        self._xtst.XTestFakeKeyEvent(self._display, key, True, 0)
+        self._x11.XFlush(self._display)
+
+    def release(self, key):
+        self._xtst.XTestFakeKeyEvent(self._display, key, False, 0)
+        self._x11.XFlush(self._display)
+
+    def position(self):
+        root = ctypes.c_ulong()
+        child = ctypes.c_ulong()
+        root_x, root_y, win_x, win_y = (ctypes.c_int() for _ in range(4))
+        mask = ctypes.c_uint()
+        self._x11.XQueryPointer(self._display, self._x11.XDefaultRootWindow(self._display),
+                                ctypes.byref(root), ctypes.byref(child), ctypes.byref(root_x),
+                                ctypes.byref(root_y), ctypes.byref(win_x), ctypes.byref(win_y),
+                                ctypes.byref(mask))
+        return root_x.value, root_y.value
+
+    def close(self):
+        if self._display:
+            self._x11.XCloseDisplay(self._display)
+            self._display = None
+
+
+class RecordingDriver(Driver):
+    """
+    Guarda as ações em `events` como (instante, ação, a, b):
+    ("move", x, y), ("click", botão, cliques), ("press"/"release", tecla, None).
+    """
+
+    name = "record"
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.events = []
+        self._position = (0, 0)
+
+    def resolve_key(self, name):
+        return name
+
+    def move(self, x, y):
+        self._position = (x, y)
+        self.events.append((self.clock(), "move", x, y))
+
+    def click(self, button, count):
+        self.events.append((self.clock(), "click", button, count))
+
+    def press(self, key):
+        self.events.append((self.clock(), "press", key, None))
+
+    def release(self, key):
+        self.events.append((self.clock(), "release", key, None))
+
+    def position(self):
+        return self._position
+
+
+DRIVERS = {
+    "pynput": PynputDriver,
+    "x11": X11Driver,
+    "record": RecordingDriver,
+}
+
+
+def create_driver(name, **options):
+    """Instancia um driver pelo nome (RuntimeError se indisponível)"""
+    if name not in DRIVERS:
+        raise ValueError(f"Driver desconhecido: {name} (opções: {', '.join(DRIVERS)})")
+    return DRIVERS[name](**options)
@@ -0,0 +1,179 @@
+"""
+Motor de cliques sem interface: executa um programa compilado
+(click_program.ClickPlan) em um driver de entrada (click_drivers).
+
+A interface gráfica é só um cliente do motor; pela linha de comando o
+mesmo programa roda sem Tk:
+
+    python scripts/automation/click_engine.py programa.json
+    python scripts/automation/click_engine.py programa.json --driver x11 --display :99
+    python scripts/automation/click_engine.py programa.json --driver record --quiet --json
+
+Com o driver `record` nenhuma entrada real é gerada: a execução mede só o
+agendamento (atraso por ação e deriva) e roda em qualquer máquina Linux sem
+display.
+"""
+import argparse
+import json
+import signal
+import sys
+import threading
+
+try:
+    from . import click_drivers, click_program, click_scheduler
+except ImportError:
+    import click_drivers
+    import click_program
+    import click_scheduler
+
+
+class ClickEngine:
+    """
+    Executa um ClickPlan em um driver, cada ação no seu prazo absoluto.
+
+    `log(mensagem)` recebe o andamento (None: sem log por ação); `stop()`
+    pode ser chamado de outra thread e é atendido na espera seguinte.
+    """
+
+    def __init__(self, plan, driver, log=None, spin_s=click_scheduler.DEFAULT_SPIN_S,
+                 max_lag_s=click_scheduler.DEFAULT_MAX_LAG_S):
+        self.plan = plan
+        self.driver = driver
+        self.log = log
+        self.spin_s = spin_s
+        self.max_lag_s = max_lag_s
+        self._stop = threading.Event()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def stopped(self):
+        return self._stop.is_set()
+
+    def run(self):
+        """
+        Executa o plano inteiro (ou até stop()).
+
+        Retorna o resumo do agendador com "stopped" e "clicks" (cliques
+        feitos). Teclas desconhecidas pelo driver geram ProgramError antes
+        da primeira ação.
+        """
+        plan = self.plan
+        driver = self.driver
+        log = self.log
+        keys = [tuple(driver.resolve_key(name) for name in combo) for combo in plan.keys]
+        labels = ["+".join(combo) for combo in plan.keys]
+        columns = (plan.ops, plan.offsets, plan.xs, plan.ys, plan.args, plan.steps)
+        op_move = click_program.OP_MOVE
+        op_click = click_program.OP_CLICK
+        op_mark = click_program.OP_MARK
+
+        if log:
+            log(f"Iniciando: {plan.clicks} cliques em {len(plan)} ações ({driver.name})")
+            log(f"Total: {plan.repeat}x")
+
+        scheduler = click_scheduler.DeadlineScheduler(should_stop=self._stop.is_set, spin_s=self.spin_s,
+                                                      max_lag_s=self.max_lag_s)
+        wait = scheduler.wait
+        clicks = 0
+        scheduler.start()
+        for total_rep in range(plan.repeat):
+            if log:
+                log(f"--- Loop {total_rep + 1}/{plan.repeat} ---")
+            base = total_rep * plan.period
+            for op, offset, x, y, arg, step in zip(*columns):
+                if op == op_mark:
+                    if log:
+                        depth, count = plan.loops[arg]
+                        log(f"{'  ' * depth}Rep {x}/{count}")
+                    continue
+                if not wait(base + offset):
+                    break
+                if op == op_move:
+                    driver.move(x, y)
+                elif op == op_click:
+                    driver.click(arg & 3, arg >> 2)
+                    clicks += arg >> 2
+                    if log:
+                        log(f"  Clique #{step} ({x}, {y})")
+                else:
+                    combo = keys[arg]
+                    for key in combo:
+                        driver.press(key)
+                    for key in reversed(combo):
+                        driver.release(key)
+                    if log:
+                        log(f"  Tecla #{step} {labels[arg]}")
+            if self.stopped:
+                break
+
+        result = scheduler.summary()
+        result["stopped"] = self.stopped
+        result["clicks"] = clicks
+        if log and result["actions"]:
+            log(f"Atraso: p50 {result['p50_ms']}ms | p99 {result['p99_ms']}ms | máx {result['max_ms']}ms")
+            log(f"Deriva: {result['drift_ms']}ms em {result['elapsed_s']}s | Ressincronizações: {result['resyncs']}")
+        return result
+
+
+def parse_args(argv=None):
+    """Lê os argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(description="Executa um programa de cliques sem interface gráfica")
+    parser.add_argument("program", help="arquivo do programa (.json)")
+    parser.add_argument("--driver", choices=tuple(click_drivers.DRIVERS), default="pynput",
+                        help="driver de entrada (padrão: pynput; record não gera entrada real)")
+    parser.add_argument("--display", default=None,
+                        help="display X do driver x11 (padrão: $DISPLAY, ex: :99 do Xvfb)")
+    parser.add_argument("--repeat", type=int, default=None,
+                        help="substitui o número de execuções do programa")
+    parser.add_argument("--quiet", action="store_true",
+                        help="não mostra o andamento por ação")
+    parser.add_argument("--json", action="store_true",
+                        help="mostra o resumo final em JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Função principal"""
+    args = parse_args(argv)
+    try:
+        program = click_program.load_program(args.program)
+        if args.repeat is not None:
+            program = dict(program, repeat=args.repeat)
+        plan = click_program.compile_program(program)
+    except (OSError, click_program.ProgramError) as e:
+        print(f"Erro: {e}")
+        return 2
+
+    options = {"display": args.display} if args.driver == "x11" else {}
+    try:
+        driver = click_drivers.create_driver(args.driver, **options)
+    except RuntimeError as e:
+        print(f"Erro: {e}")
+        return 2
+
+    engine = ClickEngine(plan, driver, log=None if args.quiet else print)
+    # Ctrl+C para na próxima espera e ainda mostra o resumo
+    previous_handler = signal.signal(signal.SIGINT, lambda signum, frame: engine.stop())
+    try:
+        result = engine.run()
+    except click_program.ProgramError as e:
+        print(f"Erro: {e}")
+        return 2
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+        driver.close()
+
+    if isinstance(driver, click_drivers.RecordingDriver):
+        result["recorded_events"] = len(driver.events)
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False))
+    elif args.quiet:
+        print(f"Cliques: {result['clicks']} | atraso p50 {result['p50_ms']}ms, p99 {result['p99_ms']}ms, "
+              f"máx {result['max_ms']}ms | deriva {result['drift_ms']}ms em {result['elapsed_s']}s")
+    return 1 if result["stopped"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
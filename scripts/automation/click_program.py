@@ -0,0 +1,317 @@
+"""
+Programas de cliques: formato salvável e plano de ações compilado.
+
+Um programa é um arquivo JSON com uma lista de passos:
+
+    {"name": "Coleta", "delay": 1.0, "settle": 0.1, "repeat": 5, "repeat_delay": 1.0,
+     "steps": [
+        {"click": [100, 200]},
+        {"click": [300, 400], "button": "right", "clicks": 2, "delay": 0.5},
+        {"key": "ctrl+s", "delay": 0.2},
+        {"loop": 3, "delay": 1.0, "steps": [{"click": [500, 600]}]}
+     ]}
+
+- `delay` de um passo: espera depois dele (padrão: o `delay` do programa)
+- `settle`: pausa entre mover o cursor e clicar (por passo ou do programa)
+- `loop`: repete os passos internos; o `delay` do loop é somado à espera
+  do último passo entre as repetições e também antes do passo seguinte ao
+  loop. Só a espera depois da última ação do programa é descartada
+- `repeat`/`repeat_delay`: execuções do programa inteiro e pausa entre elas
+
+O programa é compilado antes da execução em um plano plano (ClickPlan):
+colunas em array com o instante de cada ação desde o início da execução,
+os loops internos já desenrolados. O executor só percorre as colunas e
+espera cada prazo, sem recursão nem condições por passo. O `repeat` do
+programa não é desenrolado: o plano de uma execução é percorrido de novo
+com o deslocamento de `period` segundos.
+"""
+import json
+import os
+import tempfile
+from array import array
+from pathlib import Path
+
+PROGRAMS_DIR = Path(__file__).parent.parent.parent / "click_programs"
+PROGRAM_VERSION = 1
+DEFAULT_DELAY = 1.0
+DEFAULT_SETTLE = 0.1
+
+BUTTONS = ("left", "right", "middle")
+MAX_CLICKS = 255
+# Limite do plano desenrolado (cada ação ocupa ~30 bytes)
+MAX_PLAN_ACTIONS = 5_000_000
+
+# Operações do plano e o significado das colunas x, y, arg:
+# MOVE: x, y | CLICK: x, y, arg = botão + 4 * cliques | KEY: arg = índice em keys
+# MARK (início de uma repetição de loop, só para o log): x = repetição, arg = índice em loops
+OP_MOVE = 0
+OP_CLICK = 1
+OP_KEY = 2
+OP_MARK = 3
+
+
+class ProgramError(ValueError):
+    """Programa com formato inválido"""
+
+
+def parse_key(text):
+    """Combinação de teclas "ctrl+shift+s" -> ("ctrl", "shift", "s")"""
+    if not isinstance(text, str) or not text.strip():
+        raise ProgramError(f"tecla inválida: {text!r}")
+    if text.strip() == "+":
+        return ("+",)
+    parts = tuple(part.strip().lower() for part in text.split("+"))
+    if not all(parts):
+        raise ProgramError(f"tecla inválida: {text!r}")
+    return parts
+
+
+def _number(step, field, default, minimum=0.0):
+    value = step.get(field, default)
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < minimum:
+        raise ProgramError(f"'{field}' inválido em {step!r}")
+    return value
+
+
+def _count(step, field, default, maximum):
+    value = step.get(field, default)
+    if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= maximum:
+        raise ProgramError(f"'{field}' deve ser um inteiro entre 1 e {maximum} em {step!r}")
+    return value
+
+
+class ClickPlan:
+    """
+    Plano compilado de uma execução do programa.
+
+    Colunas paralelas: `ops`, `offsets` (s desde o início da execução),
+    `xs`, `ys`, `args` e `steps` (número do passo no programa, para o log).
+    """
+
+    def __init__(self, name=""):
+        self.name = name
+        self.ops = array("B")
+        self.offsets = array("d")
+        self.xs = array("i")
+        self.ys = array("i")
+        self.args = array("I")
+        self.steps = array("I")
+        self.keys = []
+        self.loops = []
+        self.repeat = 1
+        self.repeat_delay = 0.0
+        self.duration = 0.0
+        self.clicks = 0
+
+    def __len__(self):
+        return len(self.ops)
+
+    @property
+    def period(self):
+        """Intervalo entre o início de duas execuções do programa"""
+        return self.duration + self.repeat_delay
+
+    def _emit(self, op, offset, x=0, y=0, arg=0, step=0):
+        if len(self.ops) >= MAX_PLAN_ACTIONS:
+            raise ProgramError(f"programa expande para mais de {MAX_PLAN_ACTIONS} ações")
+        self.ops.append(op)
+        self.offsets.append(offset)
+        self.xs.append(x)
+        self.ys.append(y)
+        self.args.append(arg)
+        self.steps.append(step)
+
+
+class _Compiler:
+    def __init__(self, program):
+        if not isinstance(program, dict) or not isinstance(program.get("steps"), list):
+            raise ProgramError("programa sem lista 'steps'")
+        self.plan = ClickPlan(str(program.get("name", "")))
+        self.delay = _number(program, "delay", DEFAULT_DELAY)
+        self.settle = _number(program, "settle", DEFAULT_SETTLE)
+        self.plan.repeat = _count(program, "repeat", 1, 10 ** 9)
+        self.plan.repeat_delay = float(_number(program, "repeat_delay", 0.0))
+        self.key_index = {}
+        self.step_number = 0
+        # Instante da última ação e espera pendente até a próxima
+        self.time = 0.0
+        self.pending = 0.0
+
+    def _advance(self):
+        self.time += self.pending
+        self.pending = 0.0
+        return self.time
+
+    def compile(self, steps, depth=0):
+        plan = self.plan
+        for step in steps:
+            if not isinstance(step, dict):
+                raise ProgramError(f"passo inválido: {step!r}")
+            if "loop" in step:
+                count = _count(step, "loop", 1, 10 ** 6)
+                gap = _number(step, "delay", 0.0)
+                body = step.get("steps")
+                if not isinstance(body, list):
+                    raise ProgramError(f"loop sem lista 'steps': {step!r}")
+                loop = len(plan.loops)
+                plan.loops.append((depth, count))
+                entry = self.time + self.pending
+                plan._emit(OP_MARK, entry, x=1, arg=loop)
+                start = len(plan)
+                self.compile(body, depth + 1)
+                if len(plan) == start:
+                    continue
+                end = len(plan)
+                # As demais repetições são cópias da primeira deslocadas no tempo
+                span = self.time + self.pending + gap - entry
+                if (count - 1) * (end - start + 1) > MAX_PLAN_ACTIONS - len(plan):
+                    raise ProgramError(f"programa expande para mais de {MAX_PLAN_ACTIONS} ações")
+                columns = [(column, column[start:end]) for column in
+                           (plan.ops, plan.xs, plan.ys, plan.args, plan.steps)]
+                offsets = plan.offsets[start:end]
+                for iteration in range(2, count + 1):
+                    shift = (iteration - 1) * span
+                    plan._emit(OP_MARK, entry + shift, x=iteration, arg=loop)
+                    for column, segment in columns:
+                        column.extend(segment)
+                    plan.offsets.extend([offset + shift for offset in offsets])
+                self.time += (count - 1) * span
+                # Na saída, a mesma espera de entre as repetições (descartada se o programa acaba aqui)
+                self.pending += gap
+                continue
+
+            self.step_number += 1
+            delay = _number(step, "delay", self.delay)
+            if "click" in step:
+                point = step["click"]
+                if (not isinstance(point, (list, tuple)) or len(point) != 2
+                        or not all(isinstance(v, int) and not isinstance(v, bool) for v in point)):
+                    raise ProgramError(f"'click' deve ser [x, y] inteiros: {step!r}")
+                button = step.get("button", "left")
+                if button not in BUTTONS:
+                    raise ProgramError(f"botão inválido em {step!r} (opções: {', '.join(BUTTONS)})")
+                clicks = _count(step, "clicks", 1, MAX_CLICKS)
+                x, y = point
+                plan._emit(OP_MOVE, self._advance(), x, y, step=self.step_number)
+                self.pending = _number(step, "settle", self.settle)
+                plan._emit(OP_CLICK, self._advance(), x, y, BUTTONS.index(button) + 4 * clicks,
+                           self.step_number)
+            elif "key" in step:
+                combo = parse_key(step["key"])
+                if combo not in self.key_index:
+                    self.key_index[combo] = len(plan.keys)
+                    plan.keys.append(combo)
+                plan._emit(OP_KEY, self._advance(), arg=self.key_index[combo], step=self.step_number)
+            else:
+                raise ProgramError(f"passo sem 'click', 'key' ou 'loop': {step!r}")
+            self.pending = delay
+
+
+def compile_program(program):
+    """Valida o programa e o compila em um ClickPlan (ProgramError se inválido)"""
+    compiler = _Compiler(program)
+    compiler.compile(program["steps"])
+    plan = compiler.plan
+    plan.duration = compiler.time
+    plan.clicks = sum(arg >> 2 for op, arg in zip(plan.ops, plan.args) if op == OP_CLICK)
+    return plan
+
+
+def program_from_settings(coordinates, delay, settle, loop_reps, total_reps, name=""):
+    """Programa equivalente à configuração da interface (coordenadas, delay e repetições)"""
+    return {
+        "name": name,
+        "delay": delay,
+        "settle": settle,
+        "repeat": total_reps,
+        "repeat_delay": delay,
+        "steps": [{"loop": loop_reps, "delay": delay,
+                   "steps": [{"click": [x, y]} for x, y in coordinates]}],
+    }
+
+
+def settings_from_program(program):
+    """
+    Configuração da interface (coordenadas, delay, repetições) de um programa
+    no formato de program_from_settings, ou None se ele usa outros recursos.
+    """
+    steps = program.get("steps")
+    if (not isinstance(steps, list) or len(steps) != 1 or not isinstance(steps[0], dict)
+            or set(steps[0]) != {"loop", "delay", "steps"}):
+        return None
+    loop = steps[0]
+    delay = program.get("delay", DEFAULT_DELAY)
+    if loop["delay"] != delay or program.get("repeat_delay", 0.0) != delay:
+        return None
+    clicks = loop["steps"]
+    if not isinstance(clicks, list) or not all(isinstance(step, dict) and set(step) == {"click"} for step in clicks):
+        return None
+    return {
+        "coordinates": [tuple(step["click"]) for step in clicks],
+        "delay": delay,
+        "settle": program.get("settle", DEFAULT_SETTLE),
+        "loop_reps": loop["loop"],
+        "total_reps": program.get("repeat", 1),
+    }
+
+
+def click_points(program):
+    """Coordenadas dos passos de clique, na ordem do arquivo (loops não desenrolados)"""
+    points = []
+    pending = [iter(program.get("steps", ()))]
+    while pending:
+        step = next(pending[-1], None)
+        if step is None:
+            pending.pop()
+        elif "loop" in step:
+            pending.append(iter(step.get("steps", ())))
+        elif "click" in step:
+            points.append(tuple(step["click"]))
+    return points
+
+
+def load_program(path):
+    """Lê um programa e confere o formato (o plano é compilado à parte)"""
+    with open(path, encoding="utf-8") as f:
+        try:
+            program = json.load(f)
+        except UnicodeDecodeError as e:
+            raise ProgramError(f"{path}: arquivo não está em UTF-8 ({e})")
+        except ValueError as e:
+            raise ProgramError(f"{path}: JSON inválido ({e})")
+    if not isinstance(program, dict) or not isinstance(program.get("steps"), list):
+        raise ProgramError(f"{path}: programa sem lista 'steps'")
+    version = program.get("version", PROGRAM_VERSION)
+    if isinstance(version, bool) or not isinstance(version, int) or version < 1:
+        raise ProgramError(f"{path}: 'version' inválida: {version!r}")
+    if version > PROGRAM_VERSION:
+        raise ProgramError(f"{path}: versão {version} não suportada")
+    return program
+
+
+def save_program(program, path):
+    """
+    Grava o programa de forma atômica, um passo de nível superior por linha
+    (compacto e ainda editável à mão).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    header = {key: value for key, value in program.items() if key != "steps"}
+    header["version"] = PROGRAM_VERSION
+    head = json.dumps(header, ensure_ascii=False)[:-1]
+    body = ",\n".join(json.dumps(step, ensure_ascii=False, separators=(",", ":"))
+                      for step in program.get("steps", ()))
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".click_program-")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(f'{head}, "steps": [\n{body}\n]}}\n')
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return path
+
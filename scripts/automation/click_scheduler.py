@@ -0,0 +1,149 @@
+"""
+Agendador de ações por prazo absoluto (deadline) para a automação de cliques.
+
+Cada ação tem um instante planejado contado a partir do início da execução
+(offset). O agendador espera até `início + offset` em vez de dormir o delay
+depois de cada ação, então o tempo gasto no clique, no log ou em uma
+espera atrasada não se acumula: a execução inteira mantém a cadência
+configurada.
+
+A espera é híbrida: dorme com time.sleep até pouco antes do prazo e gira
+(busy-wait) no fim, o que acerta intervalos abaixo da granularidade do
+sleep do sistema. O atraso de cada ação em relação ao prazo é acumulado em
+um histograma de tamanho fixo (jitter) sem guardar uma amostra por ação.
+"""
+import sys
+import time
+
+# Margem final feita girando: o sleep do Windows antes do Python 3.11 tem
+# granularidade de ~15,6ms; nos demais casos ~1ms basta
+if sys.platform == "win32" and sys.version_info < (3, 11):
+    DEFAULT_SPIN_S = 0.02
+else:
+    DEFAULT_SPIN_S = 0.002
+
+# Fatia máxima de cada sleep, para que um pedido de parada seja atendido logo
+SLEEP_SLICE_S = 0.05
+
+# Atraso a partir do qual o plano é reancorado em vez de disparar em rajada
+# todas as ações que ficaram para trás (ex: máquina travou por um instante)
+DEFAULT_MAX_LAG_S = 0.25
+
+# Histograma do atraso: faixas de 10µs até 100ms, e uma faixa de excesso
+BUCKET_S = 0.00001
+BUCKETS = 10000
+
+
+def wait_until(deadline, should_stop=None, spin_s=DEFAULT_SPIN_S, clock=time.perf_counter):
+    """
+    Espera até o instante `deadline` do relógio `clock`.
+
+    Retorna False se `should_stop()` pediu para parar durante a espera.
+    """
+    while True:
+        remaining = deadline - clock()
+        if remaining <= spin_s:
+            break
+        if should_stop is not None and should_stop():
+            return False
+        time.sleep(min(remaining - spin_s, SLEEP_SLICE_S))
+    while clock() < deadline:
+        pass
+    return should_stop is None or not should_stop()
+
+
+class TimingStats:
+    """Distribuição do atraso das ações em memória constante"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._histogram = [0] * (BUCKETS + 1)
+
+    def record(self, lateness):
+        self.count += 1
+        self.total += lateness
+        if lateness > self.max:
+            self.max = lateness
+        self._histogram[min(int(lateness / BUCKET_S), BUCKETS)] += 1
+
+    def percentile(self, fraction):
+        """Limite superior (s) da faixa que contém o percentil pedido"""
+        if not self.count:
+            return None
+        target = fraction * self.count
+        seen = 0
+        for bucket, hits in enumerate(self._histogram):
+            seen += hits
+            if seen >= target:
+                return self.max if bucket == BUCKETS else min((bucket + 1) * BUCKET_S, self.max)
+        return self.max
+
+    def summary(self):
+        def ms(value):
+            return round(value * 1000, 3) if value is not None else None
+        return {
+            "actions": self.count,
+            "mean_ms": ms(self.total / self.count) if self.count else None,
+            "p50_ms": ms(self.percentile(0.50)),
+            "p95_ms": ms(self.percentile(0.95)),
+            "p99_ms": ms(self.percentile(0.99)),
+            "max_ms": ms(self.max) if self.count else None,
+        }
+
+
+class DeadlineScheduler:
+    """
+    Dispara ações em `início + offset`.
+
+    `should_stop` é consultado durante as esperas; `max_lag_s` limita o
+    atraso recuperado em rajada (acima dele o plano é deslocado para a
+    frente e a ressincronização é contada).
+    """
+
+    def __init__(self, should_stop=None, spin_s=DEFAULT_SPIN_S, max_lag_s=DEFAULT_MAX_LAG_S,
+                 clock=time.perf_counter):
+        self.should_stop = should_stop
+        self.spin_s = spin_s
+        self.max_lag_s = max_lag_s
+        self.clock = clock
+        self.stats = TimingStats()
+        self.origin = None
+        self.shift = 0.0
+        self.resyncs = 0
+        self.last_offset = 0.0
+        self.drift = 0.0
+
+    def start(self):
+        self.origin = self.clock()
+        self.shift = 0.0
+
+    def wait(self, offset):
+        """Espera o prazo da ação em `offset` segundos; False se a execução foi parada"""
+        if self.origin is None:
+            self.start()
+        deadline = self.origin + self.shift + offset
+        if not wait_until(deadline, self.should_stop, self.spin_s, self.clock):
+            return False
+        lateness = self.clock() - deadline
+        self.stats.record(lateness)
+        self.last_offset = offset
+        # Quanto esta ação saiu depois do previsto no plano original
+        self.drift = self.shift + lateness
+        if lateness > self.max_lag_s:
+            self.shift += lateness
+            self.resyncs += 1
+        return True
+
+    def summary(self):
+        """Jitter (atraso por ação), deriva acumulada e ressincronizações"""
+        elapsed = self.clock() - self.origin if self.origin is not None else 0.0
+        result = self.stats.summary()
+        result.update({
+            "drift_ms": round(self.drift * 1000, 3),
+            "planned_s": round(self.last_offset, 3),
+            "elapsed_s": round(elapsed, 3),
+            "resyncs": self.resyncs,
+        })
+        return result
@@ -0,0 +1,220 @@
+"""
+Lista de coordenadas da automação: modelo com alterações incrementais e uma
+Treeview virtualizada.
+
+O modelo guarda os pontos e avisa os observadores do trecho que mudou
+(inserção ou remoção a partir de um índice), em vez de a interface
+reconstruir a lista inteira a cada captura. A numeração é a posição na
+lista, então remover um ponto não exige renumerar nada no modelo.
+
+A Treeview só tem as linhas que cabem na tela: a barra de rolagem é
+controlada pela view, que preenche essas linhas com a janela visível do
+modelo. Capturar, remover ou rolar custa o número de linhas visíveis, não o
+tamanho da lista, então sequências com dezenas de milhares de pontos (ex:
+caminhos importados) continuam responsivas.
+"""
+import tkinter as tk
+
+# Observadores recebem (tipo, início, quantidade)
+INSERT = "insert"
+REMOVE = "remove"
+RESET = "reset"
+
+# Linhas roladas por passo da roda do mouse
+WHEEL_ROWS = 3
+
+
+class CoordinateList:
+    """Sequência de pontos (x, y) que notifica cada alteração"""
+
+    def __init__(self, points=()):
+        self._points = list(points)
+        self._listeners = []
+
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    def _notify(self, kind, start, count):
+        for callback in self._listeners:
+            callback(kind, start, count)
+
+    def __len__(self):
+        return len(self._points)
+
+    def __getitem__(self, index):
+        return self._points[index]
+
+    def __iter__(self):
+        return iter(self._points)
+
+    def append(self, x, y):
+        self.insert(len(self._points), x, y)
+
+    def insert(self, index, x, y):
+        self._points.insert(index, (x, y))
+        self._notify(INSERT, index, 1)
+
+    def extend(self, points):
+        """Acrescenta vários pontos com uma única notificação"""
+        start = len(self._points)
+        self._points.extend(points)
+        if len(self._points) > start:
+            self._notify(INSERT, start, len(self._points) - start)
+
+    def pop(self, index):
+        point = self._points.pop(index)
+        self._notify(REMOVE, index, 1)
+        return point
+
+    def clear(self):
+        self._points.clear()
+        self._notify(RESET, 0, 0)
+
+
+class VirtualTreeview:
+    """
+    Mostra um CoordinateList em uma Treeview com colunas (#, X, Y),
+    materializando só as linhas visíveis.
+
+    A seleção é guardada como índice do modelo e sobrevive à rolagem.
+    """
+
+    def __init__(self, tree, scrollbar, model):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.model = model
+        self.rows = int(tree.cget("height"))
+        self.top = 0
+        self.selected = None
+
+        tree.configure(selectmode="browse", yscrollcommand="")
+        scrollbar.configure(command=self.on_scroll)
+        tree.bind("<<TreeviewSelect>>", self._on_select)
+        tree.bind("<Configure>", self._on_configure)
+        tree.bind("<MouseWheel>", self._on_wheel)
+        tree.bind("<Button-4>", lambda event: self.scroll_rows(-WHEEL_ROWS))
+        tree.bind("<Button-5>", lambda event: self.scroll_rows(WHEEL_ROWS))
+        tree.bind("<Up>", lambda event: self._move_selection(-1))
+        tree.bind("<Down>", lambda event: self._move_selection(1))
+        model.subscribe(self.on_change)
+        self.render()
+
+    def on_change(self, kind, start, count):
+        """Ajusta seleção e janela a uma alteração do modelo; só redesenha se a janela foi afetada"""
+        size = len(self.model)
+        if kind == RESET:
+            self.top = 0
+            self.selected = None
+        elif kind == INSERT:
+            if self.selected is not None and self.selected >= start:
+                self.selected += count
+            # Captura nova com a lista rolada até o fim: acompanha o fim
+            if start + count == size and self.top + self.rows >= start:
+                self.top = max(0, size - self.rows)
+            elif start >= self.top + self.rows:
+                self._update_scrollbar()
+                return
+        elif kind == REMOVE:
+            if self.selected is not None and self.selected >= start:
+                if self.selected < start + count:
+                    self.selected = min(start, size - 1) if size else None
+                else:
+                    self.selected -= count
+            if start >= self.top + self.rows:
+                self._update_scrollbar()
+                return
+        self.render()
+
+    def render(self):
+        """Preenche as linhas materializadas com a janela visível do modelo"""
+        size = len(self.model)
+        self.top = max(0, min(self.top, size - self.rows))
+        visible = min(self.rows, size - self.top)
+
+        items = self.tree.get_children()
+        for item in items[visible:]:
+            self.tree.delete(item)
+        for row in range(len(items), visible):
+            self.tree.insert("", "end", iid=f"row{row}")
+        for row in range(visible):
+            index = self.top + row
+            x, y = self.model[index]
+            self.tree.item(f"row{row}", values=(index + 1, x, y))
+
+        if self.selected is not None and self.top <= self.selected < self.top + visible:
+            item = f"row{self.selected - self.top}"
+            if self.tree.selection() != (item,):
+                self.tree.selection_set(item)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+        self._update_scrollbar()
+
+    def _update_scrollbar(self):
+        size = len(self.model)
+        if size <= self.rows:
+            self.scrollbar.set(0.0, 1.0)
+        else:
+            self.scrollbar.set(self.top / size, (self.top + self.rows) / size)
+
+    def scroll_to(self, top):
+        top = max(0, min(top, len(self.model) - self.rows))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def scroll_rows(self, rows):
+        self.scroll_to(self.top + rows)
+
+    def see(self, index):
+        """Rola o mínimo necessário para o índice ficar visível"""
+        if index < self.top:
+            self.scroll_to(index)
+        elif index >= self.top + self.rows:
+            self.scroll_to(index - self.rows + 1)
+
+    def on_scroll(self, action, amount, unit=None):
+        """Comando da barra de rolagem ("moveto", fração) ou ("scroll", n, "units"/"pages")"""
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.model)))
+        elif action == "scroll":
+            step = self.rows if unit == "pages" else 1
+            self.scroll_rows(int(amount) * step)
+
+    def selected_index(self):
+        """Índice (no modelo) do ponto selecionado, ou None"""
+        if self.selected is not None and self.selected < len(self.model):
+            return self.selected
+        return None
+
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        # Seleção vazia vem de render() ao rolar a seleção para fora da tela
+        if selection:
+            self.selected = self.top + self.tree.index(selection[0])
+
+    def _move_selection(self, step):
+        size = len(self.model)
+        if size:
+            current = self.selected if self.selected is not None else self.top - step
+            self.selected = max(0, min(current + step, size - 1))
+            self.see(self.selected)
+            self.render()
+        return "break"
+
+    def _on_wheel(self, event):
+        # Windows: múltiplos de 120 por passo; macOS: passos pequenos
+        steps = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        self.scroll_rows(-steps * WHEEL_ROWS)
+        return "break"
+
+    def _on_configure(self, event):
+        """Recalcula quantas linhas cabem quando a Treeview muda de tamanho"""
+        children = self.tree.get_children()
+        box = self.tree.bbox(children[0]) if children else None
+        if not box:
+            return
+        _x, first_y, _width, row_height = box
+        rows = max(1, (event.height - first_y) // row_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.render()
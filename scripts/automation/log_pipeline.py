@@ -0,0 +1,117 @@
+"""
+Log da automação em duas pontas: quem gera (qualquer thread) só enfileira,
+e a thread da interface esvazia a fila em lotes, em intervalos fixos.
+
+- A thread de cliques nunca toca no Tk nem em arquivo: `put` é um append
+  em uma deque (atômico no CPython) com o momento da mensagem.
+- A cada quadro (`root.after`), o TkLogView insere todas as linhas
+  pendentes de uma vez e corta o início do widget, que funciona como um
+  anel de no máximo `max_lines` linhas.
+- Opcionalmente, todas as linhas vão para um arquivo, em uma única escrita
+  por quadro.
+
+A fila também é limitada; se a interface ficar parada por muito tempo, as
+mensagens mais antigas são descartadas e a quantidade é informada no log.
+"""
+import time
+from collections import deque
+
+DEFAULT_MAX_LINES = 2000
+DEFAULT_FRAME_MS = 50
+QUEUE_CAPACITY = 200_000
+
+
+class LogPipeline:
+    """Fila de mensagens com destino opcional em arquivo"""
+
+    def __init__(self, capacity=QUEUE_CAPACITY):
+        self._pending = deque(maxlen=capacity)
+        self.dropped = 0
+        self._file = None
+        self._stamp_second = None
+        self._stamp = ""
+
+    def put(self, message):
+        """Enfileira uma mensagem; pode ser chamado de qualquer thread"""
+        pending = self._pending
+        if len(pending) == pending.maxlen:
+            self.dropped += 1
+        pending.append((time.time(), message))
+
+    def _timestamp(self, moment):
+        # strftime uma vez por segundo, não uma vez por linha
+        second = int(moment)
+        if second != self._stamp_second:
+            self._stamp_second = second
+            self._stamp = time.strftime("%H:%M:%S", time.localtime(moment))
+        return self._stamp
+
+    def drain(self):
+        """Retira e formata todas as mensagens pendentes (e as grava no arquivo, se houver)"""
+        lines = []
+        pending = self._pending
+        while True:
+            try:
+                moment, message = pending.popleft()
+            except IndexError:
+                break
+            lines.append(f"[{self._timestamp(moment)}] {message}\n")
+        if lines and self._file is not None:
+            self._file.write("".join(lines))
+            self._file.flush()
+        return lines
+
+    def open_file(self, path):
+        """Passa a gravar o log completo em `path` (acrescentando)"""
+        self.close_file()
+        self._file = open(path, "a", encoding="utf-8", buffering=1024 * 1024)
+
+    def close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class TkLogView:
+    """Mostra o log em um widget de texto do Tk, limitado às últimas `max_lines` linhas"""
+
+    def __init__(self, widget, pipeline, max_lines=DEFAULT_MAX_LINES, frame_ms=DEFAULT_FRAME_MS):
+        self.widget = widget
+        self.pipeline = pipeline
+        self.max_lines = max_lines
+        self.frame_ms = frame_ms
+        self._lines = 0
+        self._reported_dropped = 0
+        self._job = None
+
+    def start(self):
+        self._job = self.widget.after(self.frame_ms, self._tick)
+
+    def stop(self):
+        if self._job is not None:
+            self.widget.after_cancel(self._job)
+            self._job = None
+
+    def _tick(self):
+        self.flush()
+        self._job = self.widget.after(self.frame_ms, self._tick)
+
+    def flush(self):
+        """Esvazia a fila no widget: um insert e no máximo um delete por quadro"""
+        lines = self.pipeline.drain()
+        dropped = self.pipeline.dropped - self._reported_dropped
+        if dropped:
+            self._reported_dropped += dropped
+            lines.insert(0, f"... {dropped} mensagens descartadas (fila cheia)\n")
+        if not lines:
+            return
+        if len(lines) > self.max_lines:
+            # Linhas que sairiam do anel neste mesmo quadro nem chegam ao widget
+            lines = lines[-self.max_lines:]
+        self.widget.insert("end", "".join(lines))
+        self._lines += len(lines)
+        excess = self._lines - self.max_lines
+        if excess > 0:
+            self.widget.delete("1.0", f"{excess + 1}.0")
+            self._lines = self.max_lines
+        self.widget.see("end")
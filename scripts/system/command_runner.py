@@ -0,0 +1,357 @@
+"""
+Camada de execução de comandos externos do scanner.
+
+- AsyncCommandRunner: executa os comandos como subprocessos asyncio em um
+  loop de fundo, então probes em threads diferentes rodam em paralelo
+- memoização: o mesmo comando roda uma vez por scan, mesmo se pedido por
+  várias probes ao mesmo tempo
+- consultas WMI: as probes declaram (classe, propriedades) antes do scan;
+  as propriedades são unidas e cada classe vira uma única chamada ao wmic,
+  ou ao Get-CimInstance do PowerShell onde o wmic não existe mais
+  (Windows 11 24H2)
+- saída dos comandos decodificada pelo BOM (UTF-16) ou pela página de
+  código OEM do console, como o wmic e o PowerShell escrevem
+- RecordingRunner/ReplayRunner: gravam e reproduzem as saídas, para testar
+  e medir os caminhos do Windows em qualquer sistema
+"""
+import codecs
+import ctypes
+import json
+import os
+import platform
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+
+try:
+    from . import probe_timing
+except ImportError:
+    import probe_timing
+
+DEFAULT_TIMEOUT = 10.0
+
+# asyncio é importado no primeiro comando do AsyncCommandRunner: no Linux as
+# probes não executam comandos e o scan não paga a importação
+asyncio = None
+
+_oem_encoding = None
+
+
+def oem_encoding():
+    """Página de código OEM do console no Windows (ex: cp850); utf-8 nos demais"""
+    global _oem_encoding
+    if _oem_encoding is None:
+        encoding = "utf-8"
+        if platform.system() == "Windows":
+            try:
+                candidate = f"cp{ctypes.windll.kernel32.GetOEMCP()}"
+                codecs.lookup(candidate)
+                encoding = candidate
+            except (AttributeError, OSError, LookupError):
+                pass
+        _oem_encoding = encoding
+    return _oem_encoding
+
+
+def decode_output(data):
+    """Bytes da saída de um comando -> texto, com as quebras de linha normalizadas"""
+    if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        text = data.decode("utf-16", "replace")
+    elif data.startswith(codecs.BOM_UTF8):
+        text = data[len(codecs.BOM_UTF8):].decode("utf-8", "replace")
+    else:
+        text = data.decode(oem_encoding(), "replace")
+    return text.replace("\r\n", "\n").replace("\r", "")
+
+
+def parse_wmic_list(output):
+    """Interpreta a saída /format:list do wmic em uma lista de registros"""
+    records = []
+    current = {}
+    for line in output.splitlines():
+        line = line.strip()
+        if not line:
+            if current:
+                records.append(current)
+                current = {}
+            continue
+        if "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        if key in current:
+            # Sem linha em branco entre instâncias: chave repetida abre outro registro
+            records.append(current)
+            current = {}
+        current[key] = value.strip()
+    if current:
+        records.append(current)
+    return records
+
+
+def parse_cim_json(output, properties):
+    """Interpreta a saída JSON do Get-CimInstance com os valores como o wmic (texto, "" se nulo)"""
+    text = output.strip()
+    if not text:
+        return []
+    data = json.loads(text)
+    if isinstance(data, dict):
+        data = [data]
+    return [
+        {name: "" if record.get(name) is None else str(record[name]) for name in properties}
+        for record in data if isinstance(record, dict)
+    ]
+
+
+def parse_reg_query(output):
+    """Interpreta a saída de `reg query CHAVE /s` em {subchave: {valor: dado}}"""
+    keys = {}
+    current = None
+    for line in output.splitlines():
+        if line.startswith("HKEY_"):
+            current = keys.setdefault(line.strip(), {})
+        elif current is not None and line.startswith("    "):
+            parts = line.strip().split("    ", 2)
+            if len(parts) >= 2 and parts[1].startswith("REG_"):
+                current[parts[0]] = parts[2].strip() if len(parts) == 3 else ""
+    return keys
+
+
+class CommandRunner:
+    """
+    Executor base: memoização por comando e plano de consultas WMI.
+
+    Subclasses implementam `_execute(args, timeout)`.
+    """
+
+    system = None
+
+    def __init__(self):
+        self.system = self.system or platform.system()
+        self._lock = threading.Lock()
+        self._memo = {}
+        self._wmi_plan = {}
+        # None até a primeira consulta: o wmic foi removido do Windows 11 24H2
+        self.wmic_available = None
+        self.executed = 0
+        self.requested = 0
+
+    def _execute(self, args, timeout):
+        raise NotImplementedError
+
+    def _submit(self, args, timeout):
+        """Dispara a execução e retorna um Future com o CompletedProcess"""
+        future = Future()
+        try:
+            future.set_result(self._execute(args, timeout))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def run(self, args, timeout=DEFAULT_TIMEOUT):
+        """Executa um comando (ou reaproveita a execução anterior idêntica)"""
+        key = tuple(args)
+        began = time.perf_counter()
+        with self._lock:
+            self.requested += 1
+            future = self._memo.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._memo[key] = future
+                self.executed += 1
+        if owner:
+            # Quem pediu primeiro dispara; os demais esperam o mesmo resultado
+            inner = self._submit(list(args), timeout)
+            try:
+                future.set_result(inner.result())
+            except Exception as e:
+                future.set_exception(e)
+        try:
+            return future.result()
+        finally:
+            span = probe_timing.current_span()
+            if span is not None:
+                span.add_command(owner, time.perf_counter() - began)
+
+    def plan_wmi(self, queries):
+        """Registra (classe, propriedades) que as probes vão consultar neste scan"""
+        with self._lock:
+            for wmi_class, properties in queries:
+                self._wmi_plan.setdefault(wmi_class.lower(), set()).update(properties)
+
+    def _wmi_columns(self, wmi_class, properties):
+        with self._lock:
+            merged = self._wmi_plan.setdefault(wmi_class.lower(), set())
+            merged.update(properties)
+            return sorted(merged)
+
+    def wmi_command(self, wmi_class, properties):
+        """Comando wmic que atende a todas as consultas planejadas da classe"""
+        columns = ",".join(self._wmi_columns(wmi_class, properties))
+        return ["wmic", "path", wmi_class, "get", columns, "/format:list"]
+
+    def cim_command(self, wmi_class, properties):
+        """Equivalente em PowerShell (Get-CimInstance) de wmi_command, com saída JSON"""
+        columns = ",".join(self._wmi_columns(wmi_class, properties))
+        script = (f"ConvertTo-Json -Compress -InputObject "
+                  f"@(Get-CimInstance -ClassName {wmi_class} | Select-Object -Property {columns})")
+        return ["powershell", "-NoProfile", "-NonInteractive", "-Command", script]
+
+    def wmi_query(self, wmi_class, properties, timeout=DEFAULT_TIMEOUT):
+        """
+        Registros da classe WMI, com só as propriedades pedidas.
+
+        Usa o wmic e, se ele não existir, o Get-CimInstance do PowerShell;
+        depois da primeira falha o wmic não é mais tentado neste executor.
+        """
+        if self.wmic_available is not False:
+            try:
+                result = self.run(self.wmi_command(wmi_class, properties), timeout=timeout)
+            except FileNotFoundError:
+                self.wmic_available = False
+            else:
+                self.wmic_available = True
+                wanted = set(properties)
+                return [
+                    {key: value for key, value in record.items() if key in wanted}
+                    for record in parse_wmic_list(result.stdout)
+                ]
+        result = self.run(self.cim_command(wmi_class, properties), timeout=timeout)
+        if result.returncode != 0:
+            raise subprocess.SubprocessError(f"Get-CimInstance {wmi_class} falhou: {result.stderr.strip()}")
+        try:
+            return parse_cim_json(result.stdout, properties)
+        except ValueError as e:
+            raise subprocess.SubprocessError(f"saída inválida do Get-CimInstance {wmi_class}: {e}")
+
+    def registry_query(self, key, timeout=DEFAULT_TIMEOUT):
+        """Subchaves e valores de uma chave do registro (`reg query /s`); {} se ela não existe"""
+        result = self.run(["reg", "query", key, "/s"], timeout=timeout)
+        if result.returncode != 0:
+            return {}
+        return parse_reg_query(result.stdout)
+
+    def close(self):
+        pass
+
+
+class SubprocessRunner(CommandRunner):
+    """Executor síncrono com subprocess.run"""
+
+    def _execute(self, args, timeout):
+        result = subprocess.run(args, capture_output=True, timeout=timeout)
+        return subprocess.CompletedProcess(args, result.returncode, decode_output(result.stdout),
+                                           decode_output(result.stderr))
+
+
+class AsyncCommandRunner(CommandRunner):
+    """Executor com subprocessos asyncio em um loop de fundo compartilhado"""
+
+    def __init__(self):
+        super().__init__()
+        self._loop = None
+        self._thread = None
+
+    def _ensure_loop(self):
+        global asyncio
+        with self._lock:
+            if asyncio is None:
+                import asyncio as module
+                asyncio = module
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+                self._thread.start()
+        return self._loop
+
+    async def _run_async(self, args, timeout):
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise subprocess.TimeoutExpired(args, timeout)
+        return subprocess.CompletedProcess(args, process.returncode, decode_output(stdout), decode_output(stderr))
+
+    def _submit(self, args, timeout):
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self._run_async(args, timeout), loop)
+
+    def close(self):
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+
+class RecordingRunner(CommandRunner):
+    """Repassa para outro executor e grava cada comando e sua saída"""
+
+    def __init__(self, inner):
+        self.system = inner.system
+        super().__init__()
+        self.inner = inner
+        self.records = []
+
+    def _execute(self, args, timeout):
+        began = time.perf_counter()
+        try:
+            # Direto na execução do executor interno: a memoização e a contagem ficam aqui
+            result = self.inner._submit(list(args), timeout).result()
+        except subprocess.TimeoutExpired:
+            self.records.append({"args": list(args), "timeout": True})
+            raise
+        self.records.append({
+            "args": list(args),
+            "returncode": result.returncode,
+            "stdout": result.stdout,
+            "stderr": result.stderr,
+            "elapsed_s": round(time.perf_counter() - began, 4),
+        })
+        return result
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"system": self.system, "hostname": platform.node(), "commands": self.records},
+                      f, indent=2, ensure_ascii=False)
+
+    def close(self):
+        self.inner.close()
+
+
+class ReplayRunner(CommandRunner):
+    """
+    Reproduz saídas gravadas; comandos não gravados falham como não encontrados.
+
+    Com `latency=True`, cada comando demora o tempo gravado (`elapsed_s`),
+    para medir o efeito do paralelismo e da memoização sem o Windows.
+    `source` é o arquivo reproduzido e `hostname` a máquina gravada
+    ("replay:<arquivo>" em gravações antigas, sem o nome da máquina).
+    """
+
+    def __init__(self, path=None, fixture=None, latency=False):
+        if fixture is None:
+            with open(path, encoding="utf-8") as f:
+                fixture = json.load(f)
+        self.system = fixture.get("system")
+        self.source = str(path) if path is not None else None
+        self.hostname = fixture.get("hostname") or f"replay:{os.path.basename(self.source or 'fixture')}"
+        super().__init__()
+        self.latency = latency
+        self._fixtures = {tuple(entry["args"]): entry for entry in fixture.get("commands", [])}
+
+    def _execute(self, args, timeout):
+        entry = self._fixtures.get(tuple(args))
+        if entry is None:
+            raise FileNotFoundError(f"Comando não gravado: {' '.join(args)}")
+        if self.latency and entry.get("elapsed_s"):
+            time.sleep(min(entry["elapsed_s"], timeout))
+        if entry.get("timeout"):
+            raise subprocess.TimeoutExpired(args, timeout)
+        return subprocess.CompletedProcess(args, entry["returncode"], entry["stdout"], entry["stderr"])
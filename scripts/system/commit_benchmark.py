@@ -0,0 +1,275 @@
+"""
+Teste de compromisso de memória: o sistema consegue mesmo reservar a
+memória virtual que a modlist precisa (RAM + pagefile/swap)?
+
+O tamanho configurado do pagefile não responde isso sozinho. O teste
+reserva regiões anônimas com mmap em blocos grandes e escreve um byte por
+página de cada bloco, medindo a vazão de page faults. Para quando atinge o
+alvo, quando o sistema recusa a reserva, quando a vazão despenca (a memória
+passou a ir para o disco) ou quando a margem de segurança seria violada.
+Todos os blocos são liberados no fim, mesmo em caso de erro.
+
+Segurança: antes de cada bloco a margem de compromisso do sistema é lida
+de novo e o teste para se sobrarem menos de `reserve` bytes depois dele.
+No Windows e no Linux com overcommit_memory=2 a reserva é contabilizada no
+mmap e falha de forma limpa; no Linux com overcommit heurístico a margem é
+MemAvailable + SwapFree e o processo se oferece como primeiro alvo do OOM
+killer durante o teste.
+"""
+import mmap
+import os
+import platform
+import statistics
+import time
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+GB = 1024 ** 3
+MB = 1024 ** 2
+
+DEFAULT_TARGET_GB = 40
+DEFAULT_CHUNK_MB = 256
+DEFAULT_MAX_SECONDS = 60.0
+# Margem mínima deixada livre: o maior entre 1GB e 10% do limite de compromisso
+MIN_RESERVE_BYTES = GB
+RESERVE_FRACTION = 0.10
+
+# Os primeiros blocos definem a vazão normal; dois blocos seguidos abaixo de
+# CLIFF_RATIO dessa vazão indicam que a memória está indo para o disco
+BASELINE_CHUNKS = 3
+CLIFF_RATIO = 0.25
+CLIFF_CHUNKS = 2
+
+
+def _meminfo(proc_root="/proc"):
+    """Campos de /proc/meminfo em bytes"""
+    values = {}
+    with open(os.path.join(proc_root, "meminfo"), encoding="ascii") as f:
+        for line in f:
+            name, _, rest = line.partition(":")
+            fields = rest.split()
+            if fields:
+                values[name] = int(fields[0]) * (1024 if fields[1:] == ["kB"] else 1)
+    return values
+
+
+def _overcommit_mode(proc_root="/proc"):
+    try:
+        with open(os.path.join(proc_root, "sys", "vm", "overcommit_memory"), encoding="ascii") as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return 0
+
+
+def _windows_commit():
+    """(limite, disponível) de compromisso via GlobalMemoryStatusEx"""
+    import ctypes
+
+    class MEMORYSTATUSEX(ctypes.Structure):
+        _fields_ = [
+            ("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+            ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+            ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+            ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+            ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+        ]
+
+    status = MEMORYSTATUSEX()
+    status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+    if not ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+        raise OSError("GlobalMemoryStatusEx falhou")
+    # "PageFile" aqui é o limite de compromisso inteiro (RAM + pagefiles)
+    return status.ullTotalPageFile, status.ullAvailPageFile
+
+
+def commit_status():
+    """
+    Margem de compromisso do sistema agora.
+
+    Retorna {"limit", "available", "enforced", "source"}; `enforced` indica
+    que o sistema recusa uma reserva acima do limite (em vez de aceitar e
+    depender do OOM killer).
+    """
+    system = platform.system()
+    if system == "Windows":
+        limit, available = _windows_commit()
+        return {"limit": limit, "available": available, "enforced": True, "source": "GlobalMemoryStatusEx"}
+    if system == "Linux":
+        info = _meminfo()
+        if _overcommit_mode() == 2:
+            limit = info["CommitLimit"]
+            return {"limit": limit, "available": max(0, limit - info["Committed_AS"]),
+                    "enforced": True, "source": "CommitLimit"}
+        return {"limit": info["MemTotal"] + info.get("SwapTotal", 0),
+                "available": info.get("MemAvailable", info["MemFree"]) + info.get("SwapFree", 0),
+                "enforced": False, "source": "MemAvailable+SwapFree"}
+    if psutil is None:
+        raise RuntimeError("psutil não está instalado. Execute: pip install psutil")
+    memory = psutil.virtual_memory()
+    swap = psutil.swap_memory()
+    return {"limit": memory.total + swap.total, "available": memory.available + swap.free,
+            "enforced": False, "source": "psutil"}
+
+
+def _prefer_oom_victim():
+    """No Linux, torna este processo o primeiro alvo do OOM killer; retorna o valor anterior"""
+    path = "/proc/self/oom_score_adj"
+    try:
+        with open(path, encoding="ascii") as f:
+            previous = f.read().strip()
+        with open(path, "w", encoding="ascii") as f:
+            f.write("1000")
+        return previous
+    except OSError:
+        return None
+
+
+def _restore_oom_score(previous):
+    if previous is None:
+        return
+    try:
+        with open("/proc/self/oom_score_adj", "w", encoding="ascii") as f:
+            f.write(previous)
+    except OSError:
+        pass
+
+
+def _minor_faults():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_minflt if resource else None
+
+
+def _reserve(size):
+    """Região anônima privada de `size` bytes (a reserva de compromisso acontece aqui)"""
+    if hasattr(mmap, "MAP_ANONYMOUS"):
+        return mmap.mmap(-1, size, flags=mmap.MAP_PRIVATE | mmap.MAP_ANONYMOUS)
+    return mmap.mmap(-1, size)
+
+
+def _touch(region, size):
+    """Escreve um byte em cada página; uma única atribuição com passo, feita em C"""
+    pages = (size + mmap.PAGESIZE - 1) // mmap.PAGESIZE
+    region[::mmap.PAGESIZE] = b"\x01" * pages
+    return pages
+
+
+def run_commit_benchmark(target_gb=DEFAULT_TARGET_GB, chunk_mb=DEFAULT_CHUNK_MB,
+                         reserve_gb=None, max_seconds=DEFAULT_MAX_SECONDS):
+    """
+    Reserva e toca memória em blocos até `target_gb` ou até um limite.
+
+    Depois do ponto de queda de vazão, nos sistemas que contabilizam a
+    reserva no mmap, os blocos seguintes só são reservados (não tocados):
+    isso confirma o compromisso sem forçar o sistema a paginar.
+    """
+    chunk = chunk_mb * MB
+    target = int(target_gb * GB)
+    start_status = commit_status()
+    if reserve_gb is None:
+        reserve = max(MIN_RESERVE_BYTES, int(start_status["limit"] * RESERVE_FRACTION))
+    else:
+        reserve = int(reserve_gb * GB)
+
+    regions = []
+    committed = 0
+    touched = 0
+    throughputs = []
+    chunk_ms = []
+    faults = 0
+    fault_seconds = 0.0
+    slow_streak = 0
+    baseline = None
+    cliff_at = None
+    stop_reason = "target"
+    error = None
+
+    started = time.perf_counter()
+    previous_oom_score = _prefer_oom_victim() if platform.system() == "Linux" else None
+    try:
+        while committed < target:
+            size = min(chunk, target - committed)
+            if commit_status()["available"] - size < reserve:
+                stop_reason = "safety_limit"
+                break
+            if time.perf_counter() - started > max_seconds:
+                stop_reason = "time_limit"
+                break
+            try:
+                region = _reserve(size)
+            except (OSError, MemoryError, OverflowError) as e:
+                stop_reason = "commit_failed"
+                error = str(e)
+                break
+            regions.append(region)
+            committed += size
+
+            if cliff_at is not None:
+                # Só reserva: continuar tocando seria paginar para o disco
+                continue
+
+            faults_before = _minor_faults()
+            chunk_start = time.perf_counter()
+            _touch(region, size)
+            elapsed = time.perf_counter() - chunk_start
+            touched += size
+            chunk_ms.append(elapsed * 1000)
+            throughputs.append(size / elapsed)
+            if faults_before is not None:
+                faults += _minor_faults() - faults_before
+                fault_seconds += elapsed
+
+            if baseline is None:
+                if len(throughputs) >= BASELINE_CHUNKS:
+                    baseline = statistics.median(throughputs)
+                continue
+            slow_streak = slow_streak + 1 if throughputs[-1] < baseline * CLIFF_RATIO else 0
+            if slow_streak >= CLIFF_CHUNKS:
+                cliff_at = touched - size * CLIFF_CHUNKS
+                if not start_status["enforced"]:
+                    # Sem contabilidade no mmap, reservar sem tocar não prova nada
+                    stop_reason = "latency_cliff"
+                    break
+    finally:
+        release_start = time.perf_counter()
+        for region in regions:
+            region.close()
+        regions.clear()
+        release_s = time.perf_counter() - release_start
+        _restore_oom_score(previous_oom_score)
+
+    result = {
+        "target_gb": target_gb,
+        "committed_gb": round(committed / GB, 2),
+        "touched_gb": round(touched / GB, 2),
+        "reached_target": committed >= target,
+        "stop_reason": stop_reason,
+        "latency_cliff_gb": round(cliff_at / GB, 2) if cliff_at is not None else None,
+        "commit_enforced": start_status["enforced"],
+        "commit_limit_gb": round(start_status["limit"] / GB, 2),
+        "commit_available_gb": round(start_status["available"] / GB, 2),
+        "commit_source": start_status["source"],
+        "reserve_gb": round(reserve / GB, 2),
+        "chunk_mb": chunk_mb,
+        "chunks": len(chunk_ms),
+        "release_s": round(release_s, 3),
+        "elapsed_s": round(time.perf_counter() - started, 2),
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    if throughputs:
+        result["touch_gb_s"] = round((baseline or statistics.median(throughputs)) / GB, 2)
+        result["touch_min_gb_s"] = round(min(throughputs) / GB, 2)
+        result["chunk_p50_ms"] = round(statistics.median(chunk_ms), 1)
+        result["chunk_max_ms"] = round(max(chunk_ms), 1)
+    if fault_seconds:
+        # Com huge pages transparentes há menos faults que páginas tocadas
+        result["page_faults_per_s"] = round(faults / fault_seconds)
+    if error:
+        result["error"] = error
+    return result
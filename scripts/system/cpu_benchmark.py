@@ -0,0 +1,228 @@
+"""
+Micro-benchmarks de CPU e memória para comparar máquinas objetivamente.
+
+- single-thread: laços fixos de inteiros e ponto flutuante
+- multi-core: o laço de inteiros em um processo por núcleo lógico
+- memória: largura de banda (cópia) e latência de acesso aleatório (leituras
+  dependentes em um ciclo aleatório) com buffers NumPy
+
+As cargas são determinísticas e cada teste usa a mediana de algumas
+repetições (com a dispersão entre elas no resultado, para saber quanto
+confiar no número). As pontuações são normalizadas para 1000 na máquina de
+referência (REFERENCE_MACHINE); como os laços são Python puro, a pontuação
+depende também da versão do interpretador, que fica registrada junto.
+
+Para recalibrar, rode calibrate() (`bench-cpu --calibrate`) na máquina de
+referência e copie as medianas para REFERENCE_INT_S e REFERENCE_FLOAT_S.
+"""
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+INT_ITERATIONS = 400_000
+FLOAT_ITERATIONS = 1_000_000
+
+# Mediana de cada laço na máquina de referência (pontuação 1000)
+REFERENCE_INT_S = 0.060
+REFERENCE_FLOAT_S = 0.050
+REFERENCE_MACHINE = {
+    "cpu": "Intel Core i7-11700K (8 núcleos/16 threads, 3.6 GHz base, sem overclock)",
+    "os": "Windows 11",
+    "python": "CPython 3.11",
+}
+
+MEMORY_BUFFER_MB = 128
+RANDOM_ACCESS_MB = 64
+POINTER_CHASE_STEPS = 200_000
+# Ciclo que cabe no L1: mede só o custo do laço Python, descontado da latência
+POINTER_CHASE_BASELINE_KB = 16
+
+DEFAULT_BUDGET_S = 5.0
+MIN_REPEATS = 3
+MAX_REPEATS = 7
+# Rodadas medidas do teste multi-core (depois de uma de aquecimento)
+MULTI_CORE_ROUNDS = 3
+
+
+def int_kernel(iterations=INT_ITERATIONS):
+    """Gerador congruencial com xor: só aritmética de inteiros"""
+    x = 1
+    acc = 0
+    for i in range(iterations):
+        x = (x * 1103515245 + 12345) & 0x7FFFFFFF
+        acc ^= x >> (i & 7)
+    return acc
+
+
+def float_kernel(iterations=FLOAT_ITERATIONS):
+    """Mapa logístico: multiplicações e somas em ponto flutuante"""
+    x = 0.5
+    acc = 0.0
+    for _ in range(iterations):
+        x = x * 3.9 * (1.0 - x)
+        acc += x * x
+    return acc
+
+
+def _timed_int_kernel(_):
+    start = time.perf_counter()
+    int_kernel()
+    return time.perf_counter() - start
+
+
+def _times(func, deadline):
+    """Tempos das repetições que couberem no prazo (no mínimo MIN_REPEATS)"""
+    times = []
+    for i in range(MAX_REPEATS):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+        if i + 1 >= MIN_REPEATS and time.perf_counter() > deadline:
+            break
+    return times
+
+
+def _spread(values):
+    """Amplitude das repetições em % da mediana"""
+    median = statistics.median(values)
+    return round((max(values) - min(values)) / median * 100, 1) if median else 0.0
+
+
+def _multi_core(workers):
+    """Throughput (laços/s) de cada rodada, com um processo por núcleo lógico"""
+    rates = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Primeira rodada aquece os processos (importação, fork/spawn)
+        list(pool.map(_timed_int_kernel, range(workers)))
+        for _ in range(MULTI_CORE_ROUNDS):
+            start = time.perf_counter()
+            list(pool.map(_timed_int_kernel, range(workers * 2)))
+            rates.append(workers * 2 / (time.perf_counter() - start))
+    return rates
+
+
+def _memory_bandwidth(deadline):
+    """Largura de banda de cópia em GB/s (lê e escreve o buffer inteiro)"""
+    count = MEMORY_BUFFER_MB * 1024 * 1024 // 8
+    src = np.arange(count, dtype=np.float64)
+    dst = np.empty_like(src)
+    np.copyto(dst, src)
+    elapsed = statistics.median(_times(lambda: np.copyto(dst, src), deadline))
+    return 2 * src.nbytes / elapsed / 1e9
+
+
+def _pointer_cycle(count, rng):
+    """Permutação com um único ciclo: cycle[i] é o próximo índice visitado"""
+    order = rng.permutation(count)
+    cycle = np.empty(count, dtype=np.int64)
+    cycle[order] = np.roll(order, -1)
+    return memoryview(cycle)
+
+
+def _chase(cycle, steps=POINTER_CHASE_STEPS):
+    """Segue o ciclo: cada endereço depende da leitura anterior"""
+    i = 0
+    for _ in range(steps):
+        i = cycle[i]
+    return i
+
+
+def _random_access(deadline):
+    """
+    Latência (ns) de uma leitura aleatória em um buffer maior que o cache.
+
+    As leituras são dependentes (pointer chasing), então não se sobrepõem
+    como em uma coleta vetorizada; o mesmo percurso em um ciclo dentro do L1
+    dá o custo do laço Python, que é descontado.
+    """
+    rng = np.random.default_rng(42)
+    cycle = _pointer_cycle(RANDOM_ACCESS_MB * 1024 * 1024 // 8, rng)
+    baseline = _pointer_cycle(POINTER_CHASE_BASELINE_KB * 1024 // 8, rng)
+    _chase(cycle)
+    chase_s = statistics.median(_times(lambda: _chase(cycle), deadline))
+    baseline_s = statistics.median(_times(lambda: _chase(baseline), deadline))
+    return max(chase_s - baseline_s, 0.0) / POINTER_CHASE_STEPS * 1e9
+
+
+def interpreter():
+    """Versão do Python que executou os laços (a pontuação depende dela)"""
+    return f"{platform.python_implementation()} {platform.python_version()}"
+
+
+def run_benchmark(budget_s=DEFAULT_BUDGET_S, workers=None):
+    """
+    Executa a suíte e retorna as pontuações.
+
+    `budget_s` limita as repetições dos testes single-thread e de memória;
+    cada teste roda pelo menos MIN_REPEATS vezes. `runs` e `spread_percent`
+    dizem quantas repetições entraram em cada mediana e a amplitude delas.
+    """
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    deadline = start + budget_s / 3
+
+    int_times = _times(int_kernel, deadline)
+    deadline = time.perf_counter() + budget_s / 3
+    float_times = _times(float_kernel, deadline)
+    int_time = statistics.median(int_times)
+    float_time = statistics.median(float_times)
+
+    int_score = REFERENCE_INT_S / int_time * 1000
+    float_score = REFERENCE_FLOAT_S / float_time * 1000
+    single_score = (int_score * float_score) ** 0.5
+
+    single_rate = 1 / int_time
+    multi_rates = _multi_core(workers)
+    scaling = statistics.median(multi_rates) / single_rate
+
+    result = {
+        "single_thread_int_score": round(int_score),
+        "single_thread_float_score": round(float_score),
+        "single_thread_score": round(single_score),
+        "multi_core_score": round(int_score * scaling),
+        "multi_core_scaling": round(scaling, 2),
+        "workers": workers,
+        "runs": {"int": len(int_times), "float": len(float_times), "multi_core": len(multi_rates)},
+        "spread_percent": {"int": _spread(int_times), "float": _spread(float_times),
+                           "multi_core": _spread(multi_rates)},
+    }
+
+    if np is not None:
+        deadline = time.perf_counter() + budget_s / 6
+        result["memory_bandwidth_gb_s"] = round(_memory_bandwidth(deadline), 2)
+        deadline = time.perf_counter() + budget_s / 6
+        result["memory_random_access_ns"] = round(_random_access(deadline), 2)
+
+    result["python"] = interpreter()
+    result["python_build"] = sys.version
+    result["reference"] = REFERENCE_MACHINE
+    result["elapsed_s"] = round(time.perf_counter() - start, 2)
+    result["date"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+    return result
+
+
+def calibrate(repeats=MAX_REPEATS):
+    """
+    Medianas dos laços single-thread nesta máquina, para copiar para
+    REFERENCE_INT_S/REFERENCE_FLOAT_S quando ela é a de referência.
+    """
+    int_times = [_timed_int_kernel(None) for _ in range(repeats)]
+    float_times = []
+    for _ in range(repeats):
+        begin = time.perf_counter()
+        float_kernel()
+        float_times.append(time.perf_counter() - begin)
+    return {
+        "REFERENCE_INT_S": round(statistics.median(int_times), 4),
+        "REFERENCE_FLOAT_S": round(statistics.median(float_times), 4),
+        "spread_percent": {"int": _spread(int_times), "float": _spread(float_times)},
+        "python": interpreter(),
+    }
@@ -0,0 +1,328 @@
+"""
+Base de referência de CPUs: geração, núcleos e nível de desempenho.
+
+A base (data/cpu_models.json) é compilada uma vez em um índice binário no
+cache, como o pci_ids: registros de tamanho fixo ordenados pelo hash de 64
+bits do nome normalizado, seguidos dos textos. Consultar é normalizar o
+nome com operações de string (sem regex) e fazer uma busca binária; em lote
+(frota), os nomes repetidos são normalizados uma vez e todos os hashes são
+procurados de uma vez com NumPy.
+
+Níveis (tier): 1 abaixo do mínimo, 2 próximo, 3 o mínimo do LoreRim
+(i7-11700K ou equivalente), 4 acima.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from bisect import bisect_left
+from pathlib import Path
+
+SOURCE = Path(__file__).parent / "data" / "cpu_models.json"
+CACHE_DIR = Path(__file__).parent.parent.parent / "cache" / "cpu_models"
+INDEX_VERSION = 1
+
+# magic, versão, nº de modelos, mtime e tamanho da base
+HEADER = struct.Struct("<4sIIQQ")
+MAGIC = b"CPUD"
+# hash do nome normalizado, posição e tamanho dos textos, geração (0 = sem),
+# ano, núcleos, threads, nível
+RECORD = struct.Struct("<QIHHHHHB")
+TEXT_FIELDS = ("key", "model", "vendor", "family", "architecture")
+
+# Palavras que não identificam o modelo ("Intel(R) Core(TM) ... CPU @ 3.60GHz")
+NOISE_WORDS = {
+    "intel", "amd", "cpu", "processor", "core", "gen", "generation",
+    "pro", "mobile", "apu", "quad", "dual", "six", "eight",
+}
+# Removidas antes de separar as palavras: "FX(tm)-8350" -> "fx-8350"
+TRADEMARKS = ("(r)", "(tm)", "®", "™")
+_PUNCTUATION = str.maketrans({char: " " for char in "(),/"})
+_ORDINAL_SUFFIXES = ("st", "nd", "rd", "th")
+# Sufixos de SKU de desktop que não mudam o nível (KF = K sem vídeo integrado, etc.);
+# os de notebook (H, U, HX) ficam de fora porque o nível é outro
+SKU_SUFFIXES = ("kf", "ks", "k", "f", "t", "x", "ge", "g")
+
+
+def normalize(model):
+    """
+    Chave de busca de um nome de CPU.
+
+    "11th Gen Intel(R) Core(TM) i7-11700K @ 3.60GHz" -> "i7-11700k"
+    "AMD Ryzen 7 5800X 8-Core Processor" -> "ryzen 5800x"
+    """
+    text = (model or "").lower().split("@", 1)[0].split(" with ", 1)[0]
+    for mark in TRADEMARKS:
+        text = text.replace(mark, "")
+    text = text.translate(_PUNCTUATION)
+    tokens = [
+        token for token in text.split()
+        if token not in NOISE_WORDS and not token.endswith("-core")
+        and not (token[:-2].isdigit() and token.endswith(_ORDINAL_SUFFIXES))
+    ]
+    key = []
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        following = tokens[i + 1] if i + 1 < len(tokens) else ""
+        if token in ("i3", "i5", "i7", "i9") and following[:1].isdigit():
+            # "Core i7 11700K" -> "i7-11700k"
+            key.append(f"{token}-{following}")
+            i += 2
+            continue
+        key.append(token)
+        # O dígito da linha ("Ryzen 7", "Ultra 7") é redundante com o número do modelo
+        if token in ("ryzen", "ultra") and len(following) == 1 and following.isdigit():
+            i += 1
+        i += 1
+    return " ".join(key)
+
+
+def variants(key):
+    """Chaves a tentar, da mais exata para a mais genérica (ex: i7-11700kf, i7-11700k, i7-11700)"""
+    keys = [key]
+    if key.endswith("f"):
+        keys.append(key[:-1])
+    head, _, last = key.rpartition(" ")
+    for suffix in SKU_SUFFIXES:
+        stem = last[:-len(suffix)]
+        if last.endswith(suffix) and stem[-1:].isdigit():
+            base = f"{head} {stem}" if head else stem
+            if base not in keys:
+                keys.append(base)
+            break
+    return keys
+
+
+def key_hash(key):
+    """Hash de 64 bits da chave normalizada"""
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def estimate(key):
+    """Família e geração deduzidas do número do modelo, para CPUs fora da base"""
+    head, _, last = key.rpartition(" ")
+    if last[:3] in ("i3-", "i5-", "i7-", "i9-"):
+        digits = ""
+        for char in last[3:]:
+            if not char.isdigit():
+                break
+            digits += char
+        if len(digits) >= 4:
+            # i7-8700 -> 8, i7-11700 -> 11; nos móveis de 4 dígitos a geração
+            # 10+ ocupa dois: i5-1135G7 -> 11, i3-1005G1 -> 10, i7-1260P -> 12
+            two_digit = len(digits) == 5 or digits[0] == "1"
+            return {"family": f"Core {last[:2]}", "generation": int(digits[:2] if two_digit else digits[0])}
+    if head.startswith("ryzen") and last[:1].isdigit():
+        return {"family": "Ryzen", "generation": int(last[0])}
+    return None
+
+
+def compile_index(source, index_path):
+    """Compila a base JSON `source` no índice binário `index_path` (gravação atômica)"""
+    st = os.stat(source)
+    with open(source, encoding="utf-8") as f:
+        data = json.load(f)
+    columns = data["columns"]
+
+    entries = {}
+    for row in data["models"]:
+        item = dict(zip(columns, row))
+        key = normalize(item["model"])
+        digest = key_hash(key)
+        if digest in entries:
+            raise ValueError(f"Modelo duplicado na base de CPUs: {item['model']} ({key})")
+        item["key"] = key
+        entries[digest] = item
+
+    texts = bytearray()
+    table = bytearray()
+    for digest in sorted(entries):
+        item = entries[digest]
+        text = "\t".join(item[field] for field in TEXT_FIELDS).encode("utf-8")
+        table += RECORD.pack(digest, len(texts), len(text), item["generation"] or 0, item["year"],
+                             item["cores"], item["threads"], item["tier"])
+        texts += text
+    tiers = json.dumps(data.get("tiers", {}), ensure_ascii=False).encode("utf-8")
+
+    index_path = Path(index_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=index_path.parent, prefix=".cpu_models-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, INDEX_VERSION, len(entries), st.st_mtime_ns, st.st_size))
+            f.write(table)
+            f.write(struct.pack("<I", len(tiers)))
+            f.write(tiers)
+            f.write(texts)
+        os.replace(tmp, index_path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return index_path
+
+
+class _HashView:
+    """Sequência dos hashes do índice, lida sob demanda pela busca binária"""
+
+    def __init__(self, data, count):
+        self._data = data
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, position):
+        return RECORD.unpack_from(self._data, HEADER.size + position * RECORD.size)[0]
+
+
+class CpuDatabase:
+    """Índice compilado aberto com mmap"""
+
+    def __init__(self, index_path):
+        with open(index_path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, self._count, self.source_mtime_ns, self.source_size = HEADER.unpack_from(self._data, 0)
+            if magic != MAGIC or version != INDEX_VERSION:
+                raise ValueError(f"Índice de CPUs incompatível: {index_path}")
+            tiers_offset = HEADER.size + self._count * RECORD.size
+            (tiers_size,) = struct.unpack_from("<I", self._data, tiers_offset)
+            self.tiers = {int(k): v for k, v in
+                          json.loads(self._data[tiers_offset + 4:tiers_offset + 4 + tiers_size]).items()}
+            self._texts_offset = tiers_offset + 4 + tiers_size
+        except (struct.error, ValueError):
+            self._data.close()
+            raise
+        self._hashes = _HashView(self._data, self._count)
+        self._sorted_hashes = None
+
+    def __len__(self):
+        return self._count
+
+    def _entry(self, position, key):
+        """Registro na posição, ou None se o texto não confirmar a chave (colisão de hash)"""
+        _digest, start, length, generation, year, cores, threads, tier = \
+            RECORD.unpack_from(self._data, HEADER.size + position * RECORD.size)
+        start += self._texts_offset
+        texts = dict(zip(TEXT_FIELDS, self._data[start:start + length].decode("utf-8").split("\t")))
+        if texts.pop("key") != key:
+            return None
+        return dict(texts, generation=generation or None, year=year, cores=cores, threads=threads,
+                    tier=tier, tier_name=self.tiers.get(tier))
+
+    def _position(self, key):
+        digest = key_hash(key)
+        position = bisect_left(self._hashes, digest)
+        if position < self._count and self._hashes[position] == digest:
+            return position
+        return None
+
+    def lookup(self, key):
+        """Registro de uma chave já normalizada, ou None"""
+        position = self._position(key)
+        return self._entry(position, key) if position is not None else None
+
+    def classify(self, model):
+        """
+        Classifica um nome de CPU como vem de get_cpu_info.
+
+        Retorna o registro da base com "match" ("exact" ou "variant", quando
+        só o modelo sem o sufixo de SKU está na base), uma estimativa de
+        família e geração sem nível ("estimated"), ou None.
+        """
+        key = normalize(model)
+        if not key:
+            return None
+        for i, candidate in enumerate(variants(key)):
+            entry = self.lookup(candidate)
+            if entry is not None:
+                entry["match"] = "exact" if i == 0 else "variant"
+                return entry
+        guess = estimate(key)
+        if guess is not None:
+            guess["match"] = "estimated"
+        return guess
+
+    def classify_many(self, models):
+        """
+        Classifica muitos nomes de uma vez (ex: a frota inteira).
+
+        Cada nome distinto é normalizado uma única vez; com NumPy, todos os
+        hashes são procurados em uma só chamada de searchsorted.
+        """
+        # NumPy só aqui: o scan consulta um modelo por vez e não paga a importação
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+
+        distinct = {}
+        for model in models:
+            if model not in distinct:
+                distinct[model] = variants(normalize(model)) if model else []
+
+        if np is None or not self._count:
+            found = {key: self._position(key) for keys in distinct.values() for key in keys}
+        else:
+            if self._sorted_hashes is None:
+                dtype = np.dtype([("hash", "<u8"), ("rest", "V", RECORD.size - 8)])
+                self._sorted_hashes = np.ascontiguousarray(
+                    np.frombuffer(self._data, dtype=dtype, count=self._count, offset=HEADER.size)["hash"]
+                )
+            keys = list({key for candidates in distinct.values() for key in candidates})
+            digests = np.fromiter((key_hash(key) for key in keys), dtype=np.uint64, count=len(keys))
+            positions = np.searchsorted(self._sorted_hashes, digests)
+            hits = (positions < self._count) & \
+                (self._sorted_hashes[np.minimum(positions, self._count - 1)] == digests)
+            found = {key: int(position) if hit else None for key, position, hit in zip(keys, positions, hits)}
+
+        results = {}
+        for model, candidates in distinct.items():
+            result = None
+            for i, key in enumerate(candidates):
+                if found.get(key) is not None:
+                    result = self._entry(found[key], key)
+                    if result is not None:
+                        result["match"] = "exact" if i == 0 else "variant"
+                        break
+            if result is None and candidates:
+                result = estimate(candidates[0])
+                if result is not None:
+                    result["match"] = "estimated"
+            results[model] = result
+        return [results[model] for model in models]
+
+    def close(self):
+        self._data.close()
+
+
+def open_database(source=SOURCE, cache_dir=CACHE_DIR):
+    """Abre o índice da base, compilando-o se ainda não existir ou estiver desatualizado"""
+    st = os.stat(source)
+    key = hashlib.sha1(os.path.abspath(source).encode("utf-8")).hexdigest()[:16]
+    index_path = Path(cache_dir) / f"{key}.idx"
+    try:
+        database = CpuDatabase(index_path)
+        if (database.source_mtime_ns, database.source_size) == (st.st_mtime_ns, st.st_size):
+            return database
+        database.close()
+    except (OSError, ValueError):
+        pass
+    return CpuDatabase(compile_index(source, index_path))
+
+
+_default = None
+
+
+def default_database():
+    """Base padrão, aberta uma vez por processo"""
+    global _default
+    if _default is None:
+        _default = open_database()
+    return _default
@@ -0,0 +1,296 @@
+"""
+Benchmark de armazenamento: leitura/escrita sequencial, 4K aleatório e
+percentis de latência em um ponto de montagem.
+
+Usa um arquivo temporário de tamanho limitado. Quando o sistema permite,
+a leitura passa por O_DIRECT (Linux) ou FILE_FLAG_NO_BUFFERING (Windows),
+sem cache de páginas; caso contrário o cache do arquivo é descartado com
+posix_fadvise antes de cada fase de leitura. Se nada disso funcionar
+(`cache_bypass` "none"), as leituras podem vir da RAM e o resultado não
+serve para aprovar o disco.
+"""
+import mmap
+import os
+import random
+import shutil
+import tempfile
+import time
+
+MB = 1024 ** 2
+BLOCK_4K = 4096
+SEQ_BLOCK = 1 * MB
+
+DEFAULT_FILE_MB = 256
+MAX_FILE_MB = 1024
+DEFAULT_RANDOM_OPS = 2000
+DEFAULT_PHASE_BUDGET_S = 5.0
+
+
+def _percentiles(samples_ns):
+    """p50/p95/p99 em milissegundos"""
+    if not samples_ns:
+        return {}
+    ordered = sorted(samples_ns)
+    result = {}
+    for p in (50, 95, 99):
+        idx = min(len(ordered) - 1, int(round((len(ordered) - 1) * p / 100)))
+        result[f"p{p}_ms"] = round(ordered[idx] / 1e6, 3)
+    return result
+
+
+def _drop_cache(fd):
+    """Tenta tirar o arquivo do cache de páginas (Linux)"""
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.fsync(fd)
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            return True
+        except OSError:
+            return False
+    return False
+
+
+if os.name == "nt":
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    _kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    _kernel32.CreateFileW.argtypes = [wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, ctypes.c_void_p,
+                                      wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE]
+    _kernel32.CreateFileW.restype = wintypes.HANDLE
+    _kernel32.ReadFile.argtypes = [wintypes.HANDLE, ctypes.c_void_p, wintypes.DWORD,
+                                   ctypes.POINTER(wintypes.DWORD), ctypes.c_void_p]
+    _kernel32.WriteFile.argtypes = [wintypes.HANDLE, ctypes.c_void_p, wintypes.DWORD,
+                                    ctypes.POINTER(wintypes.DWORD), ctypes.c_void_p]
+
+    GENERIC_READ = 0x80000000
+    GENERIC_WRITE = 0x40000000
+    FILE_SHARE_READ_WRITE = 0x1 | 0x2
+    CREATE_ALWAYS = 2
+    OPEN_EXISTING = 3
+    OPEN_ALWAYS = 4
+    FILE_FLAG_NO_BUFFERING = 0x20000000
+    FILE_FLAG_WRITE_THROUGH = 0x80000000
+    INVALID_HANDLE_VALUE = wintypes.HANDLE(-1).value
+
+    class _OVERLAPPED(ctypes.Structure):
+        _fields_ = [("Internal", ctypes.c_void_p), ("InternalHigh", ctypes.c_void_p),
+                    ("Offset", wintypes.DWORD), ("OffsetHigh", wintypes.DWORD), ("hEvent", wintypes.HANDLE)]
+
+    def _open_direct(path, flags):
+        """Abre com FILE_FLAG_NO_BUFFERING (leitura e escrita sem o cache do Windows)"""
+        mode = flags & (os.O_RDONLY | os.O_WRONLY | os.O_RDWR)
+        access = {os.O_RDONLY: GENERIC_READ, os.O_WRONLY: GENERIC_WRITE}.get(mode, GENERIC_READ | GENERIC_WRITE)
+        if flags & os.O_CREAT:
+            creation = CREATE_ALWAYS if flags & os.O_TRUNC else OPEN_ALWAYS
+        else:
+            creation = OPEN_EXISTING
+        handle = _kernel32.CreateFileW(str(path), access, FILE_SHARE_READ_WRITE, None, creation,
+                                       FILE_FLAG_NO_BUFFERING | FILE_FLAG_WRITE_THROUGH, None)
+        if handle is None or handle == INVALID_HANDLE_VALUE:
+            return os.open(path, flags | os.O_BINARY), False
+        return msvcrt.open_osfhandle(handle, mode), True
+
+    def _transfer(function, fd, buf, offset=None):
+        # Sem buffer do sistema, o endereço e o tamanho precisam ser alinhados ao
+        # setor: a transferência vai direto do/para o mmap, nunca por um bytes novo
+        done = wintypes.DWORD()
+        address = ctypes.c_char.from_buffer(buf)
+        overlapped = None
+        if offset is not None:
+            overlapped = _OVERLAPPED(Offset=offset & 0xFFFFFFFF, OffsetHigh=offset >> 32)
+        try:
+            ok = function(msvcrt.get_osfhandle(fd), ctypes.addressof(address), len(buf), ctypes.byref(done),
+                          ctypes.byref(overlapped) if overlapped is not None else None)
+        finally:
+            del address
+        if not ok:
+            error = ctypes.get_last_error()
+            if error == 38:  # ERROR_HANDLE_EOF
+                return 0
+            raise ctypes.WinError(error)
+        return done.value
+
+    def _read(fd, buf):
+        return _transfer(_kernel32.ReadFile, fd, buf)
+
+    def _write(fd, buf):
+        return _transfer(_kernel32.WriteFile, fd, buf)
+
+    def _pread(fd, buf, offset):
+        return _transfer(_kernel32.ReadFile, fd, buf, offset)
+
+    def _pwrite(fd, buf, offset):
+        return _transfer(_kernel32.WriteFile, fd, buf, offset)
+else:
+    def _open_direct(path, flags):
+        """Abre com O_DIRECT se suportado pelo sistema de arquivos"""
+        direct = getattr(os, "O_DIRECT", 0)
+        if direct:
+            try:
+                return os.open(path, flags | direct), True
+            except OSError:
+                pass
+        return os.open(path, flags), False
+
+    def _write(fd, buf):
+        return os.write(fd, buf)
+
+    # readv/preadv/pwritev leem direto no buffer alinhado
+    if hasattr(os, "preadv"):
+        def _read(fd, buf):
+            return os.readv(fd, [buf])
+
+        def _pread(fd, buf, offset):
+            return os.preadv(fd, [buf], offset)
+
+        def _pwrite(fd, buf, offset):
+            return os.pwritev(fd, [buf], offset)
+    else:
+        def _read(fd, buf):
+            return len(os.read(fd, len(buf)))
+
+        def _pread(fd, buf, offset):
+            os.lseek(fd, offset, os.SEEK_SET)
+            return len(os.read(fd, len(buf)))
+
+        def _pwrite(fd, buf, offset):
+            os.lseek(fd, offset, os.SEEK_SET)
+            return os.write(fd, buf)
+
+
+def _bounded_size_mb(directory, size_mb):
+    """Limita o arquivo de teste a MAX_FILE_MB e a 10% do espaço livre"""
+    free_mb = shutil.disk_usage(directory).free // MB
+    return max(16, min(size_mb, MAX_FILE_MB, free_mb // 10))
+
+
+def _sequential_write(path, size):
+    # mmap anônimo dá um buffer alinhado em página, exigido pelo O_DIRECT
+    buf = mmap.mmap(-1, SEQ_BLOCK)
+    buf.write(os.urandom(SEQ_BLOCK))
+    fd, direct = _open_direct(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+    try:
+        start = time.perf_counter()
+        written = 0
+        while written < size:
+            written += _write(fd, buf)
+        os.fsync(fd)
+        elapsed = time.perf_counter() - start
+    finally:
+        os.close(fd)
+        buf.close()
+    return written / MB / elapsed, direct
+
+
+def _sequential_read(path, size):
+    fd, direct = _open_direct(path, os.O_RDONLY)
+    buf = mmap.mmap(-1, SEQ_BLOCK)
+    try:
+        cache_bypass = "direct" if direct else ("fadvise" if _drop_cache(fd) else "none")
+        start = time.perf_counter()
+        total = 0
+        while total < size:
+            n = _read(fd, buf)
+            if not n:
+                break
+            total += n
+        elapsed = time.perf_counter() - start
+    finally:
+        os.close(fd)
+        buf.close()
+    return total / MB / elapsed, cache_bypass
+
+
+def _mmap_read(path, size):
+    """Leitura via mmap tocando uma vez cada página"""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        _drop_cache(fd)
+        with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            start = time.perf_counter()
+            # O fatiamento com passo força uma falta de página por página
+            view[::mmap.PAGESIZE].tobytes()
+            elapsed = time.perf_counter() - start
+            view.release()
+    finally:
+        os.close(fd)
+    return size / MB / elapsed
+
+
+def _random_io(path, size, ops, budget_s, write):
+    """4K aleatório com QD1; retorna IOPS, MB/s e latências"""
+    flags = os.O_RDWR if write else os.O_RDONLY
+    fd, direct = _open_direct(path, flags)
+    buf = mmap.mmap(-1, BLOCK_4K)
+    if write:
+        buf.write(os.urandom(BLOCK_4K))
+    io = _pwrite if write else _pread
+    blocks = size // BLOCK_4K
+    rng = random.Random(0x4B)
+    latencies = []
+    try:
+        if not direct and not write:
+            _drop_cache(fd)
+        deadline = time.perf_counter() + budget_s
+        start = time.perf_counter()
+        for _ in range(ops):
+            offset = rng.randrange(blocks) * BLOCK_4K
+            t0 = time.perf_counter_ns()
+            io(fd, buf, offset)
+            latencies.append(time.perf_counter_ns() - t0)
+            if time.perf_counter() > deadline:
+                break
+        if write:
+            os.fsync(fd)
+        elapsed = time.perf_counter() - start
+    finally:
+        os.close(fd)
+        buf.close()
+    done = len(latencies)
+    result = {
+        "iops": round(done / elapsed) if elapsed else None,
+        "mb_s": round(done * BLOCK_4K / MB / elapsed, 2) if elapsed else None,
+        "ops": done,
+    }
+    result.update(_percentiles(latencies))
+    return result
+
+
+def benchmark_disk(directory, size_mb=DEFAULT_FILE_MB, random_ops=DEFAULT_RANDOM_OPS,
+                   phase_budget_s=DEFAULT_PHASE_BUDGET_S):
+    """
+    Mede o desempenho do disco que contém `directory`.
+
+    O arquivo temporário é removido ao final, mesmo em caso de erro.
+    """
+    size_mb = _bounded_size_mb(directory, size_mb)
+    size = size_mb * MB
+    fd, path = tempfile.mkstemp(prefix=".bench-disk-", dir=directory)
+    os.close(fd)
+    try:
+        seq_write, direct_write = _sequential_write(path, size)
+        seq_read, cache_bypass = _sequential_read(path, size)
+        mmap_read = _mmap_read(path, size)
+        rand_read = _random_io(path, size, random_ops, phase_budget_s, write=False)
+        rand_write = _random_io(path, size, random_ops, phase_budget_s, write=True)
+    finally:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    return {
+        "path": str(directory),
+        "file_mb": size_mb,
+        "cache_bypass": cache_bypass,
+        "direct_write": direct_write,
+        "seq_write_mb_s": round(seq_write, 2),
+        "seq_read_mb_s": round(seq_read, 2),
+        "mmap_read_mb_s": round(mmap_read, 2),
+        "rand_read_4k": rand_read,
+        "rand_write_4k": rand_write,
+        "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
@@ -0,0 +1,196 @@
+"""
+Analisador de uso de disco: o que está ocupando o espaço de um ponto de
+montagem.
+
+Cada diretório é listado com `os.scandir` em um pool de threads (a E/S de
+metadados libera o GIL), e o tamanho total de cada diretório é somado de
+baixo para cima no fim. A análise não atravessa outros sistemas de arquivos
+nem segue links simbólicos.
+
+O cache guarda, por diretório, o mtime, o tamanho dos arquivos diretos e os
+subdiretórios. Se o mtime não mudou (nenhuma entrada criada, removida ou
+renomeada), o diretório não é listado de novo: basta um stat para confirmar
+e seguir para os subdiretórios. Arquivos que crescem sem mudar o diretório
+só são percebidos depois do TTL do cache.
+"""
+import hashlib
+import heapq
+import json
+import os
+import queue
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent.parent.parent / "cache" / "disk_usage"
+CACHE_VERSION = 1
+CACHE_TTL_S = 7 * 24 * 3600
+
+GB = 1024 ** 3
+MB = 1024 ** 2
+
+DEFAULT_TOP = 20
+DEFAULT_MAX_DEPTH = 3
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+
+# Só caches, temporários e lixeira: nada de dados do usuário nem pacotes
+# instalados, que ocupam espaço mas não podem ser apagados sem perda
+RECLAIMABLE_NAMES = {
+    "$recycle.bin", ".trash", "trash", "temp", "tmp", ".cache", "cache", "caches",
+    "shadercache", "dxcache", "glcache", "__pycache__",
+}
+
+
+class UsageCache:
+    """Cache persistente (JSON) dos diretórios de um ponto de montagem"""
+
+    def __init__(self, root, directory=CACHE_DIR, refresh=False):
+        key = hashlib.sha1(os.path.abspath(root).encode("utf-8")).hexdigest()[:16]
+        self.path = Path(directory) / f"{key}.json"
+        self.entries = {}
+        if refresh:
+            return
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION and time.time() - data.get("stored_at", 0) <= CACHE_TTL_S:
+            self.entries = data.get("entries", {})
+
+    def save(self, entries):
+        """Grava o cache de forma atômica"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".disk_usage-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "stored_at": time.time(), "entries": entries},
+                          f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+
+def _scan_directory(path, device, cache_entries):
+    """
+    Lê um diretório: retorna (registro, erro).
+
+    O registro é [mtime, bytes dos arquivos diretos, nº de arquivos, nomes
+    dos subdiretórios], vindo do cache se o mtime não mudou. Um diretório
+    de outro sistema de arquivos (ponto de montagem) retorna (None, None).
+    """
+    try:
+        st = os.stat(path, follow_symlinks=False)
+    except OSError as e:
+        return None, str(e)
+    if st.st_dev != device:
+        return None, None
+    cached = cache_entries.get(path)
+    if cached is not None and cached[0] == st.st_mtime_ns:
+        return cached, None
+
+    size = 0
+    files = 0
+    subdirs = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    elif entry.is_file(follow_symlinks=False):
+                        size += entry.stat(follow_symlinks=False).st_size
+                        files += 1
+                except OSError:
+                    continue
+    except OSError as e:
+        return None, str(e)
+    return [st.st_mtime_ns, size, files, subdirs], None
+
+
+def analyze(root, workers=DEFAULT_WORKERS, use_cache=True, refresh=False,
+            top=DEFAULT_TOP, max_depth=DEFAULT_MAX_DEPTH, cache_dir=CACHE_DIR):
+    """
+    Soma o tamanho de cada diretório abaixo de `root`.
+
+    Retorna os `top` maiores diretórios até `max_depth` níveis abaixo da
+    raiz, os diretórios recuperáveis (caches, temporários, lixeira...) e
+    estatísticas da varredura.
+    """
+    root = os.path.abspath(root)
+    started = time.monotonic()
+    device = os.stat(root).st_dev
+    cache = UsageCache(root, cache_dir, refresh=refresh) if use_cache else None
+    cache_entries = cache.entries if cache else {}
+
+    records = {}
+    errors = 0
+    hits = 0
+    # As threads devolvem os diretórios lidos por uma fila; esta thread
+    # registra o resultado e agenda os subdiretórios
+    results = queue.Queue()
+
+    def task(path):
+        results.put((path,) + _scan_directory(path, device, cache_entries))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pool.submit(task, root)
+        outstanding = 1
+        while outstanding:
+            path, record, error = results.get()
+            outstanding -= 1
+            if record is None:
+                errors += error is not None
+                continue
+            if cache_entries.get(path) is record:
+                hits += 1
+            records[path] = record
+            for name in record[3]:
+                pool.submit(task, os.path.join(path, name))
+                outstanding += 1
+
+    # Totais de baixo para cima: caminhos mais longos (mais profundos) primeiro
+    totals = {}
+    for path in sorted(records, key=len, reverse=True):
+        _mtime, size, _files, subdirs = records[path]
+        totals[path] = size + sum(totals.get(os.path.join(path, name), 0) for name in subdirs)
+
+    if cache is not None:
+        cache.save(records)
+
+    root_depth = root.rstrip(os.sep).count(os.sep)
+    shallow = (
+        (total, path) for path, total in totals.items()
+        if path != root and path.count(os.sep) - root_depth <= max_depth
+    )
+    reclaimable = [
+        (total, path) for path, total in totals.items()
+        if os.path.basename(path).lower() in RECLAIMABLE_NAMES and total >= MB
+    ]
+    # Um recuperável dentro de outro já listado é contado só uma vez
+    reclaimable.sort(key=lambda item: len(item[1]))
+    kept = []
+    for total, path in reclaimable:
+        if not any(path.startswith(parent + os.sep) for _t, parent in kept):
+            kept.append((total, path))
+
+    def as_entries(items):
+        return [{"path": path, "size_gb": round(total / GB, 2)} for total, path in items]
+
+    return {
+        "root": root,
+        "total_gb": round(totals.get(root, 0) / GB, 2),
+        "directories": len(records),
+        "files": sum(record[2] for record in records.values()),
+        "cached_directories": hits,
+        "errors": errors,
+        "elapsed_s": round(time.monotonic() - started, 3),
+        "largest": as_entries(heapq.nlargest(top, shallow)),
+        "reclaimable": as_entries(heapq.nlargest(top, kept)),
+        "reclaimable_gb": round(sum(total for total, _path in kept) / GB, 2),
+    }
@@ -0,0 +1,223 @@
+"""
+Agregação de frota: lê milhares de system_specs.json (diretório, .zip ou
+.tar[.gz]) em streaming, normaliza as métricas em arrays NumPy por coluna e
+avalia todas as máquinas contra todos os perfis de forma vetorizada.
+
+Cada arquivo é decodificado, reduzido ao vetor de métricas e descartado;
+só os arrays de floats (e o nome de cada máquina) ficam em memória. Arquivos
+.jsonl e .msgpack (ver spec_io) trazem vários scans e são lidos só pelo
+resumo de cada registro, sem decodificar o scan completo; como são
+históricos acrescentados a cada scan, só o registro mais recente de cada
+máquina do arquivo entra na frota.
+"""
+import io
+import json
+import os
+import tarfile
+import zipfile
+from array import array
+
+import numpy as np
+
+try:
+    from . import cpu_database, requirement_profiles, spec_io
+except ImportError:
+    import cpu_database
+    import requirement_profiles
+    import spec_io
+
+METRICS = requirement_profiles.METRICS
+NAN = float("nan")
+
+# Tamanho máximo (em células) dos temporários máquinas x níveis x métricas
+CHUNK_CELLS = 4_000_000
+
+SPEC_SUFFIXES = (".json", ".jsonl", ".msgpack", ".mpk", ".json.gz", ".jsonl.gz", ".msgpack.gz", ".mpk.gz")
+
+
+def iter_spec_files(source):
+    """Gera (nome, bytes) para cada arquivo de especificações de um diretório ou arquivo compactado"""
+    if os.path.isdir(source):
+        for root, _dirs, files in os.walk(source):
+            for filename in files:
+                if filename.endswith(SPEC_SUFFIXES):
+                    path = os.path.join(root, filename)
+                    with open(path, "rb") as f:
+                        yield os.path.relpath(path, source), f.read()
+    elif zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                if info.filename.endswith(SPEC_SUFFIXES) and not info.is_dir():
+                    yield info.filename, archive.read(info)
+    elif tarfile.is_tarfile(source):
+        # Modo "r|*" lê o tar em sequência, sem carregar o índice inteiro
+        with tarfile.open(source, "r|*") as archive:
+            for member in archive:
+                if member.isfile() and member.name.endswith(SPEC_SUFFIXES):
+                    yield member.name, archive.extractfile(member).read()
+    else:
+        raise ValueError(f"Fonte de especificações não reconhecida: {source}")
+
+
+class FleetTable:
+    """Métricas da frota em colunas; uma linha por máquina"""
+
+    def __init__(self):
+        self.names = []
+        self.files = []
+        self.cpu_models = []
+        self._columns = [array("d") for _ in METRICS]
+        self.errors = []
+        # Registros de históricos substituídos por um mais recente da mesma máquina
+        self.superseded = 0
+
+    def add(self, name, specs):
+        self.names.append(specs.get("hostname") or name)
+        self.files.append(name)
+        self.cpu_models.append((specs.get("cpu") or {}).get("model"))
+        for column, value in zip(self._columns, requirement_profiles.extract_metrics(specs)):
+            column.append(NAN if value is None else float(value))
+
+    def add_summary(self, name, summary):
+        """Acrescenta uma máquina a partir do resumo de um registro (spec_io.summarize)"""
+        self.names.append(summary.get("hostname") or name)
+        self.files.append(name)
+        self.cpu_models.append(summary.get("cpu_model"))
+        metrics = summary.get("metrics") or {}
+        for column, metric in zip(self._columns, METRICS):
+            value = metrics.get(metric)
+            column.append(NAN if value is None else float(value))
+
+    def __len__(self):
+        return len(self.names)
+
+    def matrix(self):
+        """Matriz (máquinas x métricas) sem cópia extra das colunas"""
+        if not self.names:
+            return np.empty((0, len(METRICS)))
+        return np.column_stack([np.frombuffer(column, dtype=np.float64) for column in self._columns])
+
+
+def load_fleet(source):
+    """Lê todas as especificações da fonte, descartando cada dicionário após extrair as métricas"""
+    table = FleetTable()
+    for name, raw in iter_spec_files(source):
+        fmt, compressed = spec_io.format_for_path(name)
+        try:
+            if fmt == "json" and not compressed:
+                specs = json.loads(raw)
+                if not spec_io.is_specs(specs):
+                    raise ValueError("não é um arquivo de especificações do scanner")
+                table.add(name, specs)
+                continue
+            latest = {}
+            for summary in spec_io.iter_records(io.BytesIO(raw), fmt, compressed, summary_only=True):
+                if not spec_io.is_summary(summary):
+                    raise ValueError("registro que não é de um scan do scanner")
+                host = summary.get("hostname") or name
+                previous = latest.get(host)
+                if previous is not None:
+                    table.superseded += 1
+                    # Registros são acrescentados em ordem; a data só desempata gravações fora de ordem
+                    if (summary.get("scan_date") or "") < (previous.get("scan_date") or ""):
+                        continue
+                latest[host] = summary
+            for summary in latest.values():
+                table.add_summary(name, summary)
+        except (ValueError, OSError, RuntimeError) as e:
+            table.errors.append({"file": name, "error": str(e)})
+    return table
+
+
+def _compile_thresholds(compiled):
+    """Limites dos perfis como matriz (níveis x métricas), NaN onde não há exigência"""
+    thresholds = np.array(
+        [[NAN if t is None else t for t in row] for row in compiled.threshold_matrix()],
+        dtype=np.float64,
+    ).reshape(-1, len(METRICS))
+    row_profile = np.asarray(compiled.row_profile, dtype=np.intp)
+    row_tier = np.asarray(compiled.row_tier, dtype=np.intp)
+    # Linhas de cada perfil em ordem de nível, e a linha do primeiro nível
+    profile_rows = []
+    for p in range(len(compiled.profile_names)):
+        rows = np.flatnonzero(row_profile == p)
+        profile_rows.append(rows[np.argsort(row_tier[rows])])
+    return thresholds, profile_rows
+
+
+def evaluate_fleet(table, compiled, chunk_cells=CHUNK_CELLS):
+    """
+    Avalia todas as máquinas contra todos os níveis de todos os perfis.
+
+    Retorna (tiers, deficit): `tiers[m, p]` é o índice do maior nível do
+    perfil p atingido pela máquina m (-1 se nenhum); `deficit[m, p]` é a
+    soma das faltas relativas no primeiro nível do perfil (0 se atende).
+    As máquinas são processadas em blocos para limitar os temporários.
+    """
+    values = table.matrix()
+    machines = values.shape[0]
+    profiles = len(compiled.profile_names)
+    thresholds, profile_rows = _compile_thresholds(compiled)
+    required = ~np.isnan(thresholds)
+    first_rows = np.array([rows[0] for rows in profile_rows], dtype=np.intp)
+    base = thresholds[first_rows]
+    base_required = required[first_rows]
+    scale = np.where(base > 0, base, 1.0)
+
+    tiers = np.full((machines, profiles), -1, dtype=np.intp)
+    deficit = np.zeros((machines, profiles), dtype=np.float64)
+    block = max(1, chunk_cells // max(1, thresholds.size))
+
+    for start in range(0, machines, block):
+        chunk = values[start:start + block]
+        # (máquinas x níveis x métricas): métrica não exigida conta como
+        # atendida; valor desconhecido (NaN) falha a comparação
+        with np.errstate(invalid="ignore"):
+            ok = (chunk[:, None, :] >= thresholds[None, :, :]) | ~required[None, :, :]
+        row_ok = ok.all(axis=2)
+        for p, rows in enumerate(profile_rows):
+            # Níveis cumulativos: conta quantos níveis seguidos passam desde o primeiro
+            tiers[start:start + block, p] = np.cumprod(row_ok[:, rows], axis=1).sum(axis=1) - 1
+
+        with np.errstate(invalid="ignore"):
+            shortfall = (base[None, :, :] - chunk[:, None, :]) / scale[None, :, :]
+        # Métrica exigida e desconhecida conta como falta total
+        unknown = np.isnan(chunk)[:, None, :] & base_required[None, :, :]
+        shortfall = np.where(unknown, 1.0, np.nan_to_num(shortfall, nan=0.0))
+        deficit[start:start + block] = np.clip(shortfall, 0, None).sum(axis=2)
+
+    return tiers, deficit
+
+
+def cpu_tiers(table, database=None):
+    """Quantas máquinas há em cada nível da base de CPUs, classificadas em um único lote"""
+    database = database or cpu_database.default_database()
+    counts = {name: 0 for _tier, name in sorted(database.tiers.items())}
+    counts["fora da base"] = 0
+    for result in database.classify_many(table.cpu_models):
+        if result is None or result["match"] == "estimated":
+            counts["fora da base"] += 1
+        else:
+            counts[result["tier_name"]] += 1
+    return counts
+
+
+def summarize(table, compiled, worst=10):
+    """Matriz de contagem por perfil/nível, as máquinas mais distantes de cada perfil e os níveis de CPU"""
+    tiers, deficit = evaluate_fleet(table, compiled)
+    summary = {"machines": len(table), "errors": table.errors, "superseded_records": table.superseded,
+               "cpu_tiers": cpu_tiers(table), "profiles": {}}
+    for p, profile_name in enumerate(compiled.profile_names):
+        counts = np.bincount(tiers[:, p] + 1, minlength=len(compiled.tier_names[p]) + 1)
+        order = np.argsort(-deficit[:, p], kind="stable")[:worst]
+        summary["profiles"][profile_name] = {
+            "tiers": {
+                "nenhum": int(counts[0]),
+                **{name: int(counts[t + 1]) for t, name in enumerate(compiled.tier_names[p])},
+            },
+            "worst": [
+                {"machine": table.names[m], "file": table.files[m], "deficit": round(float(deficit[m, p]), 3)}
+                for m in order if deficit[m, p] > 0
+            ],
+        }
+    return summary
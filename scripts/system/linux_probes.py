@@ -0,0 +1,371 @@
+"""
+Probes nativas para Linux, lidas direto de /proc e /sys.
+
+Nenhuma probe cria subprocessos: cada arquivo é lido uma vez, inteiro, e
+interpretado em Python. Todas aceitam `proc_root`/`sys_root` para rodar
+contra uma árvore de fixture em vez do sistema real. O formato de retorno é
+o mesmo das probes de system_specs_scanner.
+"""
+import glob
+import os
+import re
+
+try:
+    from . import pci_ids
+except ImportError:
+    import pci_ids
+
+GB = 1024 ** 3
+KB = 1024
+
+# Nome comercial dos principais fabricantes de GPU por ID PCI
+GPU_VENDORS = {
+    "0x10de": "NVIDIA",
+    "0x1002": "AMD",
+    "0x8086": "Intel",
+}
+
+# Atributos do dispositivo PCI com o total de VRAM, por driver (amdgpu, xe);
+# o driver proprietário da NVIDIA não expõe a VRAM no sysfs
+VRAM_ATTRIBUTES = ("mem_info_vram_total", os.path.join("tile0", "physical_vram_size_bytes"))
+
+
+def _read(path):
+    """Lê um arquivo pequeno inteiro; None se não existir ou não puder ser lido"""
+    try:
+        with open(path, "rb") as f:
+            return f.read().decode("utf-8", "replace")
+    except OSError:
+        return None
+
+
+def _read_int(path):
+    value = _read(path)
+    try:
+        return int(value.strip()) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _parse_meminfo(proc_root):
+    """Campos de /proc/meminfo em bytes"""
+    fields = {}
+    for line in (_read(os.path.join(proc_root, "meminfo")) or "").splitlines():
+        name, _, rest = line.partition(":")
+        parts = rest.split()
+        if parts:
+            fields[name] = int(parts[0]) * (KB if len(parts) > 1 else 1)
+    return fields
+
+
+def _cpu_frequencies(sys_root, name):
+    """Valores (MHz) de um atributo cpufreq em todas as CPUs"""
+    values = []
+    for path in glob.glob(os.path.join(sys_root, "devices", "system", "cpu", "cpu[0-9]*", "cpufreq", name)):
+        khz = _read_int(path)
+        if khz:
+            values.append(khz / 1000)
+    return values
+
+
+def get_cpu_info(proc_root="/proc", sys_root="/sys"):
+    """Obtém informações do processador via /proc/cpuinfo e cpufreq"""
+    model = ""
+    logical = 0
+    physical = set()
+    mhz = []
+    record = {}
+
+    def flush():
+        if "physical id" in record and "core id" in record:
+            physical.add((record["physical id"], record["core id"]))
+
+    for line in (_read(os.path.join(proc_root, "cpuinfo")) or "").splitlines():
+        if not line.strip():
+            flush()
+            record = {}
+            continue
+        key, _, value = line.partition(":")
+        key = key.strip()
+        value = value.strip()
+        record[key] = value
+        if key == "processor":
+            logical += 1
+        elif key in ("model name", "Model", "Hardware") and not model:
+            model = value
+        elif key == "cpu MHz":
+            try:
+                mhz.append(float(value))
+            except ValueError:
+                pass
+    flush()
+
+    current = _cpu_frequencies(sys_root, "scaling_cur_freq") or mhz
+    maximum = _cpu_frequencies(sys_root, "cpuinfo_max_freq")
+
+    cpu_info = {
+        "model": model,
+        "cores_physical": len(physical) or None,
+        "cores_logical": logical or None,
+        "frequency_mhz": round(sum(current) / len(current), 2) if current else None,
+        "architecture": os.uname().machine,
+    }
+    if maximum:
+        cpu_info["max_frequency_mhz"] = int(max(maximum))
+    return cpu_info
+
+
+def refresh_cpu_frequency(cpu_info, proc_root="/proc", sys_root="/sys"):
+    """Atualiza a frequência atual de uma entrada de CPU vinda do cache"""
+    current = _cpu_frequencies(sys_root, "scaling_cur_freq")
+    if not current:
+        current = []
+        for line in (_read(os.path.join(proc_root, "cpuinfo")) or "").splitlines():
+            if line.startswith("cpu MHz"):
+                current.append(float(line.partition(":")[2]))
+    return dict(cpu_info, frequency_mhz=round(sum(current) / len(current), 2) if current else None)
+
+
+def get_ram_info(proc_root="/proc"):
+    """Obtém informações de memória RAM via /proc/meminfo (mesma conta do psutil)"""
+    mem = _parse_meminfo(proc_root)
+    total = mem.get("MemTotal", 0)
+    free = mem.get("MemFree", 0)
+    # Kernels sem MemAvailable (< 3.14): livre + cache recuperável
+    available = mem.get("MemAvailable", free + mem.get("Cached", 0) + mem.get("SReclaimable", 0) + mem.get("Buffers", 0))
+    used = total - available
+    return {
+        "total_gb": round(total / GB, 2),
+        "available_gb": round(available / GB, 2),
+        "used_gb": round(used / GB, 2),
+        "percent": round((total - available) / total * 100, 1) if total else None
+    }
+
+
+def _read_size(path):
+    """Tamanho em bytes de um atributo do sysfs (decimal ou hexadecimal)"""
+    value = _read(path)
+    try:
+        return int(value.strip(), 0) if value is not None else None
+    except ValueError:
+        return None
+
+
+def get_gpu_info(sys_root="/sys", database=None):
+    """
+    Obtém a GPU pelos dispositivos de vídeo em /sys/bus/pci/devices.
+
+    O nome vem do banco pci.ids (índice compilado, ver pci_ids) e a VRAM do
+    atributo que o driver expõe (amdgpu, xe). Com mais de uma placa, prefere
+    a de maior VRAM e, em empate, uma que não seja Intel (integrada).
+    """
+    gpu_info = {
+        "model": "Não detectado",
+        "vram_gb": None,
+        "driver_version": None
+    }
+
+    candidates = []
+    for device_dir in sorted(glob.glob(os.path.join(sys_root, "bus", "pci", "devices", "*"))):
+        # Classe 0x03xxxx: controladora de vídeo (VGA, 3D, outras)
+        if not (_read(os.path.join(device_dir, "class")) or "").strip().startswith("0x03"):
+            continue
+        vendor = (_read(os.path.join(device_dir, "vendor")) or "").strip()
+        device = (_read(os.path.join(device_dir, "device")) or "").strip()
+        if not vendor:
+            continue
+        driver = None
+        for line in (_read(os.path.join(device_dir, "uevent")) or "").splitlines():
+            if line.startswith("DRIVER="):
+                driver = line.split("=", 1)[1]
+        vram = None
+        for name in VRAM_ATTRIBUTES:
+            vram = _read_size(os.path.join(device_dir, name))
+            if vram:
+                break
+        candidates.append({
+            "vendor": vendor,
+            "device": device,
+            "driver": driver,
+            "vram": vram,
+        })
+
+    if not candidates:
+        return gpu_info
+
+    best = max(candidates, key=lambda c: (c["vram"] or 0, c["vendor"] != "0x8086"))
+    if database is None:
+        database = pci_ids.default_database()
+    vendor_name = GPU_VENDORS.get(best["vendor"]) or (database and database.vendor(best["vendor"])) or best["vendor"]
+    device_name = database.device(best["vendor"], best["device"]) if database and best["device"] else None
+    if device_name:
+        gpu_info["model"] = f"{vendor_name} {pci_ids.marketing_name(device_name)}"
+    else:
+        gpu_info["model"] = f"{vendor_name} [{best['vendor'][2:]}:{best['device'][2:]}]"
+    gpu_info["vendor_id"] = best["vendor"]
+    gpu_info["device_id"] = best["device"]
+    if best["vram"]:
+        gpu_info["vram_gb"] = round(best["vram"] / GB, 2)
+    if best["driver"]:
+        version = _read(os.path.join(sys_root, "module", best["driver"], "version"))
+        gpu_info["driver_version"] = f"{best['driver']} {version.strip()}" if version else best["driver"]
+    return gpu_info
+
+
+def _physical_fstypes(proc_root):
+    """Sistemas de arquivos de dispositivos reais (mesmo critério do psutil)"""
+    fstypes = {"zfs"}
+    for line in (_read(os.path.join(proc_root, "filesystems")) or "").splitlines():
+        parts = line.split()
+        if len(parts) == 1:
+            fstypes.add(parts[0])
+    return fstypes
+
+
+def _unescape_mount(path):
+    """Caminhos em /proc/mounts trazem espaços e afins como \\040"""
+    if "\\" not in path:
+        return path
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), path)
+
+
+def disk_index(sys_root="/sys"):
+    """
+    Mapeia cada dispositivo de bloco (disco, partição ou device-mapper) para
+    True (SSD), False (rotacional) ou None (desconhecido), lendo o sysfs uma vez
+    """
+    block_dir = os.path.join(sys_root, "class", "block")
+    try:
+        names = os.listdir(block_dir)
+    except OSError:
+        return {}
+
+    def rotational(disk):
+        value = _read(os.path.join(sys_root, "block", disk, "queue", "rotational"))
+        return None if value is None else value.strip() == "1"
+
+    index = {}
+    for name in names:
+        path = os.path.realpath(os.path.join(block_dir, name))
+        disk = os.path.basename(os.path.dirname(path)) if os.path.exists(os.path.join(path, "partition")) else name
+
+        # device-mapper/LVM/RAID: é SSD só se todos os discos de baixo forem
+        try:
+            slaves = os.listdir(os.path.join(sys_root, "block", disk, "slaves"))
+        except OSError:
+            slaves = []
+        flags = [rotational(slave) for slave in slaves] or [rotational(disk)]
+        index[name] = None if None in flags else not any(flags)
+    return index
+
+
+def get_disk_info(proc_root="/proc", sys_root="/sys", index=None, statvfs=os.statvfs):
+    """
+    Obtém discos montados via /proc/mounts + statvfs, com tipo de mídia do sysfs.
+
+    `statvfs` recebe o ponto de montagem; com um /proc de fixture, passe uma
+    função equivalente que não consulte os sistemas de arquivos reais.
+    """
+    if index is None:
+        index = disk_index(sys_root)
+    fstypes = _physical_fstypes(proc_root)
+
+    disks = []
+    seen = set()
+    for line in (_read(os.path.join(proc_root, "self", "mounts"))
+                 or _read(os.path.join(proc_root, "mounts")) or "").splitlines():
+        parts = line.split()
+        if len(parts) < 3:
+            continue
+        device, mountpoint, fstype = parts[0], _unescape_mount(parts[1]), parts[2]
+        if fstype not in fstypes or device == "none" or mountpoint in seen:
+            continue
+        seen.add(mountpoint)
+        try:
+            st = statvfs(mountpoint)
+        except OSError:
+            continue
+        total = st.f_blocks * st.f_frsize
+        free = st.f_bavail * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        name = os.path.basename(os.path.realpath(device)) if device.startswith("/") else device
+        disks.append({
+            "device": device,
+            "mountpoint": mountpoint,
+            "fstype": fstype,
+            "total_gb": round(total / GB, 2),
+            "used_gb": round(used / GB, 2),
+            "free_gb": round(free / GB, 2),
+            "percent": round(used / (used + free) * 100, 1) if used + free else 0.0,
+            "is_ssd": index.get(name)
+        })
+    return disks
+
+
+def get_pagefile_info(proc_root="/proc"):
+    """Swap (/proc/swaps) faz o papel do pagefile do Windows"""
+    pagefile_info = {
+        "exists": False,
+        "size_gb": None,
+        "location": None
+    }
+    total_kb = 0
+    locations = []
+    for line in (_read(os.path.join(proc_root, "swaps")) or "").splitlines()[1:]:
+        parts = line.split()
+        if len(parts) >= 3:
+            locations.append(_unescape_mount(parts[0]))
+            total_kb += int(parts[2])
+    if locations:
+        pagefile_info["exists"] = True
+        pagefile_info["size_gb"] = round(total_kb * KB / GB, 2)
+        pagefile_info["location"] = ", ".join(locations)
+    return pagefile_info
+
+
+def _wine_prefixes(home):
+    """Prefixos Wine/Proton conhecidos (WINEPREFIX, ~/.wine e os do Steam)"""
+    prefixes = []
+    if os.environ.get("WINEPREFIX"):
+        prefixes.append(os.environ["WINEPREFIX"])
+    prefixes.append(os.path.join(home, ".wine"))
+    prefixes.extend(glob.glob(os.path.join(home, ".steam", "steam", "steamapps", "compatdata", "*", "pfx")))
+    prefixes.extend(glob.glob(os.path.join(home, ".local", "share", "Steam", "steamapps", "compatdata", "*", "pfx")))
+    return [p for p in dict.fromkeys(prefixes) if os.path.isdir(os.path.join(p, "drive_c"))]
+
+
+def check_vc_runtime(home=None):
+    """Visual C++ 2015+ dentro de prefixos Wine/Proton (vcruntime140.dll)"""
+    home = home or os.path.expanduser("~")
+    versions = []
+    for prefix in _wine_prefixes(home):
+        system32 = os.path.join(prefix, "drive_c", "windows", "system32")
+        if os.path.exists(os.path.join(system32, "vcruntime140.dll")) and \
+                os.path.exists(os.path.join(system32, "msvcp140.dll")):
+            versions.append(f"Visual C++ 2015+ ({prefix})")
+    return {
+        "installed": bool(versions),
+        "versions": versions
+    }
+
+
+def check_dotnet_runtime(home=None):
+    """
+    .NET dentro de prefixos Wine/Proton: .NET Framework (Microsoft.NET) e
+    .NET Core/5+ (Program Files/dotnet). Um .NET nativo do Linux não conta,
+    porque as ferramentas da modlist rodam dentro do prefixo.
+    """
+    home = home or os.path.expanduser("~")
+    versions = []
+    for prefix in _wine_prefixes(home):
+        drive_c = os.path.join(prefix, "drive_c")
+        for path in sorted(glob.glob(os.path.join(drive_c, "windows", "Microsoft.NET", "Framework*", "v*"))):
+            if os.path.isdir(path):
+                versions.append(f".NET Framework {os.path.basename(path)[1:]} ({prefix})")
+        for path in sorted(glob.glob(os.path.join(drive_c, "Program Files*", "dotnet", "shared",
+                                                  "Microsoft.NETCore.App", "*"))):
+            versions.append(f".NET Runtime {os.path.basename(path)} ({prefix})")
+    return {
+        "installed": bool(versions),
+        "versions": list(dict.fromkeys(versions))
+    }
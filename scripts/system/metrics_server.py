@@ -0,0 +1,242 @@
+"""
+Servidor HTTP local de métricas (modo serve).
+
+Expõe o último scan e os contadores ao vivo do monitor em formato texto do
+Prometheus (/metrics) e em JSON (/metrics.json). As respostas já ficam
+prontas em memória: uma thread refaz o scan periodicamente, outra amostra
+os contadores, e cada uma troca o snapshot renderizado por inteiro. Uma
+requisição só copia bytes prontos; nunca dispara uma probe.
+"""
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    from . import requirement_profiles
+except ImportError:
+    import requirement_profiles
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 9109
+DEFAULT_SCAN_INTERVAL = 300.0
+DEFAULT_SAMPLE_INTERVAL = 1.0
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+
+
+def _label(value):
+    """Escapa um valor de label no formato do Prometheus"""
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(**labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_label(value)}"' for key, value in labels.items()) + "}"
+
+
+class _Writer:
+    """Acumula linhas de métricas, com HELP/TYPE uma vez por nome"""
+
+    def __init__(self):
+        self.lines = []
+        self._declared = set()
+
+    def metric(self, name, value, help_text, kind="gauge", **labels):
+        if value is None:
+            return
+        if name not in self._declared:
+            self._declared.add(name)
+            self.lines.append(f"# HELP {name} {help_text}")
+            self.lines.append(f"# TYPE {name} {kind}")
+        self.lines.append(f"{name}{_labels(**labels)} {float(value)!r}")
+
+    def render(self):
+        return ("\n".join(self.lines) + "\n").encode("utf-8")
+
+
+def render_prometheus(specs, live):
+    """Texto do Prometheus a partir do último scan (ou None) e dos contadores ao vivo"""
+    out = _Writer()
+    out.metric("system_specs_scan_ready", 1 if specs else 0, "1 depois que o primeiro scan terminou")
+    if specs:
+        cpu = specs.get("cpu") or {}
+        gpu = specs.get("gpu") or {}
+        out.metric("system_specs_info", 1, "Identificação da máquina",
+                   hostname=specs.get("hostname", ""), os=(specs.get("os") or {}).get("system", ""),
+                   cpu=cpu.get("model", ""), gpu=gpu.get("model", ""))
+        scan = specs.get("_scan") or {}
+        out.metric("system_specs_scan_duration_seconds", scan.get("elapsed_s"), "Duração do último scan")
+        try:
+            scanned_at = datetime.fromisoformat(specs["scan_date"]).timestamp()
+        except (KeyError, TypeError, ValueError):
+            scanned_at = None
+        out.metric("system_specs_scan_timestamp_seconds", scanned_at, "Momento do último scan")
+
+        for name, value in zip(requirement_profiles.METRICS, requirement_profiles.extract_metrics(specs)):
+            out.metric(f"system_specs_{name}", value, f"Métrica de requisito {name}")
+
+        for requirement, data in (specs.get("lore_rim_compatibility") or {}).items():
+            if isinstance(data, dict) and "status" in data:
+                out.metric("system_specs_lorerim_ok", 1 if "OK" in data["status"] else 0,
+                           "1 se o requisito do LoreRim é atendido", requirement=requirement)
+        for profile, result in (specs.get("profiles") or {}).items():
+            out.metric("system_specs_profile_ready", 1 if result.get("tier") else 0,
+                       "1 se o perfil atinge algum nível", profile=profile, tier=result.get("tier") or "")
+
+        # Cada família em um laço próprio: o formato exige as linhas de um nome juntas
+        probes = ((specs.get("_perf") or {}).get("probes") or {}).items()
+        for probe, info in probes:
+            out.metric("system_specs_probe_seconds", info.get("wall_s"), "Tempo de parede da probe no último scan",
+                       probe=probe)
+        for probe, info in probes:
+            out.metric("system_specs_probe_ok", 1 if info.get("status") == "ok" else 0,
+                       "1 se a probe terminou sem erro nem timeout", probe=probe)
+
+    if live:
+        for name, value in live["series"].items():
+            out.metric(f"system_live_{name}", value, f"Última amostra de {name}")
+        names = dict.fromkeys(name for series in live["disks"].values() for name in series)
+        for name in names:
+            for disk, series in live["disks"].items():
+                out.metric(f"system_live_disk_{name}", series.get(name), f"Última amostra de {name} por disco",
+                           disk=disk)
+        out.metric("system_live_samples_total", live["samples"], "Amostras coletadas pelo monitor", kind="counter")
+        out.metric("system_live_alerts_total", live["alerts"], "Alertas disparados pelo monitor", kind="counter")
+    return out.render()
+
+
+class Snapshot:
+    """Respostas prontas; substituído por inteiro, nunca alterado"""
+
+    __slots__ = ("prometheus", "json", "generated_at")
+
+    def __init__(self, prometheus, json_body, generated_at):
+        self.prometheus = prometheus
+        self.json = json_body
+        self.generated_at = generated_at
+
+
+class MetricsService:
+    """
+    Mantém o snapshot atualizado em segundo plano.
+
+    `scan` é a função que faz um scan completo; `monitor` é um
+    ResourceMonitor (ou None para servir só o scan).
+    """
+
+    def __init__(self, scan, monitor=None, scan_interval=DEFAULT_SCAN_INTERVAL,
+                 sample_interval=DEFAULT_SAMPLE_INTERVAL):
+        self.scan = scan
+        self.monitor = monitor
+        self.scan_interval = scan_interval
+        self.sample_interval = sample_interval
+        self.specs = None
+        self._specs_json = b"null"
+        self.snapshot = Snapshot(render_prometheus(None, None), b"{}", time.time())
+        self._render_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+
+    def _live(self):
+        monitor = self.monitor
+        if monitor is None or not monitor.samples:
+            return None
+        return {
+            "series": {name: round(buf.last(), 3) for name, buf in monitor.series.items()},
+            "disks": {
+                disk: {name: round(buf.last(), 3) for name, buf in buffers.items() if buf.count}
+                for disk, buffers in monitor.disk_series.items()
+            },
+            "samples": monitor.samples,
+            "alerts": len(monitor.alerts),
+        }
+
+    def refresh(self):
+        """Renderiza e publica um snapshot novo (uma vez por atualização, não por requisição)"""
+        with self._render_lock:
+            now = time.time()
+            live = self._live()
+            # O scan já está serializado; a cada amostra só os contadores são codificados
+            body = b"".join((
+                b'{"specs":', self._specs_json,
+                b',"live":', json.dumps(live, separators=(",", ":")).encode("utf-8"),
+                b',"generated_at":', repr(now).encode("ascii"), b"}",
+            ))
+            self.snapshot = Snapshot(render_prometheus(self.specs, live), body, now)
+
+    def _scan_loop(self):
+        while not self._stop.is_set():
+            try:
+                specs = self.scan()
+                with self._render_lock:
+                    self.specs = specs
+                    self._specs_json = json.dumps(specs, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+                self.refresh()
+            except Exception as e:
+                print(f"Aviso: scan em segundo plano falhou: {e}")
+            self._stop.wait(self.scan_interval)
+
+    def _sample_loop(self):
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            self.monitor.sample()
+            self.refresh()
+            next_tick += self.sample_interval
+            delay = next_tick - time.monotonic()
+            if delay < 0:
+                next_tick = time.monotonic()
+                delay = 0
+            self._stop.wait(delay)
+
+    def start(self):
+        loops = [self._scan_loop] + ([self._sample_loop] if self.monitor is not None else [])
+        for loop in loops:
+            thread = threading.Thread(target=loop, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # HTTP/1.1 mantém a conexão aberta entre coletas (Content-Length sempre definido);
+    # cabeçalhos e corpo saem em um único envio, sem esperar o ACK atrasado do Nagle
+    protocol_version = "HTTP/1.1"
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        snapshot = self.server.service.snapshot
+        path = self.path.split("?", 1)[0]
+        if path == "/metrics":
+            self._send(200, PROMETHEUS_CONTENT_TYPE, snapshot.prometheus)
+        elif path == "/metrics.json":
+            self._send(200, JSON_CONTENT_TYPE, snapshot.json)
+        elif path == "/":
+            self._send(200, "text/plain; charset=utf-8", b"/metrics (Prometheus)\n/metrics.json (JSON)\n")
+        else:
+            self._send(404, "text/plain; charset=utf-8", b"not found\n")
+
+    def _send(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Centenas de coletas por segundo não devem virar log no console
+        pass
+
+
+def make_server(service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Servidor HTTP ligado ao serviço (porta 0 escolhe uma porta livre)"""
+    server = ThreadingHTTPServer((host, port), _Handler)
+    server.daemon_threads = True
+    server.service = service
+    return server
@@ -0,0 +1,233 @@
+"""
+Nomes de fabricantes e dispositivos PCI a partir do banco pci.ids.
+
+O pci.ids (pacote hwdata/pciutils) tem mais de 1MB de texto. Ele é
+compilado uma vez em um índice binário no cache: duas tabelas de registros
+de tamanho fixo ordenadas pelo ID (fabricantes e fabricante+dispositivo),
+seguidas dos nomes em UTF-8. O índice é aberto com mmap e consultado por
+busca binária, então abrir custa um stat e consultar custa microssegundos,
+sem interpretar o arquivo de texto. O índice é recompilado quando o
+pci.ids muda (mtime ou tamanho diferentes dos gravados no cabeçalho).
+"""
+import gzip
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+from bisect import bisect_left
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent.parent.parent / "cache" / "pci_ids"
+INDEX_VERSION = 1
+
+# Locais usuais do banco nas distribuições
+PCI_IDS_PATHS = (
+    "/usr/share/hwdata/pci.ids",
+    "/usr/share/misc/pci.ids",
+    "/usr/share/pci.ids",
+    "/var/lib/pciutils/pci.ids",
+    "/usr/share/hwdata/pci.ids.gz",
+    "/usr/share/misc/pci.ids.gz",
+)
+
+# magic, versão, nº de fabricantes, nº de dispositivos, mtime e tamanho do pci.ids
+HEADER = struct.Struct("<4sIIIQQ")
+MAGIC = b"PCID"
+# ID do fabricante, posição e tamanho do nome
+VENDOR = struct.Struct("<HII")
+# fabricante << 16 | dispositivo, posição e tamanho do nome
+DEVICE = struct.Struct("<III")
+
+
+def parse_pci_ids(lines):
+    """
+    Lê as linhas do pci.ids: ({fabricante: nome}, {fabricante << 16 | dispositivo: nome}).
+
+    Subsistemas (duas tabulações) e a seção de classes (linhas "C ...") são
+    ignorados.
+    """
+    vendors = {}
+    devices = {}
+    vendor = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("C "):
+            break
+        if line.startswith("\t\t"):
+            continue
+        try:
+            if line.startswith("\t"):
+                if vendor is not None:
+                    device, _, name = line[1:].partition(" ")
+                    devices[vendor << 16 | int(device, 16)] = name.strip()
+            else:
+                vendor_id, _, name = line.partition(" ")
+                vendor = int(vendor_id, 16)
+                vendors[vendor] = name.strip()
+        except ValueError:
+            continue
+    return vendors, devices
+
+
+def _open_source(source):
+    if str(source).endswith(".gz"):
+        return gzip.open(source, "rt", encoding="utf-8", errors="replace")
+    return open(source, encoding="utf-8", errors="replace")
+
+
+def compile_index(source, index_path):
+    """Compila o pci.ids `source` no índice binário `index_path` (gravação atômica)"""
+    st = os.stat(source)
+    with _open_source(source) as f:
+        vendors, devices = parse_pci_ids(f)
+
+    names = bytearray()
+    vendor_table = bytearray()
+    device_table = bytearray()
+    for table, record, entries in ((vendor_table, VENDOR, vendors), (device_table, DEVICE, devices)):
+        for key in sorted(entries):
+            name = entries[key].encode("utf-8")
+            table += record.pack(key, len(names), len(name))
+            names += name
+    header = HEADER.pack(MAGIC, INDEX_VERSION, len(vendors), len(devices), st.st_mtime_ns, st.st_size)
+
+    index_path = Path(index_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=index_path.parent, prefix=".pci_ids-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header)
+            f.write(vendor_table)
+            f.write(device_table)
+            f.write(names)
+        os.replace(tmp, index_path)
+    except OSError:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return index_path
+
+
+class _KeyView:
+    """Sequência das chaves de uma tabela do índice, lida sob demanda pela busca binária"""
+
+    def __init__(self, data, offset, record, count):
+        self._data = data
+        self._offset = offset
+        self._record = record
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, position):
+        return self.entry(position)[0]
+
+    def entry(self, position):
+        return self._record.unpack_from(self._data, self._offset + position * self._record.size)
+
+
+def _to_int(value):
+    """Aceita o ID como inteiro ou como texto hexadecimal (ex: "0x10de")"""
+    return value if isinstance(value, int) else int(str(value).strip(), 16)
+
+
+class PciIds:
+    """Índice compilado aberto com mmap"""
+
+    def __init__(self, index_path):
+        with open(index_path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, vendor_count, device_count, self.source_mtime_ns, self.source_size = \
+                HEADER.unpack_from(self._data, 0)
+            if magic != MAGIC or version != INDEX_VERSION:
+                raise ValueError(f"Índice PCI incompatível: {index_path}")
+            device_offset = HEADER.size + vendor_count * VENDOR.size
+            self._names_offset = device_offset + device_count * DEVICE.size
+            if len(self._data) < self._names_offset:
+                raise ValueError(f"Índice PCI truncado: {index_path}")
+        except (struct.error, ValueError):
+            self._data.close()
+            raise
+        self._vendors = _KeyView(self._data, HEADER.size, VENDOR, vendor_count)
+        self._devices = _KeyView(self._data, device_offset, DEVICE, device_count)
+
+    def _find(self, view, key):
+        position = bisect_left(view, key)
+        if position == len(view) or view[position] != key:
+            return None
+        _key, start, length = view.entry(position)
+        start += self._names_offset
+        return self._data[start:start + length].decode("utf-8")
+
+    def vendor(self, vendor_id):
+        """Nome do fabricante, ou None se não estiver no banco"""
+        return self._find(self._vendors, _to_int(vendor_id))
+
+    def device(self, vendor_id, device_id):
+        """Nome do dispositivo, ou None se não estiver no banco"""
+        return self._find(self._devices, _to_int(vendor_id) << 16 | _to_int(device_id))
+
+    def close(self):
+        self._data.close()
+
+
+def find_source(paths=PCI_IDS_PATHS):
+    """Primeiro pci.ids existente, ou None"""
+    for path in paths:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def open_database(source=None, cache_dir=CACHE_DIR):
+    """
+    Abre o índice do pci.ids `source` (padrão: o do sistema), compilando-o
+    se ainda não existir ou estiver desatualizado. None se não houver banco.
+    """
+    source = source or find_source()
+    if source is None:
+        return None
+    st = os.stat(source)
+    key = hashlib.sha1(os.path.abspath(source).encode("utf-8")).hexdigest()[:16]
+    index_path = Path(cache_dir) / f"{key}.idx"
+    try:
+        database = PciIds(index_path)
+        if (database.source_mtime_ns, database.source_size) == (st.st_mtime_ns, st.st_size):
+            return database
+        database.close()
+    except (OSError, ValueError):
+        pass
+    return PciIds(compile_index(source, index_path))
+
+
+_default = None
+
+
+def default_database():
+    """Banco do sistema, aberto uma vez por processo (None se não houver pci.ids)"""
+    global _default
+    if _default is None:
+        try:
+            _default = open_database() or False
+        except (OSError, ValueError) as e:
+            print(f"Aviso ao abrir o banco pci.ids: {e}")
+            _default = False
+    return _default or None
+
+
+def marketing_name(device_name):
+    """
+    Nome comercial de um dispositivo do pci.ids.
+
+    O banco usa "chip [nome comercial]", ex: "GA102 [GeForce RTX 3080]".
+    """
+    if device_name and device_name.endswith("]") and "[" in device_name:
+        return device_name[device_name.rindex("[") + 1:-1]
+    return device_name
@@ -0,0 +1,184 @@
+"""
+Cache em disco dos resultados das probes do scanner.
+
+Cada entrada guarda o valor, o momento da coleta e as chaves de invalidação
+(boot, versão do SO, versão do driver). Uma entrada só é reaproveitada se
+estiver dentro do TTL da probe e todas as chaves ainda baterem.
+"""
+import json
+import os
+import platform
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent.parent.parent / "cache"
+CACHE_FILE = "probe_cache.json"
+CACHE_VERSION = 1
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+def boot_time_key(proc_root="/proc"):
+    """Momento do último boot (muda a cada reinicialização)"""
+    if platform.system() == "Linux":
+        # Linha "btime" do /proc/stat: segundos desde a época, sem psutil
+        with open(os.path.join(proc_root, "stat"), encoding="ascii") as f:
+            for line in f:
+                if line.startswith("btime "):
+                    return int(line.split()[1])
+        raise OSError("btime não encontrado em /proc/stat")
+    import psutil
+    return int(psutil.boot_time())
+
+
+def os_release_key():
+    """Sistema, release e build do SO"""
+    return f"{platform.system()} {platform.release()} {platform.version()}"
+
+
+def gpu_driver_key():
+    """Versão do driver de vídeo, lida sem consultar o WMI"""
+    if platform.system() == "Windows":
+        try:
+            import winreg
+            key = winreg.OpenKey(
+                winreg.HKEY_LOCAL_MACHINE,
+                r"SYSTEM\CurrentControlSet\Control\Class\{4d36e968-e325-11ce-bfc1-08002be10318}\0000"
+            )
+            version = winreg.QueryValueEx(key, "DriverVersion")[0]
+            winreg.CloseKey(key)
+            return version
+        except OSError:
+            return None
+
+    # Linux: módulos de kernel dos drivers de vídeo expõem a versão no sysfs
+    versions = []
+    for module in ("nvidia", "amdgpu", "i915", "nouveau", "radeon"):
+        try:
+            with open(f"/sys/module/{module}/version", encoding="utf-8") as f:
+                versions.append(f"{module}={f.read().strip()}")
+        except OSError:
+            if os.path.isdir(f"/sys/module/{module}"):
+                versions.append(module)
+    return ",".join(versions) or None
+
+
+class ProbeCache:
+    """Cache de resultados de probes persistido em JSON"""
+
+    def __init__(self, path=None, refresh=False):
+        self.path = Path(path) if path else CACHE_DIR / CACHE_FILE
+        self.refresh = refresh
+        self.hits = set()
+        self._entries = None
+        self._dirty = False
+        self._sealed = False
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self._entries = data.get("entries", {})
+        except (OSError, ValueError):
+            pass
+
+    def get(self, name, ttl, keys):
+        """Retorna o valor em cache ou None se expirado/invalidado"""
+        if self.refresh:
+            return None
+        with self._lock:
+            self._load()
+            entry = self._entries.get(name)
+        if not entry:
+            return None
+        if time.time() - entry.get("stored_at", 0) > ttl:
+            return None
+        if entry.get("keys") != keys:
+            return None
+        self.hits.add(name)
+        return entry["value"]
+
+    def put(self, name, value, keys):
+        """Registra um resultado novo (ignorado depois de seal)"""
+        with self._lock:
+            if self._sealed:
+                return
+            self._load()
+            self._entries[name] = {"stored_at": time.time(), "keys": keys, "value": value}
+            self._dirty = True
+
+    def seal(self):
+        """Encerra as gravações: resultados de probes que ainda terminarem depois do prazo do scan não entram"""
+        with self._lock:
+            self._sealed = True
+
+    def save(self):
+        """Grava o cache de forma atômica, se houve alteração"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix=".probe_cache-")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump({"version": CACHE_VERSION, "entries": self._entries}, f, ensure_ascii=False)
+                os.replace(tmp, self.path)
+            except OSError:
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+            self._dirty = False
+
+
+def cacheable(value, default=None):
+    """Só resultados bem-sucedidos vão para o cache: nem o padrão da probe nem valores marcados com erro"""
+    if value is None or value == default:
+        return False
+    if isinstance(value, dict):
+        if "error" in value or "timed_out" in value:
+            return False
+        # Texto do padrão que continua no resultado é um marcador de falha ("Não detectado", modelo vazio)
+        if isinstance(default, dict) and any(
+            isinstance(text, str) and value.get(field) == text for field, text in default.items()
+        ):
+            return False
+    return True
+
+
+def cached(cache, name, func, ttl, key_funcs, volatile=None, default=None, timeout=None):
+    """
+    Envolve uma probe com o cache.
+
+    key_funcs são as funções que geram as chaves de invalidação; volatile,
+    se informado, recebe o valor em cache e atualiza os campos que mudam
+    a cada execução (ex: frequência atual da CPU). Só valores que passam
+    em `cacheable` são gravados, e nunca os de uma coleta que levou mais
+    que `timeout` segundos (o scan já usou o resultado padrão).
+    """
+    def probe():
+        try:
+            keys = [key() for key in key_funcs]
+        except Exception:
+            # Sem como validar a entrada (ex: psutil ausente): coleta sem usar o cache
+            return func()
+        value = cache.get(name, ttl, keys)
+        if value is None:
+            started = time.monotonic()
+            value = func()
+            late = timeout is not None and time.monotonic() - started >= timeout
+            if not late and cacheable(value, default):
+                cache.put(name, value, keys)
+        elif volatile:
+            value = volatile(value)
+        return value
+    return probe
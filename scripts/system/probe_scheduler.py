@@ -0,0 +1,123 @@
+"""
+Agendador de probes do scanner: executa coletas independentes em paralelo,
+com prazo por probe e prazo total para o scan
+"""
+import copy
+import queue
+import threading
+import time
+
+DEFAULT_PROBE_TIMEOUT = 15.0
+DEFAULT_SCAN_TIMEOUT = 30.0
+DEFAULT_MAX_WORKERS = 8
+
+
+class Probe:
+    """Descreve uma probe: função de coleta, prazo e resultado padrão"""
+
+    def __init__(self, name, func, timeout=None, default=None):
+        self.name = name
+        self.func = func
+        self.timeout = timeout
+        self.default = default
+
+
+def _fallback(probe, status):
+    """Monta o resultado parcial de uma probe que não terminou"""
+    result = copy.deepcopy(probe.default)
+    if isinstance(result, dict):
+        result[status] = True
+    return result
+
+
+def _worker(tasks, results):
+    """Consome probes da fila até receber o sinal de parada"""
+    while True:
+        item = tasks.get()
+        if item is None:
+            return
+        probe, started = item
+        started["at"] = time.monotonic()
+        try:
+            results.put((probe.name, "ok", probe.func()))
+        except Exception as e:
+            results.put((probe.name, "error", str(e)))
+
+
+def run_probes(probes, probe_timeout=DEFAULT_PROBE_TIMEOUT,
+               scan_timeout=DEFAULT_SCAN_TIMEOUT, max_workers=DEFAULT_MAX_WORKERS):
+    """
+    Executa as probes em um pool de threads e retorna (resultados, status).
+
+    Probes que estouram o próprio prazo ou o prazo total do scan recebem o
+    resultado padrão marcado com "timed_out"; as que falham, com "error".
+    As threads são daemon, então uma probe travada não segura o processo.
+    """
+    scan_start = time.monotonic()
+    scan_deadline = scan_start + scan_timeout
+    tasks = queue.Queue()
+    results = queue.Queue()
+    started = {}
+    for probe in probes:
+        started[probe.name] = {}
+        tasks.put((probe, started[probe.name]))
+
+    workers = min(max_workers, len(probes)) or 1
+    for _ in range(workers):
+        tasks.put(None)
+        threading.Thread(target=_worker, args=(tasks, results), daemon=True).start()
+
+    pending = {probe.name: probe for probe in probes}
+    collected = {}
+    status = {}
+
+    while pending:
+        now = time.monotonic()
+
+        # Prazo de cada probe conta a partir do momento em que ela começou a rodar
+        for name, probe in list(pending.items()):
+            began = started[name].get("at")
+            limit = probe.timeout if probe.timeout is not None else probe_timeout
+            if now >= scan_deadline or (began is not None and now - began >= limit):
+                collected[name] = _fallback(probe, "timed_out")
+                status[name] = {
+                    "status": "timeout",
+                    "elapsed_s": round(now - (began if began is not None else now), 3),
+                }
+                del pending[name]
+        if not pending:
+            break
+
+        next_deadline = scan_deadline
+        for name, probe in pending.items():
+            began = started[name].get("at")
+            if began is not None:
+                limit = probe.timeout if probe.timeout is not None else probe_timeout
+                next_deadline = min(next_deadline, began + limit)
+
+        try:
+            name, outcome, value = results.get(timeout=max(0.0, min(next_deadline - now, 0.05)))
+        except queue.Empty:
+            continue
+
+        if name not in pending:
+            # Resultado chegou depois do prazo; o valor parcial já foi registrado
+            continue
+        probe = pending.pop(name)
+        elapsed = round(time.monotonic() - started[name]["at"], 3)
+        if outcome == "ok":
+            collected[name] = value
+            status[name] = {"status": "ok", "elapsed_s": elapsed}
+        else:
+            collected[name] = _fallback(probe, "error")
+            status[name] = {"status": "error", "elapsed_s": elapsed, "error": value}
+
+    # Probes que nunca saíram da fila antes de o scan encerrar
+    for name, info in status.items():
+        if info["status"] == "timeout" and started[name].get("at") is None:
+            info["status"] = "not_started"
+
+    return collected, {
+        "elapsed_s": round(time.monotonic() - scan_start, 3),
+        "probes": status,
+    }
@@ -0,0 +1,103 @@
+"""
+Instrumentação das probes: cada probe roda dentro de um span que mede o
+tempo de parede, o tempo de CPU da thread e os comandos externos pedidos.
+
+O span ativo fica em uma variável por thread; o command_runner soma nele
+os comandos de quem o chamou, então a contagem é atribuída à probe certa
+mesmo com todas rodando em paralelo.
+"""
+import threading
+import time
+
+_local = threading.local()
+
+
+def current_span():
+    """Span da probe que roda nesta thread, ou None"""
+    return getattr(_local, "span", None)
+
+
+class Span:
+    """Medições de uma execução de probe"""
+
+    __slots__ = ("name", "wall_s", "cpu_s", "commands", "commands_executed", "command_wait_s", "finished")
+
+    def __init__(self, name):
+        self.name = name
+        self.wall_s = None
+        self.cpu_s = None
+        self.commands = 0
+        self.commands_executed = 0
+        self.command_wait_s = 0.0
+        self.finished = False
+
+    def add_command(self, executed, wait_s):
+        self.commands += 1
+        self.commands_executed += 1 if executed else 0
+        self.command_wait_s += wait_s
+
+
+class PerfRecorder:
+    """Coleta os spans de todas as probes de um scan"""
+
+    def __init__(self):
+        self.spans = {}
+
+    def wrap(self, name, func):
+        """Envolve a função de uma probe em um span"""
+        span = self.spans[name] = Span(name)
+
+        def probe():
+            _local.span = span
+            wall = time.perf_counter()
+            cpu = time.thread_time()
+            try:
+                return func()
+            finally:
+                span.cpu_s = time.thread_time() - cpu
+                span.wall_s = time.perf_counter() - wall
+                span.finished = True
+                _local.span = None
+        return probe
+
+    def report(self, scan_status, cached=(), runner=None):
+        """Monta a seção _perf a partir dos spans e do status do agendador"""
+        probes = {}
+        for name, span in self.spans.items():
+            status = scan_status["probes"].get(name, {})
+            probes[name] = {
+                "status": status.get("status"),
+                # Probe que estourou o prazo ainda não terminou: vale o tempo até o corte
+                "wall_s": round(span.wall_s, 4) if span.finished else status.get("elapsed_s"),
+                "cpu_s": round(span.cpu_s, 4) if span.finished else None,
+                "commands": span.commands,
+                "commands_executed": span.commands_executed,
+                "command_wait_s": round(span.command_wait_s, 4),
+                "cached": name in cached,
+            }
+        perf = {
+            "elapsed_s": scan_status["elapsed_s"],
+            "timeouts": sorted(name for name, info in probes.items() if info["status"] in ("timeout", "not_started")),
+            "probes": probes,
+        }
+        if runner is not None:
+            perf["commands"] = {"requested": runner.requested, "executed": runner.executed}
+        return perf
+
+
+def format_report(perf):
+    """Linhas de texto com o detalhamento do _perf, da probe mais lenta para a mais rápida"""
+    lines = [f"{'probe':<16}{'status':<12}{'parede':>10}{'CPU':>10}{'comandos':>10}{'espera':>10}"]
+    ordered = sorted(perf["probes"].items(), key=lambda item: -(item[1]["wall_s"] or 0))
+    for name, info in ordered:
+        wall = f"{info['wall_s'] * 1000:.1f}ms" if info["wall_s"] is not None else "-"
+        cpu = f"{info['cpu_s'] * 1000:.1f}ms" if info["cpu_s"] is not None else "-"
+        status = info["status"] + (" (cache)" if info["cached"] else "")
+        commands = f"{info['commands_executed']}/{info['commands']}"
+        wait = f"{info['command_wait_s'] * 1000:.1f}ms"
+        lines.append(f"{name:<16}{status:<12}{wall:>10}{cpu:>10}{commands:>10}{wait:>10}")
+    commands = perf.get("commands")
+    if commands:
+        lines.append(f"Comandos: {commands['executed']} executados de {commands['requested']} pedidos")
+    lines.append(f"Total: {perf['elapsed_s'] * 1000:.1f}ms")
+    return lines
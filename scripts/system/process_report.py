@@ -0,0 +1,122 @@
+"""
+Relatório dos processos que mais consomem RAM, CPU e I/O.
+
+Uma única passada por `psutil.process_iter(attrs=...)` (que lê os atributos
+de cada processo dentro de `oneshot()`) alimenta três heaps de tamanho N,
+então o custo é O(processos · log N) e a memória fica limitada a N entradas
+por métrica, mesmo com milhares de processos.
+
+No modo amostrado a CPU é medida em uma janela: duas passadas com um único
+sleep entre elas, em vez de um `cpu_percent(interval)` por processo.
+"""
+import heapq
+import time
+
+import psutil
+
+MB = 1024 ** 2
+
+DEFAULT_TOP = 10
+DEFAULT_SAMPLE_S = 1.0
+
+# io_counters não existe em todos os sistemas (ex: macOS)
+ATTRS = [attr for attr in ("pid", "name", "create_time", "memory_info", "cpu_times", "io_counters")
+         if hasattr(psutil.Process, attr)]
+
+
+class _TopK:
+    """Os k maiores itens vistos até agora, em um min-heap"""
+
+    def __init__(self, k):
+        self.k = k
+        self._heap = []
+        self._counter = 0
+
+    def push(self, value, item):
+        # Sem consumo (ou sem permissão para ler) não entra no ranking
+        if not value:
+            return
+        # O contador desempata sem comparar os dicionários
+        self._counter += 1
+        entry = (value, self._counter, item)
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif value > self._heap[0][0]:
+            heapq.heapreplace(self._heap, entry)
+
+    def items(self):
+        return [item for _value, _counter, item in sorted(self._heap, reverse=True)]
+
+
+def _cpu_seconds(cpu_times):
+    return cpu_times.user + cpu_times.system if cpu_times else None
+
+
+def _io_bytes(io_counters):
+    return io_counters.read_bytes + io_counters.write_bytes if io_counters else None
+
+
+def _snapshot():
+    """Uma passada por todos os processos; atributos negados viram None"""
+    for proc in psutil.process_iter(attrs=ATTRS, ad_value=None):
+        yield proc.info
+
+
+def top_processes(top=DEFAULT_TOP, sample_s=None):
+    """
+    Os `top` processos por RSS, CPU e I/O.
+
+    Sem `sample_s`, a CPU é o tempo total consumido desde o início do
+    processo (cpu_s); com `sample_s`, é o uso na janela (cpu_percent, 100 =
+    um núcleo) e o I/O também passa a ser o da janela.
+    """
+    by_rss = _TopK(top)
+    by_cpu = _TopK(top)
+    by_io = _TopK(top)
+
+    before = {}
+    if sample_s:
+        for info in _snapshot():
+            before[(info["pid"], info.get("create_time"))] = (
+                _cpu_seconds(info.get("cpu_times")), _io_bytes(info.get("io_counters"))
+            )
+        started = time.monotonic()
+        time.sleep(sample_s)
+        window = time.monotonic() - started
+
+    count = 0
+    for info in _snapshot():
+        count += 1
+        memory = info.get("memory_info")
+        cpu = _cpu_seconds(info.get("cpu_times"))
+        io = _io_bytes(info.get("io_counters"))
+        entry = {
+            "pid": info["pid"],
+            "name": info.get("name") or "?",
+            "rss_mb": round(memory.rss / MB, 1) if memory else None,
+        }
+        if sample_s:
+            # Processo que surgiu durante a janela não tem base de comparação
+            previous = before.get((info["pid"], info.get("create_time")))
+            if previous is None:
+                continue
+            cpu = cpu - previous[0] if cpu is not None and previous[0] is not None else None
+            io = io - previous[1] if io is not None and previous[1] is not None else None
+            if cpu is not None:
+                entry["cpu_percent"] = round(cpu / window * 100, 1)
+        elif cpu is not None:
+            entry["cpu_s"] = round(cpu, 1)
+        if io is not None:
+            entry["io_mb"] = round(io / MB, 1)
+
+        by_rss.push(memory.rss if memory else None, entry)
+        by_cpu.push(cpu, entry)
+        by_io.push(io, entry)
+
+    return {
+        "processes": count,
+        "sample_s": sample_s,
+        "top_rss": by_rss.items(),
+        "top_cpu": by_cpu.items(),
+        "top_io": by_io.items(),
+    }
@@ -0,0 +1,299 @@
+"""
+Perfis de requisitos declarativos (modlists, presets de jogos).
+
+Cada perfil é um arquivo JSON em `profiles/` com níveis (tiers) em ordem
+crescente, e cada nível lista mínimos por métrica:
+
+    {"name": "LoreRim", "tiers": [
+        {"name": "Default", "requirements": {"ram_gb": 16, "vram_gb": 10}},
+        {"name": "Ultra", "requirements": {"ram_gb": 16, "vram_gb": 16}}
+    ]}
+
+Os perfis são compilados uma vez em uma tabela de limites (uma linha por
+nível, uma coluna por métrica) e a tabela é reaproveitada enquanto os
+arquivos do diretório não mudam. As métricas de um scan são extraídas uma
+única vez e comparadas com todas as linhas.
+"""
+import json
+from pathlib import Path
+
+try:
+    from . import cpu_database
+except ImportError:
+    import cpu_database
+
+PROFILES_DIR = Path(__file__).parent / "profiles"
+
+# Métricas comparáveis; requisitos booleanos viram limite 1
+METRICS = (
+    "ram_gb",
+    "vram_gb",
+    "ssd_free_gb",
+    "disk_free_gb",
+    "pagefile_gb",
+    "vc_runtime",
+    "dotnet_runtime",
+    "cores_logical",
+    "cpu_single_score",
+    "cpu_multi_score",
+    "ssd_seq_read_mb_s",
+    "cpu_tier",
+)
+METRIC_INDEX = {name: i for i, name in enumerate(METRICS)}
+
+# Nível da CPU de referência do bench-cpu (1000 single e 8000 multi = i7-11700K,
+# nível 3 na base de CPUs): com o benchmark, o nível vem das pontuações medidas
+BENCH_REFERENCE_TIER = 3
+BENCH_REFERENCE_SCORES = (1000, 8000)
+# Paradas do bench-commit que medem o limite real de memória reservável
+COMMIT_LIMIT_REASONS = ("commit_failed", "safety_limit")
+# Desempenho mínimo medido pelo bench-disk para um disco valer como SSD
+# (o mesmo exigido pelo LoreRim para o streaming de assets)
+SSD_MIN_SEQ_READ_MB_S = 300
+SSD_MIN_RAND_READ_IOPS = 2000
+
+# Tabelas compiladas por diretório, com a assinatura (nome, mtime, tamanho) dos arquivos
+_compiled_cache = {}
+
+
+class ProfileError(ValueError):
+    """Perfil com formato inválido"""
+
+
+def disk_benchmark_ok(bench):
+    """
+    Verifica se o resultado do bench-disk atinge o mínimo de um SSD.
+
+    None (inconclusivo) quando as leituras não contornaram o cache de
+    páginas: a vazão medida pode ser a da RAM.
+    """
+    if bench.get("cache_bypass") == "none":
+        return None
+    seq_read = bench.get("seq_read_mb_s") or 0
+    rand_iops = (bench.get("rand_read_4k") or {}).get("iops") or 0
+    return seq_read >= SSD_MIN_SEQ_READ_MB_S and rand_iops >= SSD_MIN_RAND_READ_IOPS
+
+
+def _complete(section):
+    """A seção veio de uma probe que terminou (sem timeout nem erro)"""
+    return bool(section) and not section.get("timed_out") and not section.get("error")
+
+
+def extract_metrics(specs):
+    """
+    Reduz um scan às métricas dos perfis, em uma passada.
+
+    Segue os mesmos critérios de check_lore_rim_compatibility: o bench-commit
+    decide o pagefile quando mede o limite real, e o bench-cpu decide o nível
+    da CPU, e um disco que o bench-disk reprovou não conta como SSD. Métricas
+    desconhecidas, ou de probes que não terminaram, ficam como None.
+    """
+    values = [None] * len(METRICS)
+    ram = specs.get("ram") or {}
+    gpu = specs.get("gpu") or {}
+    cpu = specs.get("cpu") or {}
+    pagefile = specs.get("pagefile") or {}
+    cpu_bench = specs.get("cpu_benchmark") or {}
+    disk_bench = specs.get("disk_benchmark") or {}
+
+    if _complete(ram):
+        values[0] = ram.get("total_gb")
+    if _complete(gpu):
+        values[1] = gpu.get("vram_gb")
+    if _complete(pagefile):
+        values[4] = (pagefile.get("size_gb") or 0) if pagefile.get("exists") else 0
+    commit_bench = specs.get("commit_benchmark")
+    if commit_bench:
+        committed = commit_bench.get("committed_gb") or 0
+        if commit_bench.get("stop_reason") in COMMIT_LIMIT_REASONS:
+            values[4] = committed
+        elif commit_bench.get("reached_target"):
+            values[4] = max(values[4] or 0, committed)
+    values[7] = cpu.get("cores_logical")
+    values[8] = cpu_bench.get("single_thread_score")
+    values[9] = cpu_bench.get("multi_core_score")
+
+    disks = specs.get("disks")
+    # A lista de discos não tem como marcar o timeout: o status fica no _scan
+    disks_status = specs.get("_scan", {}).get("probes", {}).get("disks", {}).get("status")
+    if disks is not None and disks_status in (None, "ok"):
+        ssd_free = 0
+        total_free = 0
+        ssd_read = None
+        for disk in disks:
+            free_gb = disk.get("free_gb") or 0
+            total_free += free_gb
+            # Mesmo critério da verificação do LoreRim: SSD ou tipo desconhecido
+            if disk.get("is_ssd") is not False:
+                bench = disk_bench.get(disk.get("mountpoint"))
+                # Leituras que vieram do cache de páginas não medem o disco
+                if bench and bench.get("seq_read_mb_s") is not None and bench.get("cache_bypass") != "none":
+                    ssd_read = max(ssd_read or 0, bench["seq_read_mb_s"])
+                if bench and disk_benchmark_ok(bench) is False:
+                    continue
+                ssd_free = max(ssd_free, free_gb)
+        values[2] = ssd_free
+        values[3] = total_free
+        values[10] = ssd_read
+
+    for i, key in ((5, "vc_runtime"), (6, "dotnet_runtime")):
+        section = specs.get(key)
+        if _complete(section):
+            values[i] = 1 if section.get("installed") else 0
+
+    values[11] = _cpu_tier(cpu.get("model"), cpu_bench)
+    return values
+
+
+def _cpu_tier(model, cpu_bench):
+    """Nível da CPU na base de referência, corrigido pelo bench-cpu quando há um"""
+    tier = None
+    if model:
+        try:
+            cpu_class = cpu_database.default_database().classify(model)
+        except (OSError, ValueError):
+            cpu_class = None
+        # Estimativas só de família/geração não têm nível
+        if cpu_class is not None and cpu_class["match"] != "estimated":
+            tier = cpu_class["tier"]
+    if cpu_bench:
+        single = cpu_bench.get("single_thread_score") or 0
+        multi = cpu_bench.get("multi_core_score") or 0
+        if single >= BENCH_REFERENCE_SCORES[0] and multi >= BENCH_REFERENCE_SCORES[1]:
+            tier = max(tier or BENCH_REFERENCE_TIER, BENCH_REFERENCE_TIER)
+        else:
+            tier = min(tier or BENCH_REFERENCE_TIER - 1, BENCH_REFERENCE_TIER - 1)
+    return tier
+
+
+def _parse_threshold(profile_name, metric, value):
+    if metric not in METRIC_INDEX:
+        raise ProfileError(f"{profile_name}: métrica desconhecida '{metric}'")
+    if isinstance(value, bool):
+        return 1 if value else 0
+    if not isinstance(value, (int, float)):
+        raise ProfileError(f"{profile_name}: valor inválido para '{metric}': {value!r}")
+    return value
+
+
+class CompiledProfiles:
+    """
+    Tabela de limites de todos os perfis.
+
+    `rows[i]` são os pares (índice da métrica, limite) do nível i;
+    `row_profile[i]` e `row_tier[i]` dizem a que perfil/nível a linha pertence.
+    """
+
+    def __init__(self, profiles):
+        self.profile_names = []
+        self.tier_names = []
+        self.rows = []
+        self.row_profile = []
+        self.row_tier = []
+        for profile in profiles:
+            if not isinstance(profile, dict):
+                raise ProfileError(f"perfil inválido: {profile!r}")
+            name = profile.get("name")
+            tiers = profile.get("tiers")
+            if not name or not tiers or not isinstance(tiers, list):
+                raise ProfileError(f"perfil sem 'name' ou 'tiers': {profile!r}")
+            for tier in tiers:
+                if not isinstance(tier, dict) or not isinstance(tier.get("name"), str) or not tier["name"]:
+                    raise ProfileError(f"{name}: nível sem 'name': {tier!r}")
+                if not isinstance(tier.get("requirements", {}), dict):
+                    raise ProfileError(f"{name}: 'requirements' do nível {tier['name']} não é um objeto")
+            p = len(self.profile_names)
+            self.profile_names.append(name)
+            self.tier_names.append([tier["name"] for tier in tiers])
+            for t, tier in enumerate(tiers):
+                row = tuple(
+                    (METRIC_INDEX.get(metric), _parse_threshold(name, metric, value))
+                    for metric, value in tier.get("requirements", {}).items()
+                )
+                self.rows.append(row)
+                self.row_profile.append(p)
+                self.row_tier.append(t)
+
+    def threshold_matrix(self):
+        """Limites como lista de linhas densas (None onde o nível não exige a métrica)"""
+        matrix = []
+        for row in self.rows:
+            dense = [None] * len(METRICS)
+            for i, threshold in row:
+                dense[i] = threshold
+            matrix.append(dense)
+        return matrix
+
+    def evaluate(self, specs):
+        """
+        Avalia todos os perfis contra um scan.
+
+        Retorna {perfil: {"tier": maior nível atingido ou None,
+        "missing": métricas que impedem o próximo nível, "unknown": métricas
+        sem valor no scan}}.
+        """
+        values = extract_metrics(specs)
+        results = {}
+        for profile_name in self.profile_names:
+            results[profile_name] = {"tier": None, "missing": [], "unknown": []}
+
+        blocked = set()
+        for row, p, t in zip(self.rows, self.row_profile, self.row_tier):
+            if p in blocked:
+                continue
+            missing = []
+            unknown = []
+            for i, threshold in row:
+                value = values[i]
+                if value is None:
+                    unknown.append(METRICS[i])
+                elif value < threshold:
+                    missing.append(METRICS[i])
+            entry = results[self.profile_names[p]]
+            if missing or unknown:
+                # Níveis são cumulativos: o primeiro que falha encerra o perfil
+                blocked.add(p)
+                entry["missing"] = missing
+                entry["unknown"] = unknown
+            else:
+                entry["tier"] = self.tier_names[p][t]
+        return results
+
+
+def load_profiles(directory=PROFILES_DIR):
+    """Lê todos os perfis *.json de um diretório, em ordem de nome de arquivo"""
+    profiles = []
+    for path in sorted(Path(directory).glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ProfileError(f"{path.name}: JSON inválido ({e})")
+        # Um arquivo pode trazer um perfil ou uma lista deles
+        profiles.extend(data if isinstance(data, list) else [data])
+    return profiles
+
+
+def _signature(directory):
+    signature = []
+    for path in sorted(Path(directory).glob("*.json")):
+        stat = path.stat()
+        signature.append((path.name, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+def compile_profiles(directory=PROFILES_DIR):
+    """
+    Carrega e compila os perfis de um diretório.
+
+    A tabela fica em memória e só é recompilada quando um arquivo do
+    diretório é criado, removido ou alterado (nome, mtime ou tamanho).
+    """
+    key = str(Path(directory).resolve())
+    signature = _signature(directory)
+    cached = _compiled_cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    compiled = CompiledProfiles(load_profiles(directory))
+    _compiled_cache[key] = (signature, compiled)
+    return compiled
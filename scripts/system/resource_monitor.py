@@ -0,0 +1,281 @@
+"""
+Monitor contínuo de recursos (RAM, swap/pagefile, I/O por disco e frequência
+da CPU) com histórico em buffers circulares de tamanho fixo.
+
+Os buffers são arrays de double pré-alocados, então a memória usada não
+cresce em sessões de várias horas; só as últimas `capacity` amostras ficam
+guardadas.
+
+Cada chamada ao psutil custa dezenas a centenas de microssegundos, então
+só os grupos de contadores usados pelos alertas são lidos a cada intervalo;
+os demais (frequência e uso da CPU, I/O por disco, e RAM/swap sem alerta)
+são lidos no máximo uma vez por `slow_interval`. No Linux, RAM e swap saem
+de uma única leitura de /proc/meminfo, com a mesma conta do psutil.
+"""
+import os
+import time
+from array import array
+
+import psutil
+
+GB = 1024 ** 3
+MB = 1024 ** 2
+
+DEFAULT_INTERVAL = 1.0
+DEFAULT_CAPACITY = 3600
+# Intervalo mínimo dos contadores que nenhum alerta usa
+DEFAULT_SLOW_INTERVAL = 1.0
+PERCENTILES = (50, 95, 99)
+
+# Séries de cada chamada ao psutil (o I/O por disco tem séries próprias)
+SERIES_GROUPS = {
+    "memory": ("ram_used_gb", "ram_available_gb", "ram_percent"),
+    "swap": ("swap_used_gb", "swap_percent"),
+    "cpu": ("cpu_freq_mhz", "cpu_percent"),
+}
+
+MEMINFO_PATH = "/proc/meminfo"
+MEMINFO_FIELDS = (b"MemTotal:", b"MemAvailable:", b"SwapTotal:", b"SwapFree:")
+
+# Dispositivos virtuais que não interessam para o I/O do jogo
+IGNORED_DISK_PREFIXES = ("loop", "ram", "zram")
+
+
+class RingBuffer:
+    """Buffer circular de floats apoiado em array('d')"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._data = array("d", bytes(8 * capacity))
+        self._next = 0
+        self.count = 0
+
+    def append(self, value):
+        self._data[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def last(self):
+        if not self.count:
+            return None
+        return self._data[self._next - 1]
+
+    def values(self):
+        """Amostras em ordem cronológica"""
+        if self.count < self.capacity:
+            return self._data[:self.count]
+        return self._data[self._next:] + self._data[:self._next]
+
+    def percentiles(self, points=PERCENTILES):
+        """Percentis (interpolação linear) e máximo das amostras"""
+        if not self.count:
+            return {}
+        ordered = sorted(self._data[:self.count])
+        result = {}
+        for p in points:
+            pos = (len(ordered) - 1) * p / 100
+            low = int(pos)
+            high = min(low + 1, len(ordered) - 1)
+            value = ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+            result[f"p{p}"] = round(value, 2)
+        result["max"] = round(ordered[-1], 2)
+        return result
+
+
+def default_thresholds(limits):
+    """
+    Alertas derivados dos limites da verificação de compatibilidade.
+
+    Uso de RAM acima do mínimo exigido indica que uma máquina no limite
+    estaria paginando; uso de swap acima do pagefile mínimo indica que a
+    sessão já passou do que o requisito garante.
+    """
+    return [
+        ("ram_used_gb", limits["ram_gb"],
+         f"RAM em uso acima de {limits['ram_gb']}GB (mínimo exigido)"),
+        ("swap_used_gb", limits["pagefile_gb"],
+         f"Swap/pagefile em uso acima de {limits['pagefile_gb']}GB (mínimo exigido)"),
+    ]
+
+
+class ResourceMonitor:
+    """
+    Amostra contadores do psutil em intervalo fixo.
+
+    Os grupos com séries usadas em `thresholds` são lidos a cada amostra;
+    os outros, a cada `slow_every` amostras (uma vez por `slow_interval`).
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, capacity=DEFAULT_CAPACITY, thresholds=None,
+                 slow_interval=DEFAULT_SLOW_INTERVAL):
+        self.interval = interval
+        self.capacity = capacity
+        self.thresholds = thresholds or []
+        self.series = {
+            name: RingBuffer(capacity)
+            for names in SERIES_GROUPS.values() for name in names
+        }
+        watched = {name for name, _limit, _message in self.thresholds}
+        self.fast_groups = [group for group, names in SERIES_GROUPS.items() if watched.intersection(names)]
+        self.slow_groups = [group for group in SERIES_GROUPS if group not in self.fast_groups]
+        self.slow_every = max(1, round(slow_interval / interval)) if interval > 0 else 1
+        self._meminfo = MEMINFO_PATH if os.path.exists(MEMINFO_PATH) else None
+        self.disk_series = {}
+        self.alerts = []
+        self._active_alerts = set()
+        self._last_disk = None
+        self._last_time = None
+        self.samples = 0
+        self.sample_cpu_s = 0.0
+        self.started_at = None
+        self.elapsed_s = 0.0
+        # Primeiras leituras fora da conta: base do uso da CPU e dos deltas de I/O
+        psutil.cpu_percent(interval=None)
+        self._sample_disks()
+
+    def _disk_buffers(self, name):
+        buffers = self.disk_series.get(name)
+        if buffers is None:
+            buffers = {"read_mb_s": RingBuffer(self.capacity), "write_mb_s": RingBuffer(self.capacity)}
+            self.disk_series[name] = buffers
+        return buffers
+
+    def sample(self):
+        """Coleta uma amostra dos contadores devidos nesta rodada"""
+        cpu_start = time.process_time()
+        slow = self.samples % self.slow_every == 0
+        series = self.series
+        groups = self.fast_groups + self.slow_groups if slow else self.fast_groups
+        meminfo = self._read_meminfo() if self._meminfo and ("memory" in groups or "swap" in groups) else None
+        for group in groups:
+            if group == "memory":
+                if meminfo:
+                    total, available = meminfo[0], meminfo[1]
+                    used = total - available
+                    percent = used / total * 100 if total else 0.0
+                else:
+                    mem = psutil.virtual_memory()
+                    used, available, percent = mem.used, mem.available, mem.percent
+                series["ram_used_gb"].append(used / GB)
+                series["ram_available_gb"].append(available / GB)
+                series["ram_percent"].append(percent)
+            elif group == "swap":
+                if meminfo:
+                    total, used = meminfo[2], meminfo[2] - meminfo[3]
+                    percent = used / total * 100 if total else 0.0
+                else:
+                    swap = psutil.swap_memory()
+                    used, percent = swap.used, swap.percent
+                series["swap_used_gb"].append(used / GB)
+                series["swap_percent"].append(percent)
+            else:
+                freq = psutil.cpu_freq()
+                series["cpu_freq_mhz"].append(freq.current if freq else 0.0)
+                series["cpu_percent"].append(psutil.cpu_percent(interval=None))
+        if slow:
+            self._sample_disks()
+
+        self._check_alerts()
+        self.samples += 1
+        self.sample_cpu_s += time.process_time() - cpu_start
+
+    def _read_meminfo(self):
+        """(MemTotal, MemAvailable, SwapTotal, SwapFree) em bytes, ou None se faltar um campo"""
+        values = dict.fromkeys(MEMINFO_FIELDS)
+        try:
+            with open(self._meminfo, "rb") as f:
+                for line in f:
+                    name, _, rest = line.partition(b" ")
+                    if name in values:
+                        values[name] = int(rest.split()[0]) * 1024
+        except (OSError, ValueError, IndexError):
+            return None
+        if None in values.values():
+            # Kernel sem MemAvailable (< 3.14) ou /proc restrito: fica com o psutil
+            self._meminfo = None
+            return None
+        return tuple(values[name] for name in MEMINFO_FIELDS)
+
+    def _sample_disks(self):
+        now = time.monotonic()
+        # nowrap=False evita a contabilidade interna do psutil; deltas negativos
+        # (contador reiniciado) são descartados abaixo
+        disks = psutil.disk_io_counters(perdisk=True, nowrap=False) or {}
+        if self._last_disk is not None:
+            dt = now - self._last_time
+            if dt > 0:
+                for name, counters in disks.items():
+                    if name.startswith(IGNORED_DISK_PREFIXES):
+                        continue
+                    previous = self._last_disk.get(name)
+                    if previous is None:
+                        continue
+                    read = counters.read_bytes - previous.read_bytes
+                    written = counters.write_bytes - previous.write_bytes
+                    if read < 0 or written < 0:
+                        continue
+                    buffers = self._disk_buffers(name)
+                    buffers["read_mb_s"].append(read / MB / dt)
+                    buffers["write_mb_s"].append(written / MB / dt)
+        self._last_disk = disks
+        self._last_time = now
+
+    def _check_alerts(self):
+        """Registra alertas apenas na transição para acima do limite"""
+        for name, limit, message in self.thresholds:
+            value = self.series[name].last()
+            if value is None:
+                continue
+            if value >= limit:
+                if name not in self._active_alerts:
+                    self._active_alerts.add(name)
+                    alert = {"time": time.strftime("%H:%M:%S"), "series": name,
+                             "value": round(value, 2), "limit": limit, "message": message}
+                    self.alerts.append(alert)
+                    print(f"[{alert['time']}] ALERTA: {message} (atual: {alert['value']})")
+            else:
+                self._active_alerts.discard(name)
+
+    def run(self, duration=None, should_stop=None):
+        """
+        Amostra até `duration` segundos (ou indefinidamente).
+
+        Os prazos são absolutos, então o custo de cada amostra não acumula
+        atraso no intervalo.
+        """
+        self.started_at = time.monotonic()
+        next_tick = self.started_at
+        try:
+            while True:
+                self.sample()
+                if should_stop and should_stop():
+                    break
+                next_tick += self.interval
+                now = time.monotonic()
+                if duration is not None and next_tick - self.started_at > duration:
+                    break
+                if next_tick > now:
+                    time.sleep(next_tick - now)
+                else:
+                    # Atrasou mais de um intervalo: recomeça a grade a partir de agora
+                    next_tick = now
+        finally:
+            self.elapsed_s = time.monotonic() - self.started_at
+
+    def summary(self):
+        """Percentis de cada série, alertas e custo da própria amostragem"""
+        overhead = (self.sample_cpu_s / self.elapsed_s * 100) if self.elapsed_s else 0.0
+        return {
+            "interval_s": self.interval,
+            "slow_interval_s": round(self.interval * self.slow_every, 3),
+            "samples": self.samples,
+            "elapsed_s": round(self.elapsed_s, 2),
+            "sampling_cpu_percent": round(overhead, 3),
+            "series": {name: buf.percentiles() for name, buf in self.series.items()},
+            "disks": {
+                disk: {name: buf.percentiles() for name, buf in buffers.items()}
+                for disk, buffers in self.disk_series.items()
+            },
+            "alerts": self.alerts,
+        }
@@ -0,0 +1,259 @@
+"""
+Histórico de scans append-only.
+
+Dois arquivos em `output/history/`:
+- scans.log: um scan por linha, no formato jsonl do spec_io (nunca reescrito)
+- scans.v2.idx: um registro binário de tamanho fixo por scan, com o momento,
+  o host, a posição da linha no log e as métricas dos perfis
+
+O índice é derivado do log: quando as métricas dos perfis mudam, o nome do
+índice muda junto e ele é reconstruído a partir do log na primeira leitura.
+
+Gravar um scan é O(1): uma linha no fim do log e um registro no fim do
+índice. Consultas por período e host leem só o índice (busca binária pelo
+momento); um scan completo é lido com um único seek no log.
+"""
+import hashlib
+import math
+import os
+import struct
+import time
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from pathlib import Path
+
+try:
+    from . import requirement_profiles, spec_io
+except ImportError:
+    import requirement_profiles
+    import spec_io
+
+HISTORY_DIR = Path(__file__).parent.parent.parent / "output" / "history"
+LOG_FILE = "scans.log"
+# Versão no nome: muda junto com as métricas do registro (v2: cpu_tier)
+INDEX_FILE = "scans.v2.idx"
+
+METRICS = requirement_profiles.METRICS
+METRIC_INDEX = requirement_profiles.METRIC_INDEX
+
+# momento, hash do host, posição e tamanho da linha no log, métricas (NaN = desconhecida)
+RECORD = struct.Struct(f"<dQQI{len(METRICS)}d")
+NAN = float("nan")
+
+# Seções e campos que mudam a cada scan e não interessam ao diff
+IGNORED_KEYS = ("scan_date", "_scan", "_perf", "processes", "lore_rim_compatibility", "profiles")
+VOLATILE_PATHS = {"ram.available_gb", "ram.used_gb", "ram.percent", "cpu.frequency_mhz"}
+
+
+def host_key(hostname):
+    """Hash de 64 bits do nome do host, para o índice de tamanho fixo"""
+    digest = hashlib.blake2b((hostname or "").lower().encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def scan_timestamp(specs):
+    """Momento do scan em segundos desde a época"""
+    try:
+        return datetime.fromisoformat(specs["scan_date"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return time.time()
+
+
+class HistoryEntry:
+    """Um registro do índice: o scan sem precisar ler o log"""
+
+    __slots__ = ("position", "timestamp", "host", "offset", "length", "metrics")
+
+    def __init__(self, position, raw):
+        values = RECORD.unpack(raw)
+        self.position = position
+        self.timestamp, self.host, self.offset, self.length = values[:4]
+        self.metrics = {
+            name: None if math.isnan(value) else value
+            for name, value in zip(METRICS, values[4:])
+        }
+
+    @property
+    def date(self):
+        return datetime.fromtimestamp(self.timestamp).isoformat(timespec="seconds")
+
+
+class ScanHistory:
+    """Histórico de scans em disco"""
+
+    def __init__(self, directory=HISTORY_DIR):
+        self.directory = Path(directory)
+        self.log_path = self.directory / LOG_FILE
+        self.index_path = self.directory / INDEX_FILE
+
+    def _ensure_index(self):
+        """Reconstrói o índice a partir do log quando ele ainda não existe"""
+        if not self.index_path.exists() and self.log_path.exists():
+            self.rebuild_index()
+
+    def rebuild_index(self):
+        """Regrava o índice inteiro a partir do log (scans.log não é alterado)"""
+        records = []
+        with open(self.log_path, "rb") as log:
+            offset = 0
+            for line in log:
+                if line.strip() and line.endswith(b"\n"):
+                    records.append(self._index_record(spec_io.decode_line(line), offset, len(line)))
+                offset += len(line)
+        tmp = self.index_path.with_suffix(".tmp")
+        with open(tmp, "wb") as index:
+            index.write(b"".join(records))
+        os.replace(tmp, self.index_path)
+        return len(records)
+
+    @staticmethod
+    def _index_record(specs, offset, length):
+        metrics = [NAN if value is None else float(value)
+                   for value in requirement_profiles.extract_metrics(specs)]
+        return RECORD.pack(scan_timestamp(specs), host_key(specs.get("hostname")),
+                           offset, length, *metrics)
+
+    def _read_index(self):
+        self._ensure_index()
+        try:
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return b""
+        # Um registro incompleto no fim (gravação interrompida) é ignorado
+        return data[:len(data) - len(data) % RECORD.size]
+
+    def __len__(self):
+        self._ensure_index()
+        try:
+            return self.index_path.stat().st_size // RECORD.size
+        except FileNotFoundError:
+            return 0
+
+    def append(self, specs):
+        """Acrescenta um scan ao histórico e retorna sua posição"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._ensure_index()
+        line = spec_io.encode_record(specs, "jsonl")
+        with open(self.log_path, "ab") as log:
+            offset = log.seek(0, 2)
+            log.write(line)
+        # O índice é gravado depois do log: uma linha órfã no log é inofensiva
+        record = self._index_record(specs, offset, len(line))
+        with open(self.index_path, "ab") as index:
+            position = index.seek(0, 2) // RECORD.size
+            index.write(record)
+        return position
+
+    def entries(self, since=None, until=None, host=None):
+        """Registros do índice no período [since, until] (segundos), opcionalmente de um host"""
+        data = self._read_index()
+        count = len(data) // RECORD.size
+        # Os scans são gravados em ordem cronológica: busca binária pelo momento
+        timestamps = _TimestampView(data, count)
+        start = bisect_left(timestamps, since) if since is not None else 0
+        stop = bisect_right(timestamps, until) if until is not None else count
+        wanted = host_key(host) if host is not None else None
+        for position in range(start, stop):
+            entry = HistoryEntry(position, data[position * RECORD.size:(position + 1) * RECORD.size])
+            if wanted is None or entry.host == wanted:
+                yield entry
+
+    def series(self, metrics, days=None, host=None):
+        """Evolução das métricas pedidas nos últimos `days` dias, só pelo índice"""
+        for name in metrics:
+            if name not in METRIC_INDEX:
+                raise ValueError(f"Métrica desconhecida: {name} (opções: {', '.join(METRICS)})")
+        since = time.time() - days * 86400 if days else None
+        return [
+            (entry.date, {name: entry.metrics[name] for name in metrics})
+            for entry in self.entries(since=since, host=host)
+        ]
+
+    def load(self, entry, summary_only=False):
+        """Lê o scan completo (ou só o resumo) de um registro do índice"""
+        with open(self.log_path, "rb") as log:
+            log.seek(entry.offset)
+            return spec_io.decode_line(log.read(entry.length), summary_only)
+
+    def latest(self, host=None, count=2):
+        """Os `count` registros mais recentes (do mais novo para o mais antigo)"""
+        data = self._read_index()
+        wanted = host_key(host) if host is not None else None
+        found = []
+        for position in range(len(data) // RECORD.size - 1, -1, -1):
+            entry = HistoryEntry(position, data[position * RECORD.size:(position + 1) * RECORD.size])
+            if wanted is None or entry.host == wanted:
+                found.append(entry)
+                if len(found) == count:
+                    break
+        return found
+
+    def changes_since_last(self, host=None):
+        """Diferença entre os dois últimos scans do host, ou None se houver menos de dois"""
+        latest = self.latest(host=host, count=2)
+        if len(latest) < 2:
+            return None
+        return diff_specs(self.load(latest[1]), self.load(latest[0]))
+
+
+class _TimestampView:
+    """Sequência dos momentos do índice, lida sob demanda pela busca binária"""
+
+    def __init__(self, data, count):
+        self._data = data
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, position):
+        return struct.unpack_from("<d", self._data, position * RECORD.size)[0]
+
+
+def _flatten(value, path, out):
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(item, f"{path}.{key}" if path else key, out)
+    elif isinstance(value, list) and value and all(isinstance(item, dict) and "mountpoint" in item for item in value):
+        # Discos são identificados pelo ponto de montagem, não pela posição na lista
+        for item in value:
+            _flatten(item, f"{path}[{item['mountpoint']}]", out)
+    else:
+        out[path] = value
+
+
+def _probed_sections(specs):
+    """Seções coletadas por probes no scan (None em registros sem `_scan`)"""
+    probes = (specs.get("_scan") or {}).get("probes")
+    return set(probes) if isinstance(probes, dict) else None
+
+
+def diff_specs(old, new, ignored=IGNORED_KEYS, volatile=VOLATILE_PATHS):
+    """
+    Diferença campo a campo entre dois scans.
+
+    Seções de probes que só um dos scans executou (--only/--skip) não são
+    comparadas: ausência não é remoção. Seções idênticas são descartadas com
+    uma comparação direta, sem serem achatadas. Retorna {caminho: [antes,
+    depois]}; None indica ausente.
+    """
+    old_probes, new_probes = _probed_sections(old), _probed_sections(new)
+    if old_probes is not None and new_probes is not None:
+        ignored = set(ignored) | (old_probes ^ new_probes)
+    changes = {}
+    for section in sorted(set(old) | set(new)):
+        if section in ignored:
+            continue
+        before, after = old.get(section), new.get(section)
+        if before == after:
+            continue
+        flat_before, flat_after = {}, {}
+        _flatten(before, section, flat_before)
+        _flatten(after, section, flat_after)
+        for path in sorted(set(flat_before) | set(flat_after)):
+            if path in volatile:
+                continue
+            if flat_before.get(path) != flat_after.get(path):
+                changes[path] = [flat_before.get(path), flat_after.get(path)]
+    return changes
@@ -0,0 +1,271 @@
+"""
+Benchmark repetível do scanner.
+
+Roda scan_system, cada get_* / check_* (nos dois sistemas) e a verificação
+do LoreRim contra dados fixos: o psutil é substituído por um stub, os
+comandos do Windows vêm de um fixture do ReplayRunner e as probes nativas
+do Linux leem uma árvore /proc, /sys e $HOME falsa montada a partir do
+mesmo fixture (com o statvfs dos volumes também vindo dele). Assim os
+números só mudam quando o código muda, e dá para comparar com uma execução
+anterior (baseline).
+"""
+import contextlib
+import io
+import json
+import os
+import statistics
+import tempfile
+import time
+from collections import namedtuple
+from pathlib import Path
+
+try:
+    from . import command_runner
+except ImportError:
+    import command_runner
+
+DEFAULT_FIXTURE = Path(__file__).parent / "fixtures" / "scanner_fixture.json"
+DEFAULT_REPEAT = 20
+# Variação tolerada em relação ao baseline antes de acusar regressão
+DEFAULT_TOLERANCE = 0.25
+# Amostragem do monitor medida com o psutil real (o custo depende da máquina)
+MONITOR_INTERVAL = 0.1
+MONITOR_DURATION = 2.0
+
+# Probes do registro que o fixture não cobre (os processos são os da máquina que roda)
+UNCOVERED_PROBES = ("processes",)
+# Diretório pessoal da árvore falsa (prefixo Wine em .wine, para os check_*)
+FIXTURE_HOME = "home/user"
+
+_VirtualMemory = namedtuple("svmem", "total available percent used free")
+_DiskUsage = namedtuple("sdiskusage", "total used free percent")
+_Partition = namedtuple("sdiskpart", "device mountpoint fstype opts")
+_CpuFreq = namedtuple("scpufreq", "current min max")
+_StatVfs = namedtuple("statvfs_result", "f_frsize f_blocks f_bfree f_bavail")
+
+
+class StubPsutil:
+    """Substituto do psutil com os valores do fixture"""
+
+    def __init__(self, data):
+        self._data = data
+
+    def cpu_count(self, logical=True):
+        return self._data["cpu_count_logical" if logical else "cpu_count_physical"]
+
+    def cpu_freq(self):
+        return _CpuFreq(*self._data["cpu_freq"])
+
+    def virtual_memory(self):
+        return _VirtualMemory(**self._data["virtual_memory"])
+
+    def disk_partitions(self, all=False):
+        return [_Partition(**partition) for partition in self._data["disk_partitions"]]
+
+    def disk_usage(self, path):
+        return _DiskUsage(**self._data["disk_usage"][path])
+
+    def boot_time(self):
+        return self._data["boot_time"]
+
+
+def stub_statvfs(volumes):
+    """statvfs com os volumes do fixture ({ponto de montagem: campos}); os demais não existem"""
+    def statvfs(mountpoint):
+        if mountpoint not in volumes:
+            raise FileNotFoundError(mountpoint)
+        return _StatVfs(**volumes[mountpoint])
+    return statvfs
+
+
+def load_fixture(path=DEFAULT_FIXTURE):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@contextlib.contextmanager
+def fake_tree(files):
+    """
+    Monta uma árvore de arquivos temporária ({caminho relativo: conteúdo}).
+
+    Um conteúdo {"link": destino} vira um link simbólico, como os de
+    /sys/class/block.
+    """
+    with tempfile.TemporaryDirectory(prefix="scanner-bench-") as root:
+        for relative, content in files.items():
+            path = os.path.join(root, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if isinstance(content, dict):
+                os.symlink(content["link"], path)
+                continue
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+        yield root
+
+
+@contextlib.contextmanager
+def _environ(**values):
+    """Variáveis de ambiente trocadas (None remove) enquanto o bloco roda"""
+    saved = {name: os.environ.get(name) for name in values}
+    try:
+        for name, value in values.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _measure(func, repeat):
+    """Executa func `repeat` vezes e resume os tempos em milissegundos"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return {
+        "min_ms": round(times[0], 4),
+        "median_ms": round(statistics.median(times), 4),
+        "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))], 4),
+    }
+
+
+def probe_functions(scanner, module=None):
+    """
+    Funções das probes do PROBE_REGISTRY medidas pelo benchmark, por probe.
+
+    Com `module`, só as que ele implementa (as probes nativas do Linux).
+    """
+    functions = {}
+    for name, spec in scanner.PROBE_REGISTRY.items():
+        if name in UNCOVERED_PROBES:
+            continue
+        if module is not None and not hasattr(module, spec["func"]):
+            continue
+        functions[name] = spec["func"]
+    return functions
+
+
+def benchmark_scanner(scanner, fixture, repeat=DEFAULT_REPEAT, latency=False):
+    """
+    Mede as probes e o scan completo do módulo `scanner` contra o fixture.
+
+    Com `latency=True` o replay espera o tempo gravado de cada comando, o
+    que mede o ganho do paralelismo e da memoização no scan completo.
+    """
+    replay = fixture["windows"]
+    results = {"repeat": repeat, "latency": latency, "functions": {}}
+
+    def with_runner(func):
+        # Executor novo a cada chamada: a memoização não pode esconder o custo
+        def call():
+            scanner._runner = command_runner.ReplayRunner(fixture=replay, latency=latency)
+            try:
+                return func()
+            finally:
+                scanner._runner = None
+        return call
+
+    saved_psutil = scanner.psutil
+    scanner.psutil = StubPsutil(fixture["psutil"])
+    try:
+        functions = probe_functions(scanner)
+        for name in functions.values():
+            results["functions"][f"windows:{name}"] = _measure(with_runner(getattr(scanner, name)), repeat)
+
+        # Só as probes cobertas pelo stub e pelo fixture entram no scan medido
+        probes = list(functions)
+
+        def scan():
+            with contextlib.redirect_stdout(io.StringIO()):
+                return scanner.scan_system(use_cache=False, probes=probes,
+                                           runner=command_runner.ReplayRunner(fixture=replay, latency=latency))
+        results["scan"] = _measure(scan, repeat)
+
+        # A verificação do LoreRim sobre o scan do fixture (inclui a consulta à base de CPUs)
+        specs = scan()
+
+        def check():
+            with contextlib.redirect_stdout(io.StringIO()):
+                scanner.check_lore_rim_compatibility(specs)
+        results["functions"]["check_lore_rim_compatibility"] = _measure(check, repeat)
+    finally:
+        scanner.psutil = saved_psutil
+
+    linux_probes = scanner._sibling("linux_probes")
+    pci_ids = scanner._sibling("pci_ids")
+    with fake_tree(fixture["linux_files"]) as root:
+        proc_root = os.path.join(root, "proc")
+        sys_root = os.path.join(root, "sys")
+        database = pci_ids.open_database(os.path.join(root, "usr", "share", "hwdata", "pci.ids"),
+                                         cache_dir=os.path.join(root, "cache"))
+        home = os.path.join(root, FIXTURE_HOME)
+        # Caminhos da árvore falsa para cada probe nativa; uma probe nova no
+        # registro sem entrada aqui falha com KeyError em vez de ler o sistema real
+        roots = {
+            "get_cpu_info": {"proc_root": proc_root, "sys_root": sys_root},
+            "get_ram_info": {"proc_root": proc_root},
+            "get_gpu_info": {"sys_root": sys_root, "database": database},
+            "get_disk_info": {"proc_root": proc_root, "sys_root": sys_root,
+                              "statvfs": stub_statvfs(fixture["linux_statvfs"])},
+            "get_pagefile_info": {"proc_root": proc_root},
+            "check_vc_runtime": {"home": home},
+            "check_dotnet_runtime": {"home": home},
+        }
+        with _environ(WINEPREFIX=None):
+            for name in probe_functions(scanner, linux_probes).values():
+                func = getattr(linux_probes, name)
+                kwargs = roots[name]
+                results["functions"][f"linux:{name}"] = _measure(lambda: func(**kwargs), repeat)
+        results["functions"]["linux:pci_ids_lookup"] = _measure(lambda: database.device("0x10de", "0x2206"), repeat)
+        database.close()
+    return results
+
+
+def benchmark_monitor(scanner, interval=MONITOR_INTERVAL, duration=MONITOR_DURATION):
+    """
+    Custo do monitor de recursos com os alertas padrão, em % de um núcleo.
+
+    Usa o psutil real (o stub não tem o custo das leituras), então o número
+    vale para a máquina do benchmark e não entra na comparação com o baseline.
+    """
+    resource_monitor = scanner._sibling("resource_monitor")
+    monitor = resource_monitor.ResourceMonitor(
+        interval=interval,
+        thresholds=resource_monitor.default_thresholds(scanner.LORE_RIM_LIMITS)
+    )
+    with contextlib.redirect_stdout(io.StringIO()):
+        monitor.run(duration=duration)
+    summary = monitor.summary()
+    return {
+        "interval_s": interval,
+        "samples": summary["samples"],
+        "sample_us": round(monitor.sample_cpu_s / monitor.samples * 1e6, 1) if monitor.samples else None,
+        "cpu_percent": summary["sampling_cpu_percent"],
+    }
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compara as medianas com um baseline.
+
+    Retorna [(nome, baseline_ms, atual_ms, variação relativa, regressão?)].
+    """
+    rows = []
+    current = dict(results["functions"], scan_system=results["scan"])
+    previous = dict(baseline.get("functions", {}), scan_system=baseline.get("scan"))
+    for name, stats in current.items():
+        before = previous.get(name)
+        if not before:
+            continue
+        base_ms, now_ms = before["median_ms"], stats["median_ms"]
+        change = (now_ms - base_ms) / base_ms if base_ms else 0.0
+        rows.append((name, base_ms, now_ms, round(change, 3), change > tolerance))
+    return rows
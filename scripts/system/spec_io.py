@@ -0,0 +1,221 @@
+"""
+Formatos de saída das especificações e os leitores correspondentes.
+
+- json: documento único com indentação (o formato original)
+- compact: documento único em JSON compacto
+- jsonl: um registro por linha, acrescentado ao arquivo
+- msgpack: registros binários acrescentados ao arquivo (requer msgpack)
+
+Qualquer formato aceita compressão gzip (extensão .gz). Documentos únicos
+são gravados em streaming em um arquivo temporário e trocados com
+os.replace; registros são acrescentados com uma única escrita em O_APPEND
+(com gzip, cada registro é um membro gzip completo), então um leitor nunca
+vê um registro pela metade.
+
+Cada registro de jsonl/msgpack começa por um resumo (`_summary`: host,
+data e métricas dos perfis). A frota e o histórico leem só o resumo, sem
+decodificar o scan inteiro: no jsonl o resumo é o primeiro campo da linha e
+é decodificado sozinho; no msgpack o scan vai como bytes opacos depois dele.
+"""
+import gzip
+import io
+import json
+import os
+import tempfile
+
+try:
+    from . import requirement_profiles
+except ImportError:
+    import requirement_profiles
+
+# msgpack é opcional e só é importado quando o formato é usado
+msgpack = None
+
+FORMATS = ("json", "compact", "jsonl", "msgpack")
+EXTENSIONS = {"json": ".json", "compact": ".json", "jsonl": ".jsonl", "msgpack": ".msgpack"}
+APPEND_FORMATS = ("jsonl", "msgpack")
+
+SUMMARY_KEY = "_summary"
+# Marca dos resumos de scan, para não confundi-los com outros registros
+SUMMARY_KIND = "system_specs"
+_SUMMARY_PREFIX = b'{"' + SUMMARY_KEY.encode("ascii") + b'":'
+_decoder = json.JSONDecoder()
+
+
+def _require_msgpack():
+    global msgpack
+    if msgpack is None:
+        try:
+            import msgpack as module
+        except ImportError:
+            raise RuntimeError("msgpack não está instalado. Execute: pip install msgpack")
+        msgpack = module
+    return msgpack
+
+
+def format_for_path(path):
+    """(formato, comprimido) deduzidos da extensão do arquivo"""
+    name = str(path).lower()
+    compressed = name.endswith(".gz")
+    if compressed:
+        name = name[:-3]
+    if name.endswith(".jsonl"):
+        return "jsonl", compressed
+    if name.endswith((".msgpack", ".mpk")):
+        return "msgpack", compressed
+    return "json", compressed
+
+
+def filename_for(stem, fmt, compress=False):
+    """Nome de arquivo com a extensão do formato (ex: system_specs.jsonl.gz)"""
+    return stem + EXTENSIONS[fmt] + (".gz" if compress else "")
+
+
+# Chaves que todo scan do scanner tem, mesmo com --only/--skip
+SPEC_KEYS = ("hostname", "scan_date", "lore_rim_compatibility")
+
+
+def is_specs(record):
+    """Confere se um documento tem o formato de um scan (e não de outra saída em JSON)"""
+    return isinstance(record, dict) and all(key in record for key in SPEC_KEYS)
+
+
+def summarize(specs):
+    """Resumo de um scan: o que a frota e o histórico precisam sem ler o resto"""
+    scan = specs.get("_scan") or {}
+    return {
+        "kind": SUMMARY_KIND,
+        "hostname": specs.get("hostname"),
+        "scan_date": specs.get("scan_date"),
+        "cpu_model": (specs.get("cpu") or {}).get("model"),
+        # Probes escolhidas (None = scan completo) e arquivo de um replay
+        "selection": scan.get("selection"),
+        "replay": scan.get("replay"),
+        "metrics": dict(zip(requirement_profiles.METRICS, requirement_profiles.extract_metrics(specs))),
+    }
+
+
+def is_summary(summary):
+    """Confere se um resumo veio de um scan (registros antigos, sem "kind", pelo formato)"""
+    if not isinstance(summary, dict) or not isinstance(summary.get("metrics"), dict):
+        return False
+    return summary.get("kind", SUMMARY_KIND) == SUMMARY_KIND and "scan_date" in summary
+
+
+def encode_record(specs, fmt):
+    """Bytes de um registro jsonl (com a quebra de linha) ou msgpack"""
+    summary = summarize(specs)
+    if fmt == "jsonl":
+        body = {key: value for key, value in specs.items() if key != SUMMARY_KEY}
+        # O resumo vem primeiro para poder ser decodificado sozinho
+        return json.dumps({SUMMARY_KEY: summary, **body}, ensure_ascii=False,
+                          separators=(",", ":")).encode("utf-8") + b"\n"
+    if fmt == "msgpack":
+        _require_msgpack()
+        return msgpack.packb([summary, msgpack.packb(specs, use_bin_type=True)], use_bin_type=True)
+    raise ValueError(f"Formato sem registros: {fmt}")
+
+
+def decode_line(line, summary_only=False):
+    """Decodifica uma linha jsonl: o scan completo ou só o resumo"""
+    if summary_only and line.startswith(_SUMMARY_PREFIX):
+        text = line.decode("utf-8")
+        summary, _end = _decoder.raw_decode(text, len(_SUMMARY_PREFIX))
+        return summary
+    record = json.loads(line)
+    summary = record.pop(SUMMARY_KEY, None)
+    if summary_only:
+        if summary is not None:
+            return summary
+        return summarize(record) if is_specs(record) else None
+    return record
+
+
+def write_specs(specs, path, fmt=None, compress=None):
+    """
+    Grava as especificações no formato pedido (ou deduzido da extensão).
+
+    json/compact substituem o arquivo de forma atômica; jsonl/msgpack
+    acrescentam um registro.
+    """
+    path = str(path)
+    detected, detected_compress = format_for_path(path)
+    fmt = fmt or detected
+    compress = detected_compress if compress is None else compress
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato desconhecido: {fmt} (opções: {', '.join(FORMATS)})")
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    if fmt in APPEND_FORMATS:
+        data = encode_record(specs, fmt)
+        if compress:
+            data = gzip.compress(data, compresslevel=6)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        return path
+
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=".specs-")
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            stream = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6) if compress else raw
+            with io.TextIOWrapper(stream, encoding="utf-8") as text:
+                # iterencode gera o JSON em pedaços; o documento nunca é montado inteiro em memória
+                encoder = json.JSONEncoder(ensure_ascii=False, indent=2 if fmt == "json" else None,
+                                           separators=(",", ": ") if fmt == "json" else (",", ":"))
+                for chunk in encoder.iterencode(specs):
+                    text.write(chunk)
+        # mkstemp cria o arquivo só para o dono; a saída segue a permissão de um arquivo comum
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return path
+
+
+def _open(source, compressed):
+    """Abre um caminho ou envolve um arquivo já aberto, descomprimindo se preciso"""
+    if isinstance(source, (str, os.PathLike)):
+        return gzip.open(source, "rb") if compressed else open(source, "rb")
+    return gzip.GzipFile(fileobj=source, mode="rb") if compressed else source
+
+
+def iter_records(source, fmt, compressed=False, summary_only=False):
+    """
+    Percorre os registros de um arquivo (caminho ou arquivo binário aberto).
+
+    Com `summary_only`, cada item é o resumo do registro (None se o registro
+    não for um scan); o scan completo não é decodificado. Um documento json
+    único conta como um registro.
+    """
+    with _open(source, compressed) as f:
+        if fmt == "jsonl":
+            for line in f:
+                if line.strip():
+                    yield decode_line(line, summary_only)
+        elif fmt == "msgpack":
+            _require_msgpack()
+            for summary, packed in msgpack.Unpacker(f, raw=False):
+                yield summary if summary_only else msgpack.unpackb(packed, raw=False)
+        else:
+            record = json.load(f)
+            if summary_only:
+                yield summarize(record) if is_specs(record) else None
+            else:
+                yield record
+
+
+def read_specs(path):
+    """O scan de um arquivo: o documento json ou o último registro de jsonl/msgpack"""
+    fmt, compressed = format_for_path(path)
+    record = None
+    for record in iter_records(path, fmt, compressed):
+        pass
+    return record
@@ -2,7 +2,10 @@
 Script para escanear especificações do sistema e verificar compatibilidade
 com requisitos de jogos/modlists (ex: LoreRim)
 """
+import argparse
+import importlib
 import json
+import os
 import platform
 import subprocess
 import sys
@@ -10,16 +13,75 @@ from datetime import datetime
 from pathlib import Path
 
 try:
-    import psutil
+    from . import command_runner, probe_scheduler, probe_timing, requirement_profiles
 except ImportError:
-    print("Erro: psutil não está instalado. Execute: pip install psutil")
-    sys.exit(1)
+    import command_runner
+    import probe_scheduler
+    import probe_timing
+    import requirement_profiles
 
-try:
-    import wmi
-except ImportError:
-    wmi = None
-    print("Aviso: wmi não está instalado. Algumas informações de GPU podem não estar disponíveis.")
+# Dependências externas são importadas sob demanda, só pelas probes que as usam
+psutil = None
+
+# Executor de comandos do scan em andamento (memoiza e agrupa as consultas WMI)
+_runner = None
+
+
+# Limites de hardware do LoreRim (usados na verificação e nos alertas do monitor)
+LORE_RIM_LIMITS = {
+    "ram_gb": 16,
+    "vram_ultra_gb": 16,
+    "vram_default_gb": 10,
+    "disk_total_gb": 600,
+    "disk_ssd_gb": 350,
+    "pagefile_gb": 40,
+    # Desempenho mínimo medido pelo bench-disk para o SSD aguentar o streaming de assets
+    "ssd_seq_read_mb_s": requirement_profiles.SSD_MIN_SEQ_READ_MB_S,
+    "ssd_rand_read_iops": requirement_profiles.SSD_MIN_RAND_READ_IOPS,
+    # Nível na base de CPUs (cpu_database): 3 = i7-11700K ou equivalente
+    "cpu_tier": 3,
+    # Pontuações do bench-cpu (1000 = i7-11700K, o mínimo exigido)
+    "cpu_single_score": 1000,
+    "cpu_multi_score": 8000,
+}
+
+# Motivos de parada do bench-commit
+COMMIT_STOP_REASONS = {
+    "target": "alvo atingido",
+    "commit_failed": "o sistema recusou a reserva",
+    "safety_limit": "margem de segurança atingida",
+    "latency_cliff": "queda de vazão (memória indo para o disco)",
+    "time_limit": "tempo máximo atingido",
+}
+
+
+def _load_dependency(name):
+    """Importa uma dependência externa sob demanda; retorna None se não estiver instalada"""
+    module = globals().get(name)
+    if module is None:
+        try:
+            module = importlib.import_module(name)
+        except ImportError:
+            return None
+        globals()[name] = module
+    return module
+
+
+def _sibling(name):
+    """Importa sob demanda um módulo irmão (funciona como pacote ou como script)"""
+    if __package__:
+        return importlib.import_module(f".{name}", __package__)
+    return importlib.import_module(name)
+
+
+def _command_runner():
+    """Executor do scan atual, ou um executor avulso fora de um scan"""
+    return _runner if _runner is not None else command_runner.SubprocessRunner()
+
+
+def _target_system():
+    """Sistema das probes: o do executor (ex: fixture do Windows) ou o atual"""
+    return _runner.system if _runner is not None else platform.system()
 
 
 def get_cpu_info():
@@ -33,24 +95,16 @@ def get_cpu_info():
     }
     
     # Tentar obter mais detalhes no Windows
-    if platform.system() == "Windows":
+    if _target_system() == "Windows":
         try:
-            result = subprocess.run(
-                ["wmic", "cpu", "get", "name,MaxClockSpeed", "/format:list"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            for line in result.stdout.split('\n'):
-                if 'Name=' in line:
-                    cpu_info["model"] = line.split('=', 1)[1].strip()
-                elif 'MaxClockSpeed=' in line:
-                    try:
-                        cpu_info["max_frequency_mhz"] = int(line.split('=', 1)[1].strip())
-                    except:
-                        pass
-        except:
-            pass
+            processors = _command_runner().wmi_query("Win32_Processor", ("Name", "MaxClockSpeed"), timeout=5)
+        except (OSError, subprocess.SubprocessError):
+            processors = []
+        for processor in processors[:1]:
+            if processor.get("Name"):
+                cpu_info["model"] = processor["Name"]
+            if processor.get("MaxClockSpeed", "").isdigit():
+                cpu_info["max_frequency_mhz"] = int(processor["MaxClockSpeed"])
     
     return cpu_info
 
@@ -74,48 +128,85 @@ def get_gpu_info():
         "driver_version": None
     }
     
-    if platform.system() == "Windows":
-        if wmi:
-            try:
-                c = wmi.WMI()
-                for gpu in c.Win32_VideoController():
-                    if gpu.Name:
-                        gpu_info["model"] = gpu.Name
-                        gpu_info["driver_version"] = gpu.DriverVersion
-                        # Tentar obter VRAM
-                        if hasattr(gpu, 'AdapterRAM') and gpu.AdapterRAM:
-                            gpu_info["vram_gb"] = round(gpu.AdapterRAM / (1024**3), 2)
-                        break
-            except Exception as e:
-                print(f"Aviso ao obter info GPU via WMI: {e}")
+    if _target_system() == "Windows":
+        try:
+            controllers = _command_runner().wmi_query(
+                "Win32_VideoController", ("Name", "DriverVersion", "AdapterRAM"), timeout=10
+            )
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"Aviso ao obter info GPU via WMI: {e}")
+            controllers = []
         
-        # Tentar obter VRAM via dxdiag ou outras fontes
-        if not gpu_info.get("vram_gb"):
-            try:
-                # Tentar via GPU do Windows
-                result = subprocess.run(
-                    ["wmic", "path", "win32_VideoController", "get", "AdapterRAM,Name", "/format:list"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                for line in result.stdout.split('\n'):
-                    if 'AdapterRAM=' in line and 'Name=' not in line:
-                        try:
-                            vram_bytes = int(line.split('=', 1)[1].strip())
-                            if vram_bytes > 0:
-                                gpu_info["vram_gb"] = round(vram_bytes / (1024**3), 2)
-                                break
-                        except:
-                            pass
-            except:
-                pass
+        # A primeira controladora com nome; a VRAM vem dela ou da primeira que informar
+        named = [gpu for gpu in controllers if gpu.get("Name")]
+        if named:
+            gpu_info["model"] = named[0]["Name"]
+            gpu_info["driver_version"] = named[0].get("DriverVersion") or None
+        for gpu in named[:1] + controllers:
+            vram = gpu.get("AdapterRAM", "")
+            if vram.isdigit() and int(vram) > 0:
+                gpu_info["vram_gb"] = round(int(vram) / (1024**3), 2)
+                break
     
     return gpu_info
 
 
-def get_disk_info():
+def _windows_disk_index():
+    """
+    Mapeia cada letra de unidade para True (SSD), False (HDD) ou None, com uma
+    única chamada ao PowerShell para todos os discos físicos e partições
+    """
+    script = (
+        "$m=@{}; Get-PhysicalDisk | ForEach-Object { $m[[string]$_.DeviceId]=[string]$_.MediaType }; "
+        "Get-Partition | Where-Object DriveLetter | ForEach-Object { "
+        "\"$($_.DriveLetter)=$($m[[string]$_.DiskNumber])\" }"
+    )
+    index = {}
+    try:
+        result = _command_runner().run(
+            ["powershell", "-NoProfile", "-NonInteractive", "-Command", script],
+            timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return index
+    
+    for line in result.stdout.splitlines():
+        if '=' not in line:
+            continue
+        letter, media = line.split('=', 1)
+        media = media.strip().upper()
+        if media == "SSD" or media == "SCM":
+            index[f"{letter.strip().upper()}:"] = True
+        elif media == "HDD":
+            index[f"{letter.strip().upper()}:"] = False
+        else:
+            index[f"{letter.strip().upper()}:"] = None
+    return index
+
+
+def build_disk_index():
+    """Índice de tipo de mídia por dispositivo, montado uma vez por scan"""
+    system = _target_system()
+    if system == "Windows":
+        return _windows_disk_index()
+    if system == "Linux":
+        return _sibling("linux_probes").disk_index()
+    return {}
+
+
+def _lookup_is_ssd(index, partition):
+    """Resolve uma partição contra o índice de discos em O(1)"""
+    if _target_system() == "Windows":
+        return index.get(partition.device[:2].upper())
+    device = os.path.realpath(partition.device) if partition.device.startswith("/") else partition.device
+    return index.get(os.path.basename(device))
+
+
+def get_disk_info(disk_index=None):
     """Obtém informações de discos e espaço disponível"""
+    if disk_index is None:
+        disk_index = build_disk_index()
+    
     disks = []
     for partition in psutil.disk_partitions():
         try:
@@ -127,25 +218,9 @@ def get_disk_info():
                 "total_gb": round(usage.total / (1024**3), 2),
                 "used_gb": round(usage.used / (1024**3), 2),
                 "free_gb": round(usage.free / (1024**3), 2),
-                "percent": usage.percent
+                "percent": usage.percent,
+                "is_ssd": _lookup_is_ssd(disk_index, partition)
             }
-            
-            # Tentar detectar se é SSD
-            if platform.system() == "Windows":
-                try:
-                    result = subprocess.run(
-                        ["wmic", "diskdrive", "get", "Model,MediaType", "/format:list"],
-                        capture_output=True,
-                        text=True,
-                        timeout=5
-                    )
-                    # Esta é uma aproximação - pode não ser 100% preciso
-                    disk_info["is_ssd"] = "SSD" in partition.fstype or "nvme" in partition.device.lower()
-                except:
-                    disk_info["is_ssd"] = None
-            else:
-                disk_info["is_ssd"] = None
-            
             disks.append(disk_info)
         except PermissionError:
             continue
@@ -161,50 +236,59 @@ def get_pagefile_info():
         "location": None
     }
     
-    if platform.system() == "Windows":
+    if _target_system() == "Windows":
         try:
-            result = subprocess.run(
-                ["wmic", "pagefileset", "get", "AllocatedBaseSize,InitialSize,MaximumSize,Name", "/format:list"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            for line in result.stdout.split('\n'):
-                if 'AllocatedBaseSize=' in line:
-                    try:
-                        size_mb = int(line.split('=', 1)[1].strip())
-                        pagefile_info["size_gb"] = round(size_mb / 1024, 2)
-                        pagefile_info["exists"] = True
-                    except:
-                        pass
-                elif 'Name=' in line and pagefile_info["exists"]:
-                    pagefile_info["location"] = line.split('=', 1)[1].strip()
-                    break
-        except Exception as e:
+            # Win32_PageFileUsage é a classe que expõe o tamanho alocado
+            pagefiles = _command_runner().wmi_query("Win32_PageFileUsage", ("AllocatedBaseSize", "Name"), timeout=5)
+        except (OSError, subprocess.SubprocessError) as e:
             print(f"Aviso ao obter info de pagefile: {e}")
+            pagefiles = []
+        for pagefile in pagefiles:
+            if pagefile.get("AllocatedBaseSize", "").isdigit():
+                pagefile_info["size_gb"] = round(int(pagefile["AllocatedBaseSize"]) / 1024, 2)
+                pagefile_info["exists"] = True
+                pagefile_info["location"] = pagefile.get("Name") or None
+                break
     
     return pagefile_info
 
 
+# Chaves de desinstalação (64 bits, 32 bits e do usuário): a mesma lista do
+# "Aplicativos instalados", sem o custo e os efeitos colaterais do Win32_Product
+UNINSTALL_KEYS = (
+    r"HKLM\SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
+    r"HKLM\SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall",
+    r"HKCU\Software\Microsoft\Windows\CurrentVersion\Uninstall",
+)
+
+
+def _installed_products():
+    """
+    Produtos instalados (chaves de desinstalação do registro) como (nome, versão).
+
+    A leitura é feita uma única vez por scan (memoizada no executor) e
+    compartilhada pelas verificações de Visual C++ e .NET.
+    """
+    runner = _command_runner()
+    products = []
+    for key in UNINSTALL_KEYS:
+        for values in runner.registry_query(key, timeout=15).values():
+            if values.get("DisplayName"):
+                products.append((values["DisplayName"], values.get("DisplayVersion", "")))
+    return products
+
+
 def check_vc_runtime():
     """Verifica se Visual C++ está instalado"""
     vc_installed = False
     vc_versions = []
     
-    if platform.system() == "Windows":
+    if _target_system() == "Windows":
         try:
-            result = subprocess.run(
-                ["wmic", "product", "where", "name like '%Visual C++%'", "get", "Name,Version"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            for line in result.stdout.split('\n'):
-                if 'Visual C++' in line:
+            for name, version in _installed_products():
+                if 'Visual C++' in name:
                     vc_installed = True
-                    vc_versions.append(line.strip())
+                    vc_versions.append(f"{name} - {version or 'Unknown'}")
         except:
             # Tentar método alternativo
             try:
@@ -240,19 +324,12 @@ def check_dotnet_runtime():
     dotnet_installed = False
     dotnet_versions = []
     
-    if platform.system() == "Windows":
+    if _target_system() == "Windows":
         try:
-            result = subprocess.run(
-                ["wmic", "product", "where", "name like '%.NET%'", "get", "Name,Version"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            for line in result.stdout.split('\n'):
-                if '.NET' in line and ('Runtime' in line or 'Framework' in line):
+            for name, version in _installed_products():
+                if '.NET' in name and ('Runtime' in name or 'Framework' in name):
                     dotnet_installed = True
-                    dotnet_versions.append(line.strip())
+                    dotnet_versions.append(f"{name} - {version or 'Unknown'}")
         except:
             # Tentar método alternativo via registro
             try:
@@ -281,29 +358,40 @@ def check_dotnet_runtime():
     }
 
 
+def _incomplete_reason(section):
+    """Retorna o motivo se a seção veio de uma probe que não terminou"""
+    if isinstance(section, dict):
+        if section.get("timed_out"):
+            return "timeout"
+        if section.get("error"):
+            return "erro"
+    return None
+
+
 def check_lore_rim_compatibility(system_specs):
     """Verifica compatibilidade com LoreRim baseado nos requisitos"""
     requirements = {
         "cpu": {
             "min": "11th gen Intel i7 ou AMD equivalente",
+            "min_tier": LORE_RIM_LIMITS["cpu_tier"],
             "status": "Não verificado"
         },
         "ram": {
-            "min_gb": 16,
+            "min_gb": LORE_RIM_LIMITS["ram_gb"],
             "status": "Não verificado"
         },
         "gpu_vram": {
-            "ultra_gb": 16,
-            "default_gb": 10,
+            "ultra_gb": LORE_RIM_LIMITS["vram_ultra_gb"],
+            "default_gb": LORE_RIM_LIMITS["vram_default_gb"],
             "status": "Não verificado"
         },
         "disk_space": {
-            "total_gb": 600,
-            "ssd_gb": 350,
+            "total_gb": LORE_RIM_LIMITS["disk_total_gb"],
+            "ssd_gb": LORE_RIM_LIMITS["disk_ssd_gb"],
             "status": "Não verificado"
         },
         "pagefile": {
-            "min_gb": 40,
+            "min_gb": LORE_RIM_LIMITS["pagefile_gb"],
             "status": "Não verificado"
         },
         "vc_runtime": {
@@ -318,27 +406,30 @@ def check_lore_rim_compatibility(system_specs):
     
     # Verificar RAM
     ram_total = system_specs.get("ram", {}).get("total_gb", 0)
-    if ram_total >= 16:
+    if ram_total >= LORE_RIM_LIMITS["ram_gb"]:
         requirements["ram"]["status"] = "OK"
     else:
-        requirements["ram"]["status"] = f"INSUFICIENTE (tem {ram_total}GB, precisa 16GB)"
+        requirements["ram"]["status"] = f"INSUFICIENTE (tem {ram_total}GB, precisa {LORE_RIM_LIMITS['ram_gb']}GB)"
     
     # Verificar GPU VRAM
     gpu_vram = system_specs.get("gpu", {}).get("vram_gb")
     if gpu_vram:
-        if gpu_vram >= 16:
+        if gpu_vram >= LORE_RIM_LIMITS["vram_ultra_gb"]:
             requirements["gpu_vram"]["status"] = "OK para Ultra"
-        elif gpu_vram >= 10:
+        elif gpu_vram >= LORE_RIM_LIMITS["vram_default_gb"]:
             requirements["gpu_vram"]["status"] = "OK para Default"
         else:
-            requirements["gpu_vram"]["status"] = f"INSUFICIENTE (tem {gpu_vram}GB, precisa 10GB mínimo)"
+            requirements["gpu_vram"]["status"] = f"INSUFICIENTE (tem {gpu_vram}GB, precisa {LORE_RIM_LIMITS['vram_default_gb']}GB mínimo)"
     else:
         requirements["gpu_vram"]["status"] = "Não detectado"
     
     # Verificar espaço em disco (SSD)
     disks = system_specs.get("disks", [])
+    benchmarks = system_specs.get("disk_benchmark", {})
     max_ssd_free = 0
     total_free = 0
+    slow_disks = []
+    unverified_disks = []
     
     for disk in disks:
         free_gb = disk.get("free_gb", 0)
@@ -347,23 +438,62 @@ def check_lore_rim_compatibility(system_specs):
         # Considerar SSD se is_ssd for True ou None (assumir que pode ser)
         is_ssd = disk.get("is_ssd")
         if is_ssd or is_ssd is None:
+            # Um disco medido pelo bench-disk precisa também ter desempenho de SSD
+            bench = benchmarks.get(disk.get("mountpoint"))
+            verdict = requirement_profiles.disk_benchmark_ok(bench) if bench else None
+            if verdict is False:
+                slow_disks.append(disk.get("mountpoint"))
+                continue
+            if bench and verdict is None:
+                unverified_disks.append(disk.get("mountpoint"))
             max_ssd_free = max(max_ssd_free, free_gb)
     
-    if max_ssd_free >= 350:
+    if max_ssd_free >= LORE_RIM_LIMITS["disk_ssd_gb"]:
         requirements["disk_space"]["status"] = f"OK (SSD: {max_ssd_free}GB livre)"
     else:
-        requirements["disk_space"]["status"] = f"INSUFICIENTE no SSD (tem {max_ssd_free}GB livre, precisa 350GB)"
+        requirements["disk_space"]["status"] = f"INSUFICIENTE no SSD (tem {max_ssd_free}GB livre, precisa {LORE_RIM_LIMITS['disk_ssd_gb']}GB)"
+    
+    if slow_disks:
+        requirements["disk_space"]["status"] += (
+            f" | Lento demais para o streaming de assets: {', '.join(slow_disks)} "
+            f"(precisa {LORE_RIM_LIMITS['ssd_seq_read_mb_s']}MB/s sequencial e "
+            f"{LORE_RIM_LIMITS['ssd_rand_read_iops']} IOPS 4K)"
+        )
+    
+    if unverified_disks:
+        requirements["disk_space"]["status"] += (
+            f" | bench-disk inconclusivo (leituras do cache): {', '.join(unverified_disks)}"
+        )
     
-    if total_free < 600:
-        requirements["disk_space"]["status"] += f" | Espaço total insuficiente ({total_free}GB livre, precisa 600GB)"
+    if total_free < LORE_RIM_LIMITS["disk_total_gb"]:
+        requirements["disk_space"]["status"] += f" | Espaço total insuficiente ({total_free}GB livre, precisa {LORE_RIM_LIMITS['disk_total_gb']}GB)"
     
     # Verificar pagefile
     pagefile = system_specs.get("pagefile", {})
-    pagefile_size = pagefile.get("size_gb", 0)
-    if pagefile_size >= 40:
+    pagefile_size = pagefile.get("size_gb") or 0
+    if pagefile_size >= LORE_RIM_LIMITS["pagefile_gb"]:
         requirements["pagefile"]["status"] = "OK"
     else:
-        requirements["pagefile"]["status"] = f"INSUFICIENTE (tem {pagefile_size}GB, precisa 40GB mínimo)"
+        requirements["pagefile"]["status"] = f"INSUFICIENTE (tem {pagefile_size}GB, precisa {LORE_RIM_LIMITS['pagefile_gb']}GB mínimo)"
+    
+    # Com o bench-commit, vale o que o sistema de fato conseguiu reservar
+    commit_bench = system_specs.get("commit_benchmark")
+    commit_decided = False
+    if commit_bench:
+        committed = commit_bench.get("committed_gb", 0)
+        if commit_bench.get("reached_target") and committed >= LORE_RIM_LIMITS["pagefile_gb"]:
+            requirements["pagefile"]["status"] = f"OK ({committed}GB reservados de verdade)"
+            commit_decided = True
+        elif commit_bench.get("stop_reason") in ("commit_failed", "safety_limit"):
+            requirements["pagefile"]["status"] = (
+                f"INSUFICIENTE (só {committed}GB puderam ser reservados, precisa {LORE_RIM_LIMITS['pagefile_gb']}GB)"
+            )
+            commit_decided = True
+        else:
+            reason = commit_bench.get("stop_reason")
+            requirements["pagefile"]["status"] += (
+                f" | bench-commit parou em {committed}GB: {COMMIT_STOP_REASONS.get(reason, reason)}"
+            )
     
     # Verificar Visual C++
     vc_runtime = system_specs.get("vc_runtime", {})
@@ -379,40 +509,241 @@ def check_lore_rim_compatibility(system_specs):
     else:
         requirements["dotnet_runtime"]["status"] = "NÃO INSTALADO"
     
-    # CPU - verificação básica (análise de modelo)
-    cpu_model = system_specs.get("cpu", {}).get("model", "").lower()
-    cpu_ok = False
-    
-    if "intel" in cpu_model:
-        # Tentar detectar geração i7
-        import re
-        if re.search(r'i[357]-(\d{4,5})', cpu_model) or re.search(r'i7-(\d{4,5})', cpu_model):
-            match = re.search(r'i7-(\d{4,5})', cpu_model)
-            if match:
-                gen = match.group(1)[0]
-                if gen and int(gen) >= 1:  # i7-11xxx ou superior
-                    cpu_ok = True
-        if "i7" in cpu_model and ("11" in cpu_model or "12" in cpu_model or "13" in cpu_model or "14" in cpu_model):
-            cpu_ok = True
-    elif "amd" in cpu_model:
-        # AMD Ryzen equivalente (Ryzen 5 3600+ ou similar)
-        if "ryzen" in cpu_model:
-            cpu_ok = True
-    
-    if cpu_ok:
-        requirements["cpu"]["status"] = "OK (pode precisar de verificação manual)"
+    # CPU - nível do modelo na base de referência (data/cpu_models.json)
+    cpu_model = system_specs.get("cpu", {}).get("model", "")
+    try:
+        cpu_class = _sibling("cpu_database").default_database().classify(cpu_model)
+    except (OSError, ValueError) as e:
+        print(f"Aviso ao abrir a base de CPUs: {e}")
+        cpu_class = None
+    if cpu_class is None:
+        requirements["cpu"]["status"] = "Verificar manualmente (modelo fora da base de referência)"
+    elif cpu_class["match"] == "estimated":
+        requirements["cpu"]["status"] = (
+            f"Verificar manualmente ({cpu_class['family']} de geração {cpu_class['generation']}, fora da base de referência)"
+        )
     else:
-        requirements["cpu"]["status"] = "Verificar manualmente se atende aos requisitos"
+        description = (f"{cpu_class['model']}: {cpu_class['cores']} núcleos/{cpu_class['threads']} threads, "
+                       f"nível {cpu_class['tier']}")
+        if cpu_class["tier"] >= LORE_RIM_LIMITS["cpu_tier"]:
+            requirements["cpu"]["status"] = f"OK ({description})"
+        else:
+            requirements["cpu"]["status"] = f"INSUFICIENTE ({description}, precisa nível {LORE_RIM_LIMITS['cpu_tier']})"
+    
+    # Com o bench-cpu, a decisão é pela pontuação medida, não pelo nome do modelo
+    cpu_bench = system_specs.get("cpu_benchmark")
+    if cpu_bench:
+        single = cpu_bench.get("single_thread_score", 0)
+        multi = cpu_bench.get("multi_core_score", 0)
+        if single >= LORE_RIM_LIMITS["cpu_single_score"] and multi >= LORE_RIM_LIMITS["cpu_multi_score"]:
+            requirements["cpu"]["status"] = f"OK (single {single}, multi {multi})"
+        else:
+            requirements["cpu"]["status"] = (
+                f"INSUFICIENTE (single {single}/{LORE_RIM_LIMITS['cpu_single_score']}, "
+                f"multi {multi}/{LORE_RIM_LIMITS['cpu_multi_score']})"
+            )
+    
+    # Probes que não terminaram (ou não foram selecionadas) não podem reprovar o requisito
+    probe_sections = {
+        "cpu": "cpu",
+        "ram": "ram",
+        "gpu_vram": "gpu",
+        "disk_space": "disks",
+        "pagefile": "pagefile",
+        "vc_runtime": "vc_runtime",
+        "dotnet_runtime": "dotnet_runtime"
+    }
+    if cpu_bench:
+        del probe_sections["cpu"]
+    if commit_decided:
+        del probe_sections["pagefile"]
+    for req_name, section in probe_sections.items():
+        if section not in system_specs:
+            requirements[req_name]["status"] = "Não verificado (não coletado)"
+            continue
+        reason = _incomplete_reason(system_specs.get(section))
+        if reason:
+            requirements[req_name]["status"] = f"Não verificado ({reason})"
+    disks_status = system_specs.get("_scan", {}).get("probes", {}).get("disks", {}).get("status")
+    if disks_status and disks_status != "ok":
+        requirements["disk_space"]["status"] = f"Não verificado ({disks_status})"
     
     return requirements
 
 
-def scan_system():
-    """Escaneia todas as especificações do sistema"""
+def refresh_cpu_frequency(cpu_info):
+    """Atualiza a frequência atual de uma entrada de CPU vinda do cache"""
+    freq = psutil.cpu_freq()
+    return dict(cpu_info, frequency_mhz=freq.current if freq else None)
+
+
+# Registro de probes. "func" é o nome da função neste módulo ou "modulo:funcao"
+# em um módulo irmão; "deps" são as dependências obrigatórias e "optional_deps"
+# as opcionais. "cache" é (TTL em dias, chaves de invalidação) para dados que
+# quase nunca mudam; RAM e discos são sempre medidos. "wmi" lista as classes e
+# propriedades consultadas no Windows, unidas em uma chamada por classe.
+PROBE_REGISTRY = {
+    "cpu": {
+        "func": "get_cpu_info", "deps": ("psutil",), "timeout": 8,
+        "default": {"model": "", "cores_physical": None, "cores_logical": None},
+        "cache": (30, ("boot", "release")), "volatile": "refresh_cpu_frequency",
+        "wmi": (("Win32_Processor", ("Name", "MaxClockSpeed")),),
+    },
+    "ram": {
+        "func": "get_ram_info", "deps": ("psutil",), "timeout": 3,
+        "default": {"total_gb": 0, "available_gb": 0, "used_gb": 0, "percent": None},
+    },
+    "gpu": {
+        "func": "get_gpu_info", "deps": (), "timeout": 15,
+        "default": {"model": "Não detectado", "vram_gb": None, "driver_version": None},
+        "cache": (7, ("release", "driver")),
+        "wmi": (("Win32_VideoController", ("Name", "DriverVersion", "AdapterRAM")),),
+    },
+    "disks": {
+        "func": "get_disk_info", "deps": ("psutil",), "timeout": 15, "default": [],
+    },
+    "pagefile": {
+        "func": "get_pagefile_info", "deps": (), "timeout": 8,
+        "default": {"exists": False, "size_gb": None, "location": None},
+        "cache": (7, ("boot",)),
+        "wmi": (("Win32_PageFileUsage", ("AllocatedBaseSize", "Name")),),
+    },
+    "vc_runtime": {
+        "func": "check_vc_runtime", "deps": (), "timeout": 15,
+        "default": {"installed": False, "versions": []},
+        "cache": (1, ("release",)),
+    },
+    "dotnet_runtime": {
+        "func": "check_dotnet_runtime", "deps": (), "timeout": 15,
+        "default": {"installed": False, "versions": []},
+        "cache": (1, ("release",)),
+    },
+    "processes": {
+        "func": "process_report:top_processes", "deps": ("psutil",), "timeout": 10,
+        "default": {"processes": 0, "sample_s": None, "top_rss": [], "top_cpu": [], "top_io": []},
+    },
+}
+
+# Implementações nativas por sistema: uma função com o mesmo nome no módulo
+# substitui a daqui e dispensa as dependências declaradas no registro
+NATIVE_PROBE_MODULES = {
+    "Linux": "linux_probes",
+}
+
+# Nomes aceitos por --only/--skip que representam várias probes
+PROBE_GROUPS = {
+    "runtimes": ("vc_runtime", "dotnet_runtime"),
+}
+
+
+def select_probes(only=None, skip=None):
+    """Resolve --only/--skip (nomes ou grupos) na lista de probes, na ordem do registro"""
+    def expand(names):
+        selected = set()
+        for name in names:
+            if name in PROBE_GROUPS:
+                selected.update(PROBE_GROUPS[name])
+            elif name in PROBE_REGISTRY:
+                selected.add(name)
+            else:
+                valid = ", ".join(list(PROBE_REGISTRY) + list(PROBE_GROUPS))
+                raise ValueError(f"Probe desconhecida: {name} (opções: {valid})")
+        return selected
+    
+    chosen = expand(only) if only else set(PROBE_REGISTRY)
+    chosen -= expand(skip or [])
+    return [name for name in PROBE_REGISTRY if name in chosen]
+
+
+def _split_names(value):
+    """Lista separada por vírgulas da linha de comando (None se vazia)"""
+    return [name.strip() for name in value.split(",") if name.strip()] if value else None
+
+
+def _resolve_function(ref, native=None):
+    """Encontra a função de uma probe, preferindo a implementação nativa do sistema"""
+    if native is not None and hasattr(native, ref):
+        return getattr(native, ref)
+    if ":" in ref:
+        module_name, func_name = ref.split(":", 1)
+        return getattr(_sibling(module_name), func_name)
+    return globals()[ref]
+
+
+def _missing_dependency(names):
+    """Probe substituta que falha explicando o que instalar"""
+    def probe():
+        raise RuntimeError(f"{', '.join(names)} não está instalado. Execute: pip install {' '.join(names)}")
+    return probe
+
+
+def _probe_list(cache=None, names=None, recorder=None, probe_timeout=None):
+    """
+    Monta as probes selecionadas com seus prazos, resultados padrão, cache e
+    spans de tempo. `probe_timeout` limita o prazo do registro de cada probe.
+    """
+    if cache is not None:
+        probe_cache = _sibling("probe_cache")
+        cache_keys = {
+            "boot": probe_cache.boot_time_key,
+            "release": probe_cache.os_release_key,
+            "driver": probe_cache.gpu_driver_key,
+        }
+    
+    native_name = NATIVE_PROBE_MODULES.get(_target_system())
+    native = _sibling(native_name) if native_name else None
+    
+    probes = []
+    for name in names or list(PROBE_REGISTRY):
+        spec = PROBE_REGISTRY[name]
+        timeout = spec["timeout"] if probe_timeout is None else min(spec["timeout"], probe_timeout)
+        if native is not None and hasattr(native, spec["func"]):
+            missing = []
+        else:
+            missing = [dep for dep in spec["deps"] if _load_dependency(dep) is None]
+            for dep in spec.get("optional_deps", ()):
+                if _load_dependency(dep) is None and _target_system() == "Windows":
+                    print(f"Aviso: {dep} não está instalado. Algumas informações de {name.upper()} podem não estar disponíveis.")
+        
+        if missing:
+            func = _missing_dependency(missing)
+        else:
+            func = _resolve_function(spec["func"], native)
+            if cache is not None and "cache" in spec:
+                ttl_days, keys = spec["cache"]
+                volatile = _resolve_function(spec["volatile"], native) if "volatile" in spec else None
+                func = probe_cache.cached(cache, name, func, ttl_days * probe_cache.DAY,
+                                          [cache_keys[key] for key in keys], volatile=volatile,
+                                          default=spec["default"], timeout=timeout)
+        if recorder is not None:
+            func = recorder.wrap(name, func)
+        probes.append(probe_scheduler.Probe(name, func, timeout=timeout, default=spec["default"]))
+    return probes
+
+
+def scan_system(probe_timeout=None,
+                scan_timeout=probe_scheduler.DEFAULT_SCAN_TIMEOUT,
+                use_cache=True, refresh=False, profiles_dir=requirement_profiles.PROFILES_DIR,
+                probes=None, runner=None):
+    """
+    Escaneia as especificações do sistema.
+
+    `probes` limita o scan a uma lista de nomes do PROBE_REGISTRY (ver
+    select_probes); seções não coletadas ficam fora do resultado. Cada probe
+    tem o prazo do registro; `probe_timeout` só pode encurtá-lo. `runner`
+    é o executor dos comandos externos (padrão: AsyncCommandRunner); um
+    ReplayRunner reproduz um scan gravado, inclusive de outro sistema.
+    Tempos, comandos e timeouts de cada probe ficam em `_perf`. Um scan
+    parcial guarda as probes escolhidas em `_scan["selection"]`; um replay
+    guarda o arquivo em `_scan["replay"]` e leva o nome da máquina gravada.
+    """
+    global _runner
     print("Escaneando sistema...")
     
+    replay = runner if isinstance(runner, command_runner.ReplayRunner) else None
     system_specs = {
         "scan_date": datetime.now().isoformat(),
+        "hostname": replay.hostname if replay is not None else platform.node(),
         "os": {
             "system": platform.system(),
             "release": platform.release(),
@@ -420,52 +751,651 @@ def scan_system():
             "architecture": platform.architecture()[0],
             "machine": platform.machine()
         },
-        "cpu": get_cpu_info(),
-        "ram": get_ram_info(),
-        "gpu": get_gpu_info(),
-        "disks": get_disk_info(),
-        "pagefile": get_pagefile_info(),
-        "vc_runtime": check_vc_runtime(),
-        "dotnet_runtime": check_dotnet_runtime()
     }
     
+    # Comandos são memoizados por scan: um executor novo a cada scan
+    owns_runner = runner is None
+    _runner = runner or command_runner.AsyncCommandRunner()
+    try:
+        names = probes or list(PROBE_REGISTRY)
+        _runner.plan_wmi(query for name in names for query in PROBE_REGISTRY[name].get("wmi", ()))
+        
+        # Probes independentes rodam em paralelo; o tempo total é o da mais lenta
+        cache = _sibling("probe_cache").ProbeCache(refresh=refresh) if use_cache else None
+        recorder = probe_timing.PerfRecorder()
+        probe_list = _probe_list(cache, names, recorder, probe_timeout=probe_timeout)
+        results, scan_status = probe_scheduler.run_probes(probe_list, scan_timeout=scan_timeout)
+        if cache is not None:
+            # Probes que estouraram o prazo continuam rodando; o que devolverem não vai para o cache
+            cache.seal()
+        perf = recorder.report(scan_status, cached=cache.hits if cache is not None else (), runner=_runner)
+    finally:
+        if owns_runner:
+            _runner.close()
+        _runner = None
+    
+    for probe in probe_list:
+        system_specs[probe.name] = results[probe.name]
+    system_specs["_scan"] = scan_status
+    if probes is not None and set(names) != set(PROBE_REGISTRY):
+        system_specs["_scan"]["selection"] = list(names)
+    if replay is not None:
+        system_specs["_scan"]["replay"] = replay.source or True
+    system_specs["_perf"] = perf
+    if cache is not None:
+        system_specs["_scan"]["cached"] = sorted(cache.hits)
+        try:
+            cache.save()
+        except OSError as e:
+            print(f"Aviso ao salvar cache de probes: {e}")
+    
     # Verificar compatibilidade com LoreRim
     system_specs["lore_rim_compatibility"] = check_lore_rim_compatibility(system_specs)
+    system_specs["profiles"] = evaluate_profiles(system_specs, profiles_dir)
     
     return system_specs
 
 
-def save_to_file(specs, filename="system_specs.json"):
-    """Salva as especificações em arquivo JSON"""
-    # Salvar na pasta output
+def evaluate_profiles(system_specs, profiles_dir=requirement_profiles.PROFILES_DIR):
+    """Avalia o scan contra todos os perfis de requisitos do diretório"""
+    try:
+        compiled = requirement_profiles.compile_profiles(profiles_dir)
+    except (OSError, ValueError) as e:
+        print(f"Aviso ao carregar perfis de requisitos: {e}")
+        return {}
+    return compiled.evaluate(system_specs)
+
+
+def save_to_file(specs, filename="system_specs.json", fmt=None, compress=False):
+    """
+    Salva as especificações na pasta output.
+
+    `fmt` escolhe o formato do spec_io (json, compact, jsonl, msgpack) e
+    troca a extensão do arquivo; jsonl e msgpack acrescentam um registro.
+    """
+    spec_io = _sibling("spec_io")
     output_dir = Path(__file__).parent.parent.parent / "output"
-    output_dir.mkdir(exist_ok=True)
+    if fmt or compress:
+        filename = spec_io.filename_for(Path(filename).name.split(".")[0], fmt or "json", compress)
     output_path = output_dir / filename
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(specs, f, indent=2, ensure_ascii=False)
+    spec_io.write_specs(specs, output_path, fmt=fmt, compress=compress)
     
     print(f"\nEspecificações salvas em: {output_path.absolute()}")
     return output_path
 
 
-def main():
+def parse_args(argv=None):
+    """Lê os argumentos da linha de comando"""
+    parser = argparse.ArgumentParser(description="Scanner de especificações do sistema")
+    parser.add_argument("--refresh", action="store_true",
+                        help="ignora o cache e coleta tudo novamente")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="não lê nem grava o cache de probes")
+    parser.add_argument("--profiles", default=str(requirement_profiles.PROFILES_DIR),
+                        help="diretório com os perfis de requisitos (*.json)")
+    parser.add_argument("--only", default=None,
+                        help="coleta só estas probes, separadas por vírgula (ex: ram,disks)")
+    parser.add_argument("--skip", default=None,
+                        help="não coleta estas probes (ex: runtimes)")
+    parser.add_argument("--record", default=None, metavar="ARQUIVO",
+                        help="grava os comandos externos e suas saídas em um fixture JSON")
+    parser.add_argument("--replay", default=None, metavar="ARQUIVO",
+                        help="reproduz um fixture gravado em vez de executar comandos (sem cache)")
+    parser.add_argument("--format", choices=("json", "compact", "jsonl", "msgpack"), default=None,
+                        help="formato do arquivo salvo (padrão: json indentado; jsonl/msgpack acrescentam)")
+    parser.add_argument("--compress", action="store_true",
+                        help="comprime o arquivo salvo com gzip")
+    parser.add_argument("--profile", action="store_true",
+                        help="mostra o tempo, a CPU e os comandos de cada probe")
+    
+    subparsers = parser.add_subparsers(dest="command")
+    
+    monitor = subparsers.add_parser("monitor", help="monitora RAM, swap, I/O e CPU continuamente")
+    monitor.add_argument("--interval", type=float, default=None,
+                         help="intervalo entre amostras em segundos (padrão: 1)")
+    monitor.add_argument("--duration", type=float, default=None,
+                         help="duração em segundos (padrão: até Ctrl+C)")
+    monitor.add_argument("--capacity", type=int, default=None,
+                         help="número de amostras mantidas no histórico (padrão: 3600)")
+    
+    bench_disk = subparsers.add_parser("bench-disk", help="mede throughput e latência de um disco")
+    bench_disk.add_argument("mountpoint", help="ponto de montagem a testar (ex: C:\\ ou /)")
+    bench_disk.add_argument("--dir", default=None,
+                            help="diretório gravável no disco para o arquivo temporário (padrão: o ponto de montagem)")
+    bench_disk.add_argument("--size-mb", type=int, default=None,
+                            help="tamanho do arquivo de teste (padrão: 256MB, máx. 1024MB)")
+    bench_disk.add_argument("--ops", type=int, default=None,
+                            help="operações 4K aleatórias por fase (padrão: 2000)")
+    
+    bench_cpu = subparsers.add_parser("bench-cpu", help="mede CPU (single/multi-core) e memória")
+    bench_cpu.add_argument("--budget", type=float, default=None,
+                           help="tempo aproximado em segundos para os testes repetidos (padrão: 5)")
+    bench_cpu.add_argument("--calibrate", action="store_true",
+                           help="só mostra as medianas dos laços nesta máquina (para recalibrar a referência)")
+    
+    bench_commit = subparsers.add_parser("bench-commit", help="verifica se o sistema reserva a memória virtual exigida")
+    bench_commit.add_argument("--target-gb", type=float, default=None,
+                              help="memória a reservar (padrão: o pagefile mínimo do LoreRim, 40GB)")
+    bench_commit.add_argument("--chunk-mb", type=int, default=None,
+                              help="tamanho de cada bloco reservado (padrão: 256MB)")
+    bench_commit.add_argument("--reserve-gb", type=float, default=None,
+                              help="margem que nunca é usada (padrão: 1GB ou 10%% do limite de compromisso)")
+    bench_commit.add_argument("--max-seconds", type=float, default=None,
+                              help="duração máxima do teste (padrão: 60)")
+    
+    bench_scanner = subparsers.add_parser("bench-scanner", help="mede as probes e o scan contra dados fixos")
+    bench_scanner.add_argument("--repeat", type=int, default=None,
+                               help="execuções de cada medição (padrão: 20)")
+    bench_scanner.add_argument("--latency", action="store_true",
+                               help="reproduz o tempo gravado de cada comando")
+    bench_scanner.add_argument("--fixture", default=None,
+                               help="fixture JSON (padrão: fixtures/scanner_fixture.json)")
+    bench_scanner.add_argument("--baseline", default=None,
+                               help="resultado anterior (JSON) para comparar as medianas")
+    
+    disk_usage = subparsers.add_parser("disk-usage", help="mostra o que ocupa o espaço dos discos")
+    disk_usage.add_argument("mountpoints", nargs="*",
+                            help="pontos de montagem ou diretórios (padrão: discos SSD/desconhecidos do scan)")
+    disk_usage.add_argument("--top", type=int, default=None,
+                            help="quantos diretórios listar (padrão: 20)")
+    disk_usage.add_argument("--depth", type=int, default=None,
+                            help="profundidade máxima dos maiores diretórios (padrão: 3)")
+    disk_usage.add_argument("--workers", type=int, default=None,
+                            help="threads de leitura (padrão: 4 por núcleo, máx. 32)")
+    
+    serve = subparsers.add_parser("serve", help="servidor HTTP local com métricas (Prometheus e JSON)")
+    serve.add_argument("--host", default=None, help="endereço (padrão: 127.0.0.1)")
+    serve.add_argument("--port", type=int, default=None, help="porta (padrão: 9109)")
+    serve.add_argument("--scan-interval", type=float, default=None,
+                       help="segundos entre scans em segundo plano (padrão: 300)")
+    serve.add_argument("--sample-interval", type=float, default=None,
+                       help="segundos entre amostras dos contadores ao vivo (padrão: 1)")
+    
+    top = subparsers.add_parser("top", help="processos que mais usam RAM, CPU e I/O")
+    top.add_argument("-n", type=int, default=None,
+                     help="quantos processos por métrica (padrão: 10)")
+    top.add_argument("--sample", type=float, default=None,
+                     help="mede CPU e I/O em uma janela de N segundos (padrão: 1)")
+    
+    history = subparsers.add_parser("history", help="consulta o histórico de scans")
+    history.add_argument("--days", type=float, default=90,
+                         help="período em dias (padrão: 90; 0 para todo o histórico)")
+    history.add_argument("--host", default=None,
+                         help="host a consultar (padrão: esta máquina)")
+    history.add_argument("--metrics", default="ssd_free_gb,pagefile_gb",
+                         help="métricas a mostrar, separadas por vírgula")
+    history.add_argument("--diff", action="store_true",
+                         help="mostra o que mudou entre os dois últimos scans")
+    
+    fleet_parser = subparsers.add_parser("fleet", help="agrega system_specs.json de várias máquinas")
+    fleet_parser.add_argument("source", help="diretório, .zip ou .tar(.gz) com os arquivos de especificações")
+    fleet_parser.add_argument("--worst", type=int, default=10,
+                              help="quantas máquinas mais distantes listar por perfil")
+    
+    return parser.parse_args(argv)
+
+
+def run_fleet(args):
+    """Modo fleet: avalia todas as máquinas contra todos os perfis"""
+    fleet = _sibling("fleet")
+    
+    print("=" * 60)
+    print(f"Frota: {args.source}")
+    print("=" * 60)
+    
+    compiled = requirement_profiles.compile_profiles(args.profiles)
+    table = fleet.load_fleet(args.source)
+    summary = fleet.summarize(table, compiled, worst=args.worst)
+    
+    print(f"Máquinas: {summary['machines']} | Arquivos inválidos: {len(summary['errors'])} | "
+          f"Registros antigos de históricos ignorados: {summary['superseded_records']}")
+    print("CPUs: " + " | ".join(f"{tier}: {count}" for tier, count in summary["cpu_tiers"].items()))
+    for profile_name, result in summary["profiles"].items():
+        print(f"\n{profile_name}: " + " | ".join(f"{tier}: {count}" for tier, count in result["tiers"].items()))
+        for entry in result["worst"]:
+            print(f"  ✗ {entry['machine']} (déficit {entry['deficit']}, {entry['file']})")
+    
+    save_to_file(summary, "fleet_summary.json")
+
+
+def run_bench_scanner(args):
+    """Modo bench-scanner: mede probes e scan com psutil e comandos simulados"""
+    scanner_benchmark = _sibling("scanner_benchmark")
+    
+    print("=" * 60)
+    print("Benchmark do Scanner")
+    print("=" * 60)
+    
+    fixture = scanner_benchmark.load_fixture(args.fixture or scanner_benchmark.DEFAULT_FIXTURE)
+    results = scanner_benchmark.benchmark_scanner(
+        sys.modules[__name__], fixture,
+        repeat=args.repeat or scanner_benchmark.DEFAULT_REPEAT,
+        latency=args.latency
+    )
+    for name, stats in list(results["functions"].items()) + [("scan_system", results["scan"])]:
+        print(f"{name:<32} mediana {stats['median_ms']:>9.3f}ms | mín {stats['min_ms']:>9.3f}ms | p95 {stats['p95_ms']:>9.3f}ms")
+    
+    monitor = scanner_benchmark.benchmark_monitor(sys.modules[__name__])
+    results["monitor"] = monitor
+    print(f"{'monitor (psutil real)':<32} {monitor['cpu_percent']}% de um núcleo a {1 / monitor['interval_s']:g} Hz "
+          f"({monitor['sample_us']}us por amostra)")
+    
+    regressions = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("\n" + "=" * 60)
+        print("COMPARAÇÃO COM O BASELINE")
+        print("=" * 60)
+        for name, before, after, change, regressed in scanner_benchmark.compare(results, baseline):
+            regressions += regressed
+            print(f"{'✗' if regressed else '✓'} {name}: {before}ms -> {after}ms ({change:+.0%})")
+    
+    save_to_file(results, "scanner_benchmark.json")
+    return 1 if regressions else 0
+
+
+def _print_processes(report, keys=("top_rss", "top_cpu", "top_io"), limit=None):
+    """Mostra as listas de maiores consumidores de um relatório de processos"""
+    titles = {"top_rss": "RAM (RSS)", "top_cpu": "CPU", "top_io": "I/O"}
+    for key in keys:
+        print(f"{titles[key]}:")
+        for entry in report[key][:limit]:
+            details = [f"{entry['rss_mb']}MB" if entry.get("rss_mb") is not None else None]
+            if "cpu_percent" in entry:
+                details.append(f"CPU {entry['cpu_percent']}%")
+            elif "cpu_s" in entry:
+                details.append(f"CPU {entry['cpu_s']}s")
+            if "io_mb" in entry:
+                details.append(f"I/O {entry['io_mb']}MB")
+            print(f"  {entry['name']} (PID {entry['pid']}): " + " | ".join(d for d in details if d))
+
+
+def run_disk_usage(args):
+    """Modo disk-usage: maiores diretórios e o que pode ser limpo em cada disco"""
+    disk_usage = _sibling("disk_usage")
+    mountpoints = args.mountpoints
+    if not mountpoints:
+        # Mesmo critério da verificação do LoreRim: SSD ou tipo desconhecido
+        disks = _probe_list(names=["disks"])[0].func()
+        mountpoints = [disk["mountpoint"] for disk in disks if disk.get("is_ssd") is not False]
+        if not mountpoints:
+            print("Nenhum SSD encontrado; informe os pontos de montagem a analisar.")
+            return 2
+    
+    reports = []
+    failed = 0
+    for mountpoint in mountpoints:
+        print("=" * 60)
+        print(f"Uso de Disco: {mountpoint}")
+        print("=" * 60)
+        try:
+            report = disk_usage.analyze(
+                mountpoint,
+                workers=args.workers or disk_usage.DEFAULT_WORKERS,
+                use_cache=not args.no_cache,
+                refresh=args.refresh,
+                top=args.top or disk_usage.DEFAULT_TOP,
+                max_depth=args.depth or disk_usage.DEFAULT_MAX_DEPTH
+            )
+        except OSError as e:
+            # Caminho inexistente ou sem acesso: segue para os próximos
+            print(f"Erro ao analisar {mountpoint}: {e}")
+            failed += 1
+            continue
+        print(f"{report['total_gb']}GB em {report['files']} arquivos e {report['directories']} diretórios "
+              f"({report['elapsed_s']}s, {report['cached_directories']} do cache, {report['errors']} sem acesso)")
+        print("Maiores diretórios:")
+        for entry in report["largest"]:
+            print(f"  {entry['size_gb']:>8}GB  {entry['path']}")
+        print(f"Recuperável (caches, temporários, lixeira): {report['reclaimable_gb']}GB")
+        for entry in report["reclaimable"]:
+            print(f"  {entry['size_gb']:>8}GB  {entry['path']}")
+        reports.append(report)
+    
+    if reports:
+        save_to_file(reports, "disk_usage.json")
+    return 1 if failed else 0
+
+
+def run_serve(args):
+    """Modo serve: scan e monitor em segundo plano, respostas servidas da memória"""
+    metrics_server = _sibling("metrics_server")
+    host = args.host or metrics_server.DEFAULT_HOST
+    port = args.port if args.port is not None else metrics_server.DEFAULT_PORT
+    
+    try:
+        probes = select_probes(only=_split_names(args.only), skip=_split_names(args.skip))
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return 2
+    
+    monitor = None
+    if _load_dependency("psutil") is not None:
+        resource_monitor = _sibling("resource_monitor")
+        monitor = resource_monitor.ResourceMonitor(
+            interval=args.sample_interval or metrics_server.DEFAULT_SAMPLE_INTERVAL,
+            capacity=60,
+            thresholds=resource_monitor.default_thresholds(LORE_RIM_LIMITS)
+        )
+    
+    service = metrics_server.MetricsService(
+        scan=lambda: scan_system(use_cache=not args.no_cache, refresh=args.refresh,
+                                 profiles_dir=args.profiles, probes=probes),
+        monitor=monitor,
+        scan_interval=args.scan_interval or metrics_server.DEFAULT_SCAN_INTERVAL,
+        sample_interval=args.sample_interval or metrics_server.DEFAULT_SAMPLE_INTERVAL
+    )
+    server = metrics_server.make_server(service, host, port)
+    
+    print("=" * 60)
+    print(f"Métricas em http://{host}:{server.server_address[1]}/metrics (Ctrl+C para encerrar)")
+    print("=" * 60)
+    service.start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.stop()
+        server.server_close()
+    return 0
+
+
+def run_top(args):
+    """Modo top: maiores consumidores de RAM, CPU e I/O em uma janela de amostragem"""
+    if _load_dependency("psutil") is None:
+        print("Erro: psutil não está instalado. Execute: pip install psutil")
+        return 2
+    process_report = _sibling("process_report")
+    sample_s = args.sample or process_report.DEFAULT_SAMPLE_S
+    
+    print("=" * 60)
+    print(f"Processos (janela de {sample_s}s)")
+    print("=" * 60)
+    
+    report = process_report.top_processes(top=args.n or process_report.DEFAULT_TOP, sample_s=sample_s)
+    print(f"{report['processes']} processos")
+    _print_processes(report)
+    return 0
+
+
+def run_history(args):
+    """Modo history: evolução das métricas no período ou diff dos dois últimos scans"""
+    scan_history = _sibling("scan_history")
+    history = scan_history.ScanHistory()
+    host = args.host or platform.node()
+    
+    print("=" * 60)
+    print(f"Histórico de Scans: {host}")
+    print("=" * 60)
+    
+    if args.diff:
+        changes = history.changes_since_last(host=host)
+        if changes is None:
+            print("Menos de dois scans no histórico deste host.")
+        else:
+            _print_changes(changes)
+        return 0
+    
+    metrics = [name.strip() for name in args.metrics.split(",") if name.strip()]
+    try:
+        series = history.series(metrics, days=args.days or None, host=host)
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return 2
+    for date, values in series:
+        print(f"{date}: " + " | ".join(f"{name}={value}" for name, value in values.items()))
+    print(f"{len(series)} scans no período")
+    return 0
+
+
+def _print_changes(changes, limit=None):
+    """Mostra as diferenças entre dois scans"""
+    if not changes:
+        print("Nenhuma mudança.")
+        return
+    for path, (before, after) in list(changes.items())[:limit]:
+        print(f"  {path}: {before} -> {after}")
+    if limit is not None and len(changes) > limit:
+        print(f"  ... e mais {len(changes) - limit} mudanças")
+
+
+def run_bench_disk(args):
+    """Modo bench-disk: mede o disco e registra o resultado nas especificações"""
+    print("=" * 60)
+    print(f"Benchmark de Disco: {args.mountpoint}")
+    print("=" * 60)
+    
+    disk_benchmark = _sibling("disk_benchmark")
+    result = disk_benchmark.benchmark_disk(
+        args.dir or args.mountpoint,
+        size_mb=args.size_mb or disk_benchmark.DEFAULT_FILE_MB,
+        random_ops=args.ops or disk_benchmark.DEFAULT_RANDOM_OPS
+    )
+    print(f"Sequencial: leitura {result['seq_read_mb_s']} MB/s | escrita {result['seq_write_mb_s']} MB/s "
+          f"(cache: {result['cache_bypass']})")
+    print(f"mmap: leitura {result['mmap_read_mb_s']} MB/s")
+    for phase in ("rand_read_4k", "rand_write_4k"):
+        stats = result[phase]
+        print(f"{phase}: {stats['iops']} IOPS | p50 {stats.get('p50_ms')}ms | "
+              f"p95 {stats.get('p95_ms')}ms | p99 {stats.get('p99_ms')}ms")
+    verdict = requirement_profiles.disk_benchmark_ok(result)
+    if verdict is None:
+        print("Atende ao mínimo do LoreRim: inconclusivo (não foi possível ler sem o cache do sistema)")
+    else:
+        print(f"Atende ao mínimo do LoreRim: {'sim' if verdict else 'não'}")
+    
+    def record(specs):
+        specs.setdefault("disk_benchmark", {})[args.mountpoint] = result
+    _update_saved_specs(record)
+
+
+def run_bench_cpu(args):
+    """Modo bench-cpu: mede CPU e memória e registra nas especificações"""
+    print("=" * 60)
+    print("Benchmark de CPU e Memória")
+    print("=" * 60)
+    
+    cpu_benchmark = _sibling("cpu_benchmark")
+    if args.calibrate:
+        calibration = cpu_benchmark.calibrate()
+        print(f"Python: {calibration['python']}")
+        print(f"REFERENCE_INT_S = {calibration['REFERENCE_INT_S']} (±{calibration['spread_percent']['int']}%)")
+        print(f"REFERENCE_FLOAT_S = {calibration['REFERENCE_FLOAT_S']} (±{calibration['spread_percent']['float']}%)")
+        return
+    
+    result = cpu_benchmark.run_benchmark(budget_s=args.budget or cpu_benchmark.DEFAULT_BUDGET_S)
+    runs = result["runs"]
+    spread = result["spread_percent"]
+    print(f"Python: {result['python']} | referência: {result['reference']['cpu']}, {result['reference']['python']}")
+    print(f"Single-thread: {result['single_thread_score']} "
+          f"(inteiros {result['single_thread_int_score']}, float {result['single_thread_float_score']}; "
+          f"mediana de {runs['int']}/{runs['float']} execuções, dispersão {spread['int']}%/{spread['float']}%)")
+    print(f"Multi-core: {result['multi_core_score']} ({result['multi_core_scaling']}x em {result['workers']} processos; "
+          f"mediana de {runs['multi_core']} rodadas, dispersão {spread['multi_core']}%)")
+    if not result["python"].startswith(result["reference"]["python"] + "."):
+        print("Aviso: a pontuação depende da versão do Python; a referência foi medida em "
+              f"{result['reference']['python']}")
+    if "memory_bandwidth_gb_s" in result:
+        print(f"Memória: {result['memory_bandwidth_gb_s']} GB/s | acesso aleatório {result['memory_random_access_ns']} ns")
+    else:
+        print("Memória: não medida (numpy não está instalado)")
+    print(f"Referência LoreRim: single {LORE_RIM_LIMITS['cpu_single_score']} | multi {LORE_RIM_LIMITS['cpu_multi_score']}")
+    
+    def record(specs):
+        specs["cpu_benchmark"] = result
+    _update_saved_specs(record)
+
+
+def run_bench_commit(args):
+    """Modo bench-commit: reserva e toca memória até o alvo e registra nas especificações"""
+    print("=" * 60)
+    print("Teste de Compromisso de Memória")
+    print("=" * 60)
+    
+    commit_benchmark = _sibling("commit_benchmark")
+    target_gb = args.target_gb or LORE_RIM_LIMITS["pagefile_gb"]
+    print(f"Alvo: {target_gb}GB (blocos de {args.chunk_mb or commit_benchmark.DEFAULT_CHUNK_MB}MB)")
+    try:
+        result = commit_benchmark.run_commit_benchmark(
+            target_gb=target_gb,
+            chunk_mb=args.chunk_mb or commit_benchmark.DEFAULT_CHUNK_MB,
+            reserve_gb=args.reserve_gb,
+            max_seconds=args.max_seconds or commit_benchmark.DEFAULT_MAX_SECONDS
+        )
+    except (OSError, RuntimeError) as e:
+        print(f"Erro: {e}")
+        return 2
+    print(f"Limite de compromisso: {result['commit_limit_gb']}GB | disponível no início: "
+          f"{result['commit_available_gb']}GB ({result['commit_source']}) | margem: {result['reserve_gb']}GB")
+    print(f"Reservado: {result['committed_gb']}GB | tocado: {result['touched_gb']}GB | "
+          f"parada: {COMMIT_STOP_REASONS.get(result['stop_reason'], result['stop_reason'])}")
+    if "touch_gb_s" in result:
+        print(f"Vazão: {result['touch_gb_s']} GB/s (mín. {result['touch_min_gb_s']} GB/s) | "
+              f"bloco p50 {result['chunk_p50_ms']}ms, máx. {result['chunk_max_ms']}ms")
+    if "page_faults_per_s" in result:
+        print(f"Page faults: {result['page_faults_per_s']}/s")
+    if result["latency_cliff_gb"] is not None:
+        print(f"Queda de vazão a partir de {result['latency_cliff_gb']}GB")
+    if result.get("error"):
+        print(f"Falha na reserva: {result['error']}")
+    print(f"Liberado em {result['release_s']}s")
+    
+    def record(specs):
+        specs["commit_benchmark"] = result
+    _update_saved_specs(record)
+
+
+def _update_saved_specs(update):
+    """Atualiza o último scan salvo (ou faz um novo) e refaz a verificação"""
+    specs = load_from_file() or scan_system()
+    update(specs)
+    specs["lore_rim_compatibility"] = check_lore_rim_compatibility(specs)
+    specs["profiles"] = evaluate_profiles(specs)
+    save_to_file(specs)
+
+
+def run_monitor(args):
+    """Modo monitor: amostra até o fim da duração ou Ctrl+C e mostra os percentis"""
+    print("=" * 60)
+    print("Monitor de Recursos")
+    print("=" * 60)
+    resource_monitor = _sibling("resource_monitor")
+    interval = args.interval or resource_monitor.DEFAULT_INTERVAL
+    capacity = args.capacity or resource_monitor.DEFAULT_CAPACITY
+    print(f"Intervalo: {interval}s | Histórico: {capacity} amostras (Ctrl+C para encerrar)")
+    
+    monitor = resource_monitor.ResourceMonitor(
+        interval=interval,
+        capacity=capacity,
+        thresholds=resource_monitor.default_thresholds(LORE_RIM_LIMITS)
+    )
+    try:
+        monitor.run(duration=args.duration)
+    except KeyboardInterrupt:
+        pass
+    
+    summary = monitor.summary()
+    print("\n" + "=" * 60)
+    print(f"PERCENTIS ({summary['samples']} amostras em {summary['elapsed_s']}s)")
+    print("=" * 60)
+    for name, stats in summary["series"].items():
+        print(f"{name}: " + " | ".join(f"{k}={v}" for k, v in stats.items()))
+    for disk, series in summary["disks"].items():
+        for name, stats in series.items():
+            print(f"{disk} {name}: " + " | ".join(f"{k}={v}" for k, v in stats.items()))
+    print(f"Alertas: {len(summary['alerts'])} | Custo da amostragem: {summary['sampling_cpu_percent']}% de um núcleo")
+    
+    save_to_file(summary, "monitor_summary.json")
+
+
+def load_from_file(filename="system_specs.json"):
+    """Carrega especificações salvas anteriormente, ou None se não houver"""
+    output_path = Path(__file__).parent.parent.parent / "output" / filename
+    try:
+        return _sibling("spec_io").read_specs(output_path)
+    except (OSError, ValueError, RuntimeError):
+        return None
+
+
+def main(argv=None):
     """Função principal"""
+    args = parse_args(argv)
+    if args.command == "monitor":
+        run_monitor(args)
+        return
+    if args.command == "bench-disk":
+        run_bench_disk(args)
+        return
+    if args.command == "bench-cpu":
+        run_bench_cpu(args)
+        return
+    if args.command == "bench-commit":
+        return run_bench_commit(args)
+    if args.command == "fleet":
+        run_fleet(args)
+        return
+    if args.command == "history":
+        return run_history(args)
+    if args.command == "top":
+        return run_top(args)
+    if args.command == "serve":
+        return run_serve(args)
+    if args.command == "disk-usage":
+        return run_disk_usage(args)
+    if args.command == "bench-scanner":
+        return run_bench_scanner(args)
+    
+    try:
+        probes = select_probes(only=_split_names(args.only), skip=_split_names(args.skip))
+    except ValueError as e:
+        print(f"Erro: {e}")
+        return 2
+    
     print("=" * 60)
     print("Scanner de Especificações do Sistema")
     print("=" * 60)
     
-    specs = scan_system()
+    if args.replay:
+        runner = command_runner.ReplayRunner(args.replay)
+    else:
+        runner = command_runner.AsyncCommandRunner()
+    if args.record:
+        runner = command_runner.RecordingRunner(runner)
+    
+    try:
+        # Um replay não pode gravar no cache valores de outra máquina
+        specs = scan_system(use_cache=not args.no_cache and not args.replay, refresh=args.refresh,
+                            profiles_dir=args.profiles, probes=probes, runner=runner)
+    finally:
+        runner.close()
+    if args.record:
+        runner.save(args.record)
+        print(f"Comandos gravados em: {args.record}")
     
     # Mostrar resumo no console
     print("\n" + "=" * 60)
     print("RESUMO DO SISTEMA")
     print("=" * 60)
-    print(f"CPU: {specs['cpu']['model']}")
-    print(f"RAM: {specs['ram']['total_gb']} GB")
-    print(f"GPU: {specs['gpu']['model']}")
-    if specs['gpu']['vram_gb']:
-        print(f"VRAM: {specs['gpu']['vram_gb']} GB")
+    if "cpu" in specs:
+        print(f"CPU: {specs['cpu']['model']}")
+    if "ram" in specs:
+        print(f"RAM: {specs['ram']['total_gb']} GB")
+    if "gpu" in specs:
+        print(f"GPU: {specs['gpu']['model']}")
+        if specs['gpu']['vram_gb']:
+            print(f"VRAM: {specs['gpu']['vram_gb']} GB")
+    for name, info in specs['_scan']['probes'].items():
+        if info['status'] == "error":
+            print(f"Erro na probe {name}: {info['error']}")
+    
+    if args.profile:
+        print("\n" + "=" * 60)
+        print("TEMPO POR PROBE")
+        print("=" * 60)
+        for line in probe_timing.format_report(specs['_perf']):
+            print(line)
     
     print("\n" + "=" * 60)
     print("COMPATIBILIDADE COM LORERIM")
@@ -477,8 +1407,42 @@ def main():
             icon = "✓" if "OK" in status else "✗"
             print(f"{icon} {req_name.upper()}: {status}")
     
+    # Com a RAM apertada, mostrar o que está ocupando a memória agora
+    if "OK" not in compatibility['ram']['status'] and specs.get('processes', {}).get('top_rss'):
+        print("\nMaiores consumidores agora:")
+        _print_processes(specs['processes'], keys=("top_rss",), limit=5)
+    if "INSUFICIENTE" in compatibility['disk_space']['status']:
+        print("\nPara ver o que ocupa o SSD: system_specs_scanner.py disk-usage")
+    
+    if specs.get('profiles'):
+        print("\n" + "=" * 60)
+        print("PERFIS DE REQUISITOS")
+        print("=" * 60)
+        for profile_name, result in specs['profiles'].items():
+            if result['tier']:
+                print(f"✓ {profile_name}: {result['tier']}")
+            else:
+                pending = result['missing'] + [f"{m} (não detectado)" for m in result['unknown']]
+                print(f"✗ {profile_name}: nenhum nível ({', '.join(pending)})")
+    
     # Salvar em arquivo
-    output_file = save_to_file(specs)
+    try:
+        output_file = save_to_file(specs, fmt=args.format, compress=args.compress)
+    except RuntimeError as e:
+        print(f"Erro: {e}")
+        return 2
+    
+    # Guardar no histórico e mostrar o que mudou desde o scan anterior
+    try:
+        history = _sibling("scan_history").ScanHistory()
+        history.append(specs)
+        changes = history.changes_since_last(host=specs["hostname"])
+    except OSError as e:
+        print(f"Aviso ao gravar histórico de scans: {e}")
+        changes = None
+    if changes is not None:
+        print(f"\nMudanças desde o último scan: {len(changes)}")
+        _print_changes(changes, limit=20)
     
     print("\n" + "=" * 60)
     print("Scan concluído!")
@@ -486,4 +1450,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())